@@ -0,0 +1,7 @@
+"""
+Paquete compartido de simulación para los TPs de la pava eléctrica.
+
+Cada módulo agrupa un motor de simulación reutilizable por los notebooks
+`tpN/simulacion.py`, que importan directamente desde el submódulo que necesitan
+(por ejemplo `from pava.ensamble import simular_ensamble`).
+"""
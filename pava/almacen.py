@@ -0,0 +1,187 @@
+"""
+Almacenamiento en disco de ensambles de trayectorias, por columnas y con memory maps.
+
+Un ensamble grande (10^5-10^6 escenarios por cientos de instantes) no entra
+cómodo en memoria si además hay que analizarlo o graficarlo. Acá cada ensamble
+es un directorio con una columna tipada por archivo `.npy`:
+
+    <ruta>/meta.json          cantidad de escenarios escritos, tipo de dato y columnas
+    <ruta>/tiempo.npy         grilla de tiempos (n_tiempos,)
+    <ruta>/trayectorias.npy   matriz (n_escenarios, n_tiempos), un escenario por fila
+    <ruta>/param_<nombre>.npy un valor por escenario para cada parámetro
+
+`EscritorEnsamble` reserva los archivos y los va llenando por bloques, así que
+la simulación nunca tiene el ensamble entero en memoria. `Ensamble` los abre con
+`np.load(mmap_mode='r')`: elegir un subconjunto de escenarios o una ventana de
+tiempo sólo lee del disco las páginas que se tocan. Al ser `.npy` estándar, los
+archivos también se pueden abrir directamente con NumPy.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from pava.ensamble import simular_ensamble
+from pava.modelo import CALOR_ESPECIFICO_AGUA
+
+
+class EscritorEnsamble:
+    """
+    Escribe un ensamble por bloques en `ruta`.
+
+    tiempo: Grilla de tiempos común a todos los escenarios
+    n_escenarios: Cantidad total de escenarios que se van a escribir
+    parametros: Nombres de los parámetros que se guardan por escenario
+    dtype: Tipo de dato de las trayectorias (float32 reduce el disco a la mitad)
+
+    Se usa como context manager; al salir se escribe `meta.json`.
+    """
+
+    def __init__(self, ruta, tiempo, n_escenarios, parametros=(), dtype=np.float32):
+        self.ruta = Path(ruta)
+        self.ruta.mkdir(parents=True, exist_ok=True)
+        tiempo = np.asarray(tiempo, dtype=float)
+        np.save(self.ruta / 'tiempo.npy', tiempo)
+
+        self.n_escenarios = n_escenarios
+        self.trayectorias = open_memmap(self.ruta / 'trayectorias.npy', mode='w+', dtype=dtype,
+                                        shape=(n_escenarios, len(tiempo)))
+        self.parametros = {
+            nombre: open_memmap(self.ruta / f'param_{nombre}.npy', mode='w+', dtype=np.float64, shape=(n_escenarios,))
+            for nombre in parametros
+        }
+        self.escritos = 0
+
+    def agregar(self, trayectorias, **parametros):
+        """Agrega un bloque de trayectorias (n_bloque, n_tiempos) y los parámetros de cada una."""
+        trayectorias = np.atleast_2d(trayectorias)
+        faltantes = set(self.parametros) - set(parametros)
+        if faltantes:
+            raise ValueError(f"Faltan parámetros del bloque: {', '.join(sorted(faltantes))}")
+        fin = self.escritos + len(trayectorias)
+        if fin > self.n_escenarios:
+            raise ValueError(f"El ensamble admite {self.n_escenarios} escenarios y se intentaron escribir {fin}")
+
+        self.trayectorias[self.escritos:fin] = trayectorias
+        for nombre, columna in self.parametros.items():
+            columna[self.escritos:fin] = np.broadcast_to(parametros[nombre], (len(trayectorias),))
+        self.escritos = fin
+
+    def cerrar(self):
+        """Vuelca los datos al disco y escribe los metadatos."""
+        self.trayectorias.flush()
+        for columna in self.parametros.values():
+            columna.flush()
+        meta = {
+            'n_escenarios': self.escritos,
+            'n_tiempos': self.trayectorias.shape[1],
+            'dtype': str(self.trayectorias.dtype),
+            'parametros': list(self.parametros),
+        }
+        (self.ruta / 'meta.json').write_text(json.dumps(meta, indent=2), encoding='utf-8')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+
+class Ensamble:
+    """
+    Ensamble guardado en disco, abierto con memory maps de sólo lectura.
+
+    Atributos:
+        tiempo: Grilla de tiempos (en memoria, es chica)
+        trayectorias: Memory map (n_escenarios, n_tiempos)
+        parametros: Diccionario {nombre: memory map (n_escenarios,)}
+    """
+
+    def __init__(self, ruta):
+        self.ruta = Path(ruta)
+        meta_archivo = self.ruta / 'meta.json'
+        if not meta_archivo.is_file():
+            raise FileNotFoundError(f"{self.ruta} no es un ensamble (falta meta.json)")
+        self.meta = json.loads(meta_archivo.read_text(encoding='utf-8'))
+
+        n = self.meta['n_escenarios']
+        self.tiempo = np.load(self.ruta / 'tiempo.npy')
+        self.trayectorias = np.load(self.ruta / 'trayectorias.npy', mmap_mode='r')[:n]
+        self.parametros = {
+            nombre: np.load(self.ruta / f'param_{nombre}.npy', mmap_mode='r')[:n]
+            for nombre in self.meta['parametros']
+        }
+
+    def __len__(self):
+        return self.meta['n_escenarios']
+
+    def ventana(self, desde=None, hasta=None):
+        """Slice de los instantes de `tiempo` dentro de [desde, hasta]."""
+        inicio = 0 if desde is None else np.searchsorted(self.tiempo, desde, side='left')
+        fin = len(self.tiempo) if hasta is None else np.searchsorted(self.tiempo, hasta, side='right')
+        return slice(int(inicio), int(fin))
+
+    def filtrar(self, **rangos):
+        """
+        Índices de los escenarios cuyos parámetros caen en los rangos dados.
+
+        rangos: nombre=(mínimo, máximo), con extremos incluidos; None deja el extremo abierto
+        """
+        seleccion = np.ones(len(self), dtype=bool)
+        for nombre, (minimo, maximo) in rangos.items():
+            columna = self.parametros[nombre]
+            if minimo is not None:
+                seleccion &= columna >= minimo
+            if maximo is not None:
+                seleccion &= columna <= maximo
+        return np.flatnonzero(seleccion)
+
+    def seleccionar(self, escenarios=slice(None), desde=None, hasta=None):
+        """
+        Lee un subconjunto de escenarios en una ventana de tiempo.
+
+        escenarios: Slice, índices o máscara booleana de los escenarios
+        desde, hasta: Ventana de tiempo (s)
+
+        Devuelve (tiempo, trayectorias) como arrays en memoria; sólo se leen las filas
+        y columnas pedidas.
+        """
+        columnas = self.ventana(desde, hasta)
+        return self.tiempo[columnas], np.asarray(self.trayectorias[escenarios, columnas])
+
+    def bloques(self, tamano=50_000):
+        """Itera (slice, trayectorias) por bloques de escenarios, para procesar en streaming."""
+        for inicio in range(0, len(self), tamano):
+            filas = slice(inicio, min(inicio + tamano, len(self)))
+            yield filas, np.asarray(self.trayectorias[filas])
+
+
+def guardar_ensamble(ruta, tiempo, resistencia, voltaje, temp_inicial, temp_ambiente, masa, perdida_calor,
+                     calor_especifico=CALOR_ESPECIFICO_AGUA, tamano_bloque=50_000, dtype=np.float32):
+    """
+    Simula un barrido con `simular_ensamble` y lo guarda en disco por bloques.
+
+    Los parámetros se combinan por broadcasting (como en `simular_ensamble`) y se
+    aplanan: cada escenario es una fila del ensamble y sus parámetros quedan en las
+    columnas 'resistencia', 'voltaje', 'temp_inicial' y 'temp_ambiente'.
+    tamano_bloque: Escenarios simulados a la vez; acota la memoria usada
+
+    Devuelve el `Ensamble` abierto.
+    """
+    resistencia, voltaje, temp_inicial, temp_ambiente, masa, perdida_calor = (
+        np.ravel(x) for x in np.broadcast_arrays(resistencia, voltaje, temp_inicial, temp_ambiente, masa, perdida_calor)
+    )
+    columnas = ('resistencia', 'voltaje', 'temp_inicial', 'temp_ambiente')
+
+    with EscritorEnsamble(ruta, tiempo, len(resistencia), columnas, dtype) as escritor:
+        for inicio in range(0, len(resistencia), tamano_bloque):
+            bloque = slice(inicio, inicio + tamano_bloque)
+            trayectorias = simular_ensamble(
+                tiempo, resistencia[bloque], voltaje[bloque], temp_inicial[bloque], temp_ambiente[bloque],
+                masa[bloque], perdida_calor[bloque], calor_especifico, dtype=dtype,
+            )
+            escritor.agregar(trayectorias, resistencia=resistencia[bloque], voltaje=voltaje[bloque],
+                             temp_inicial=temp_inicial[bloque], temp_ambiente=temp_ambiente[bloque])
+    return Ensamble(ruta)
@@ -0,0 +1,132 @@
+"""
+Solución exacta del modelo lineal de calentamiento con pérdidas.
+
+La ecuación del TP4/TP5
+
+    dT/dt = (P - k·(T - Tamb)) / (m·c),    P = V²/R
+
+es lineal con coeficientes constantes, así que tiene solución cerrada:
+
+    T(t) = T∞ + (T0 - T∞)·exp(-t/τ),    T∞ = Tamb + P/k,    τ = m·c/k
+
+y el tiempo para llegar a una temperatura objetivo se despeja con un logaritmo:
+
+    t* = τ·ln((T∞ - T0) / (T∞ - Tobj))
+
+Todo se evalúa en O(1) por escenario y vectorizado sobre arrays de parámetros,
+por lo que los estudios de diseño no necesitan integrar paso a paso.
+Con k = 0 (sin pérdidas) se usa el límite lineal T(t) = T0 + P·t/(m·c).
+"""
+
+import numpy as np
+
+from pava.ensamble import simular_ensamble
+from pava.modelo import CALOR_ESPECIFICO_AGUA, temperatura_equilibrio
+
+
+def _parametros(resistencia, voltaje, temp_inicial, temp_ambiente, masa, perdida_calor,
+                calor_especifico):
+    """Convierte los parámetros a arrays compatibles y calcula P y m·c."""
+    resistencia, voltaje, temp_inicial, temp_ambiente, masa, perdida_calor, calor_especifico = (
+        np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (
+            resistencia, voltaje, temp_inicial, temp_ambiente, masa, perdida_calor, calor_especifico)))
+    )
+    potencia = voltaje**2 / resistencia
+    capacidad_termica = masa * calor_especifico
+    return potencia, capacidad_termica, temp_inicial, temp_ambiente, perdida_calor
+
+
+def temperatura_limite(resistencia, voltaje, temp_ambiente, perdida_calor):
+    """
+    Temperatura de equilibrio T∞ = Tamb + P/k a partir de la resistencia y la tensión.
+
+    Con k = 0 no hay equilibrio y devuelve infinito (ver `pava.modelo.temperatura_equilibrio`).
+    """
+    potencia = np.asarray(voltaje, dtype=float)**2 / np.asarray(resistencia, dtype=float)
+    return temperatura_equilibrio(temp_ambiente, potencia, perdida_calor)
+
+
+def temperatura_exacta(tiempo, resistencia, voltaje, temp_inicial, temp_ambiente, masa,
+                       perdida_calor, calor_especifico=CALOR_ESPECIFICO_AGUA):
+    """
+    Evalúa la solución exacta T(t) en instantes arbitrarios.
+
+    tiempo: Instantes (s) donde evaluar la temperatura, de longitud n_tiempos
+    resistencia, voltaje, temp_inicial, temp_ambiente, masa, perdida_calor, calor_especifico:
+        Parámetros del modelo (escalares o arrays), con el mismo significado que en
+        `pava.ensamble.simular_ensamble`
+
+    Devuelve un array de forma (n_escenarios..., n_tiempos), igual que el integrador por lotes.
+    """
+    tiempo = np.asarray(tiempo, dtype=float)
+    potencia, capacidad_termica, temp_inicial, temp_ambiente, perdida_calor = _parametros(
+        resistencia, voltaje, temp_inicial, temp_ambiente, masa, perdida_calor, calor_especifico)
+
+    # Agregamos un eje para el tiempo al final de cada parámetro
+    potencia, capacidad_termica, temp_inicial, temp_ambiente, perdida_calor = (
+        x[..., np.newaxis] for x in (potencia, capacidad_termica, temp_inicial, temp_ambiente, perdida_calor))
+
+    con_perdidas = perdida_calor > 0
+    k = np.where(con_perdidas, perdida_calor, 1.0)  # evita dividir por cero en el caso sin pérdidas
+    temp_limite = temp_ambiente + potencia / k
+    exponencial = temp_limite + (temp_inicial - temp_limite) * np.exp(-k * tiempo / capacidad_termica)
+    lineal = temp_inicial + potencia * tiempo / capacidad_termica
+
+    return np.where(con_perdidas, exponencial, lineal)
+
+
+def tiempo_hasta_objetivo(temp_objetivo, resistencia, voltaje, temp_inicial, temp_ambiente, masa,
+                          perdida_calor, calor_especifico=CALOR_ESPECIFICO_AGUA):
+    """
+    Tiempo exacto (s) para que el fluido alcance `temp_objetivo`.
+
+    Los parámetros son escalares o arrays y el resultado tiene su forma combinada.
+    Si el fluido ya está a la temperatura objetivo devuelve 0; si el objetivo es
+    inalcanzable (T∞ = Tamb + P/k no lo supera) devuelve `np.inf`, de modo que
+    `np.isfinite(resultado)` indica qué escenarios llegan.
+    """
+    potencia, capacidad_termica, temp_inicial, temp_ambiente, perdida_calor = _parametros(
+        resistencia, voltaje, temp_inicial, temp_ambiente, masa, perdida_calor, calor_especifico)
+    temp_objetivo = np.asarray(temp_objetivo, dtype=float)
+
+    con_perdidas = perdida_calor > 0
+    k = np.where(con_perdidas, perdida_calor, 1.0)
+    temp_limite = temp_ambiente + potencia / k
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Con pérdidas: t* = τ·ln((T∞ - T0) / (T∞ - Tobj)), definido sólo si T∞ > Tobj
+        exponencial = np.where(
+            temp_limite > temp_objetivo,
+            capacidad_termica / k * np.log((temp_limite - temp_inicial) / (temp_limite - temp_objetivo)),
+            np.inf,
+        )
+        # Sin pérdidas: t* = m·c·(Tobj - T0) / P, definido sólo si P > 0
+        lineal = np.where(potencia > 0, capacidad_termica * (temp_objetivo - temp_inicial) / potencia, np.inf)
+
+    resultado = np.where(con_perdidas, exponencial, lineal)
+    return np.where(temp_inicial >= temp_objetivo, 0.0, resultado)
+
+
+def comparar_con_euler(resistencia, voltaje, temp_inicial, temp_ambiente, masa, perdida_calor,
+                       calor_especifico=CALOR_ESPECIFICO_AGUA, tiempo_total=600, intervalo=5):
+    """
+    Compara la solución exacta con el paso de Euler usado en los TPs (5 segundos).
+
+    Devuelve un diccionario con:
+        tiempo: Grilla de tiempos usada (s)
+        exacta: Temperaturas de la solución cerrada
+        euler: Temperaturas del integrador por lotes
+        error_maximo: Máximo error absoluto (°C) de Euler en cada escenario
+    """
+    tiempo = np.arange(0, tiempo_total + 1, intervalo)
+    parametros = (resistencia, voltaje, temp_inicial, temp_ambiente, masa, perdida_calor, calor_especifico)
+
+    exacta = temperatura_exacta(tiempo, *parametros)
+    euler = simular_ensamble(tiempo, *parametros)
+
+    return {
+        'tiempo': tiempo,
+        'exacta': exacta,
+        'euler': euler,
+        'error_maximo': np.max(np.abs(euler - exacta), axis=-1),
+    }
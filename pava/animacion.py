@@ -0,0 +1,253 @@
+"""
+Animaciones del sistema de atención (TP7/TP8) exportadas a video a distintas velocidades.
+
+Redibujar el local en cada uno de los ~15.000 segundos de una mañana y guardar
+los cuadros en memoria hasta el final (como `FuncAnimation` con un cuadro por
+segundo) es lentísimo y no escala. Acá el video se arma a partir de la
+`linea_de_tiempo` de la mañana (un estado por instante en que algo cambia):
+
+- Velocidad: con `velocidad` segundos simulados por segundo de video y `fps`
+  cuadros por segundo, cada cuadro avanza velocidad / fps segundos. El estado
+  de cada cuadro sale de `muestrear_linea`; los segundos intermedios no se
+  dibujan, pero los contadores son acumulados y la fila muestra además su
+  máximo en el intervalo, así que acelerar no esconde los picos. El costo es
+  proporcional a la cantidad de cuadros, no a los segundos simulados.
+- Dibujo: la figura se dibuja completa una sola vez y se guarda como fondo; en
+  cada cuadro sólo se actualizan y se redibujan sobre el fondo (blitting) los
+  artistas que cambian: textos, boxes, fila y curvas.
+- Escritura: cada cuadro va al codificador apenas se dibuja. Con ffmpeg
+  instalado se le mandan los píxeles por un pipe (`EscritorFFmpeg`); si no,
+  `EscritorAVI` escribe un AVI Motion JPEG con Pillow (dependencia de
+  matplotlib). Ninguno guarda los cuadros en memoria.
+"""
+
+import io
+import shutil
+import struct
+import subprocess
+
+import matplotlib as mpl
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import Image
+
+from pava.atencion import muestrear_linea
+
+FILA_VISIBLE = 30  # Clientes de la fila dibujados; el resto se indica con "+n"
+
+
+class EscritorAVI:
+    """
+    Video AVI Motion JPEG escrito cuadro por cuadro, sin ffmpeg.
+
+    Cada cuadro se comprime a JPEG y se agrega al archivo apenas llega; al
+    cerrar se escribe el índice (idx1) y se completan los tamaños y la cantidad
+    de cuadros del encabezado.
+
+    archivo: Ruta del video
+    ancho, alto: Tamaño de los cuadros (píxeles)
+    fps: Cuadros por segundo
+    calidad: Calidad JPEG (1 a 95)
+    """
+
+    def __init__(self, archivo, ancho, alto, fps=15, calidad=85):
+        self.ancho, self.alto, self.fps, self.calidad = ancho, alto, fps, calidad
+        self.indice = []
+        self.archivo = open(archivo, 'wb')
+        self.archivo.write(self._encabezado(0, 0, 0))
+        self.inicio_movi = self.archivo.tell() - 4
+
+    def _encabezado(self, tamano_riff, tamano_movi, tamano_maximo):
+        """RIFF, lista hdrl y comienzo de la lista movi (siempre del mismo largo)."""
+        n = len(self.indice)
+        avih = struct.pack('<14I', int(round(1e6 / self.fps)), 0, 0, 0x10, n, 0, 1, tamano_maximo,
+                           self.ancho, self.alto, 0, 0, 0, 0)
+        strh = b'vidsMJPG' + struct.pack('<IHH8I4h', 0, 0, 0, 0, 1000, int(round(self.fps * 1000)), 0, n,
+                                         tamano_maximo, 0xFFFFFFFF, 0, 0, 0, self.ancho, self.alto)
+        strf = struct.pack('<IiiHH4sIiiII', 40, self.ancho, self.alto, 1, 24, b'MJPG',
+                           self.ancho * self.alto * 3, 0, 0, 0, 0)
+        hdrl = _lista(b'hdrl', _bloque(b'avih', avih) + _lista(b'strl', _bloque(b'strh', strh) + _bloque(b'strf', strf)))
+        return b'RIFF' + struct.pack('<I', tamano_riff) + b'AVI ' + hdrl + b'LIST' + struct.pack('<I', tamano_movi) + b'movi'
+
+    def agregar(self, rgba):
+        """Agrega un cuadro (bytes RGBA de ancho x alto)."""
+        jpeg = io.BytesIO()
+        Image.frombuffer('RGBA', (self.ancho, self.alto), rgba, 'raw', 'RGBA', 0, 1).convert('RGB').save(
+            jpeg, format='JPEG', quality=self.calidad)
+        datos = jpeg.getvalue()
+        self.indice.append((self.archivo.tell() - self.inicio_movi, len(datos)))
+        self.archivo.write(_bloque(b'00dc', datos))
+
+    def cerrar(self):
+        fin_movi = self.archivo.tell()
+        self.archivo.write(_bloque(b'idx1', b''.join(struct.pack('<4s3I', b'00dc', 0x10, desplazamiento, tamano)
+                                                     for desplazamiento, tamano in self.indice)))
+        tamano_maximo = max((tamano for _, tamano in self.indice), default=0)
+        tamano_riff = self.archivo.tell() - 8
+        self.archivo.seek(0)
+        self.archivo.write(self._encabezado(tamano_riff, fin_movi - self.inicio_movi, tamano_maximo))
+        self.archivo.close()
+
+
+class EscritorFFmpeg:
+    """Video codificado por ffmpeg (MPEG-4), que recibe los cuadros RGBA crudos por la entrada estándar."""
+
+    def __init__(self, archivo, ancho, alto, fps=15, ejecutable='ffmpeg'):
+        self.proceso = subprocess.Popen(
+            [ejecutable, '-y', '-loglevel', 'error', '-f', 'rawvideo', '-pix_fmt', 'rgba',
+             '-s', f'{ancho}x{alto}', '-r', str(fps), '-i', '-', '-c:v', 'mpeg4', '-q:v', '4', archivo],
+            stdin=subprocess.PIPE)
+
+    def agregar(self, rgba):
+        self.proceso.stdin.write(rgba)
+
+    def cerrar(self):
+        self.proceso.stdin.close()
+        if self.proceso.wait():
+            raise RuntimeError(f"ffmpeg terminó con código {self.proceso.returncode}")
+
+
+def _bloque(identificador, datos):
+    """Bloque RIFF: identificador, tamaño y datos completados a un largo par."""
+    return identificador + struct.pack('<I', len(datos)) + datos + b'\0' * (len(datos) % 2)
+
+
+def _lista(tipo, contenido):
+    return b'LIST' + struct.pack('<I', len(contenido) + 4) + tipo + contenido
+
+
+def abrir_video(archivo, ancho, alto, fps=15):
+    """`EscritorFFmpeg` si ffmpeg está instalado; si no, `EscritorAVI`."""
+    ejecutable = shutil.which(mpl.rcParams['animation.ffmpeg_path'])
+    if ejecutable:
+        return EscritorFFmpeg(archivo, ancho, alto, fps, ejecutable)
+    return EscritorAVI(archivo, ancho, alto, fps)
+
+
+def instantes_de_cuadro(fin, velocidad, fps):
+    """Instantes simulados de cada cuadro: de 0 a `fin` cada velocidad / fps segundos."""
+    paso = velocidad / fps
+    return np.arange(int(np.ceil(fin / paso)) + 1) * paso
+
+
+class AnimacionLocal:
+    """
+    Figura del local que se redibuja por blitting.
+
+    Arriba, la hora, los contadores, los boxes (azul ocupado, gris libre) y la
+    fila; abajo, la fila y los boxes ocupados a lo largo de la mañana. Los
+    artistas que cambian son `animated` y no forman parte del fondo.
+
+    n_boxes: Cantidad de boxes
+    fin: Último instante a mostrar (s)
+    dpi: Resolución (la figura mide 10 x 6 pulgadas)
+    hora_apertura: Hora del día en que abre el local
+    """
+
+    def __init__(self, n_boxes, fin, dpi=80, hora_apertura=8, titulo='Simulación del local'):
+        self.n_boxes = n_boxes
+        self.hora_apertura = hora_apertura
+        # Figura sin backend de pantalla: sólo se dibuja para el video
+        self.figura = Figure(figsize=(10, 6), dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.figura)
+        local, curvas = self.figura.subplots(2, 1, gridspec_kw={'height_ratios': [3, 2]})
+        self.figura.suptitle(titulo, fontsize=14)
+
+        local.set_xlim(-1, max(FILA_VISIBLE, 2 * n_boxes) + 3)
+        local.set_ylim(0, 4)
+        local.axis('off')
+        animado = {'animated': True}
+        self.boxes = local.scatter(2 * np.arange(n_boxes) + 0.5, np.full(n_boxes, 2.3), s=700, marker='s',
+                                   edgecolors='black', **animado)
+        for b in range(n_boxes):
+            local.text(2 * b + 0.5, 1.85, f"Box {b + 1}", ha='center', va='top', fontsize=9)
+        self.fila = local.scatter(np.zeros(0), np.zeros(0), s=60, color='hotpink', edgecolors='black', **animado)
+        self.texto_hora = local.text(0, 3.6, '', fontsize=13, family='monospace', **animado)
+        self.texto_contadores = local.text(0, 3.1, '', fontsize=11, family='monospace', **animado)
+        self.texto_fila = local.text(0, 1.1, '', fontsize=11, family='monospace', **animado)
+        self.texto_resto = local.text(FILA_VISIBLE + 0.3, 0.5, '', fontsize=11, va='center', **animado)
+
+        curvas.set_xlim(hora_apertura, hora_apertura + max(fin, 1) / 3600)
+        curvas.set_xlabel('Hora del día', fontsize=11)
+        curvas.set_ylabel('Clientes', fontsize=11)
+        curvas.grid(True, alpha=0.3)
+        self.linea_cola, = curvas.plot([], [], 'm-', label='En la fila', **animado)
+        self.linea_ocupados, = curvas.plot([], [], 'b-', label='Boxes ocupados', **animado)
+        curvas.legend(loc='upper left')
+        self.curvas = curvas
+
+        self.artistas = [self.boxes, self.fila, self.texto_hora, self.texto_contadores,
+                         self.texto_fila, self.texto_resto, self.linea_cola, self.linea_ocupados]
+        self.fondo = None
+
+    @property
+    def tamano(self):
+        """(ancho, alto) de los cuadros en píxeles."""
+        return self.canvas.get_width_height()
+
+    def preparar(self, muestra):
+        """Fija la escala vertical de las curvas y dibuja el fondo."""
+        self.horas = self.hora_apertura + muestra['tiempo'] / 3600
+        self.curvas.set_ylim(0, max(int(muestra['cola_maxima'].max()), self.n_boxes) * 1.1 + 1)
+        self.canvas.draw()
+        self.fondo = self.canvas.copy_from_bbox(self.figura.bbox)
+
+    def actualizar(self, muestra, k):
+        """Actualiza los artistas con el cuadro k de la muestra."""
+        total = int(self.hora_apertura * 3600 + muestra['tiempo'][k])
+        self.texto_hora.set_text(f"Hora: {total // 3600:02d}:{total % 3600 // 60:02d}:{total % 60:02d}")
+        self.texto_contadores.set_text(f"Ingresados: {muestra['ingresados'][k]}  Atendidos: {muestra['atendidos'][k]}"
+                                       f"  No atendidos: {muestra['abandonos'][k]}")
+        cola, cola_maxima = int(muestra['cola'][k]), int(muestra['cola_maxima'][k])
+        self.texto_fila.set_text(f"Fila: {cola}" + (f" (máx. {cola_maxima} desde el cuadro anterior)"
+                                                    if cola_maxima > cola else ''))
+        ocupados = int(muestra['ocupados'][k])
+        self.boxes.set_facecolors(['royalblue'] * ocupados + ['lightgray'] * (self.n_boxes - ocupados))
+        visibles = min(cola, FILA_VISIBLE)
+        self.fila.set_offsets(np.column_stack([np.arange(visibles), np.full(visibles, 0.5)]))
+        self.texto_resto.set_text(f"+{cola - visibles}" if cola > visibles else '')
+        self.linea_cola.set_data(self.horas[:k + 1], muestra['cola'][:k + 1])
+        self.linea_ocupados.set_data(self.horas[:k + 1], muestra['ocupados'][:k + 1])
+
+    def cuadro(self, muestra, k):
+        """Dibuja el cuadro k sobre el fondo y devuelve sus píxeles RGBA."""
+        self.actualizar(muestra, k)
+        self.canvas.restore_region(self.fondo)
+        for artista in self.artistas:
+            self.figura.draw_artist(artista)
+        return bytes(self.canvas.buffer_rgba())
+
+
+def exportar_animacion(linea, archivo, n_boxes, velocidad=600, fps=15, dpi=80, hora_apertura=8, titulo=None):
+    """
+    Exporta la animación de una mañana a video, un cuadro por vez.
+
+    linea: `pava.atencion.linea_de_tiempo` de la mañana
+    archivo: Ruta del video (por ejemplo 'tp7_x600.avi')
+    n_boxes: Cantidad de boxes de la simulación
+    velocidad: Segundos simulados por segundo de video (1 = tiempo real)
+    fps: Cuadros por segundo del video
+    dpi: Resolución (la figura mide 10 x 6 pulgadas)
+
+    Devuelve un diccionario con 'archivo', 'cuadros', 'paso' (segundos simulados
+    por cuadro), 'duracion' (segundos de video) y 'escritor' (nombre de la clase).
+    """
+    instantes = instantes_de_cuadro(linea['tiempo'][-1], velocidad, fps)
+    muestra = muestrear_linea(linea, instantes)
+    titulo = titulo or f'Simulación del local con {n_boxes} boxes (x{velocidad:g})'
+    vista = AnimacionLocal(n_boxes, instantes[-1], dpi, hora_apertura, titulo)
+    vista.preparar(muestra)
+    escritor = abrir_video(archivo, *vista.tamano, fps)
+    try:
+        for k in range(len(instantes)):
+            escritor.agregar(vista.cuadro(muestra, k))
+    finally:
+        escritor.cerrar()
+    return {
+        'archivo': archivo,
+        'cuadros': len(instantes),
+        'paso': velocidad / fps,
+        'duracion': len(instantes) / fps,
+        'escritor': type(escritor).__name__,
+    }
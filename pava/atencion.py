@@ -0,0 +1,519 @@
+"""
+Simulación por eventos discretos del sistema de atención al público (TP7/TP8).
+
+La consigna describe el local segundo a segundo: en cada uno de los 14.400
+segundos de la mañana entra un cliente con probabilidad p = 1/144. Recorrer
+todos los segundos cuesta lo mismo haya o no clientes, y revisar en cada segundo
+toda la fila para ver quién cumplió los 30 minutos cuesta además el largo de la
+fila. Acá el tiempo salta de un evento al siguiente:
+
+- Llegadas: vienen ordenadas y se recorren con un índice. Si hay un box libre el
+  cliente pasa directo; si no, entra a la `ColaEspera`.
+- Fines de atención: un heap con a lo sumo un evento por box. Cuando un box se
+  libera se descartan del frente de la cola los clientes que ya esperaron más
+  de 30 minutos (abandonos) y se atiende al primero de los que quedan.
+
+Como todos tienen la misma paciencia, los clientes vencen en el mismo orden en
+que llegaron: los que abandonaron están siempre al frente de la cola.
+`ColaEspera` guarda clientes e instantes de llegada en arrays y los descarta
+avanzando el índice del frente (O(1) amortizado), sin agendar eventos de
+abandono ni recorrer la fila. A igual instante el fin de atención va antes que
+la llegada, y un box que se libera justo a los 30 minutos de espera todavía
+atiende al cliente. Así el costo depende de la cantidad de clientes y no de la
+cantidad de segundos ni del largo de la fila.
+
+Las llegadas entran como un array ordenado de instantes, lo que permite cambiar
+el proceso de llegadas (Poisson homogéneo en el TP7, intensidad normal en el
+TP8) sin tocar el motor. Con p = 1/144 por segundo el proceso de Bernoulli de la
+consigna es, en tiempo continuo, un Poisson de tasa 1/144 (tiempos entre llegadas
+exponenciales de media 144 s). El tiempo de atención es normal(10, 5) minutos
+truncado en 0, como en la resolución original.
+
+Para estudios con muchas mañanas, `simular_mananas` resuelve el mismo sistema
+vectorizado sobre réplicas: con cola FIFO y la misma paciencia para todos, cada
+cliente, en orden de llegada, empieza a ser atendido cuando se libera el primer
+box (o al llegar, si hay uno libre) y abandona si eso ocurre más de 30 minutos
+después de su llegada. Se avanza cliente por cliente con todas las réplicas a la
+vez. `estudiar_boxes` reparte lotes de mañanas en un pool de procesos, evalúa
+todas las cantidades de boxes sobre las mismas mañanas (números aleatorios
+comunes) y reporta intervalos de confianza, incluidos los de la diferencia de
+costo contra la mejor cantidad de boxes.
+
+Las llegadas del TP8 (intensidad normal) se sortean directamente, sin recorrer
+los segundos con una probabilidad variable: la cantidad de clientes de la mañana
+es Poisson de media 100 y, dada la cantidad, los instantes son independientes
+con la normal truncada a [8, 12] como densidad (por inversión de la función de
+distribución). Para perfiles de intensidad arbitrarios, `llegadas_por_raleo`
+sortea un Poisson homogéneo con la intensidad máxima y acepta cada llegada con
+probabilidad intensidad(t) / máxima. Todos los generadores por lotes devuelven
+el mismo formato, así que sirven como `generar_llegadas` de `estudiar_boxes`.
+"""
+
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heappop, heappush, heapreplace
+
+import numpy as np
+from scipy import special, stats
+
+APERTURA = 4 * 3600             # segundos (de 8 a 12)
+PROBABILIDAD_LLEGADA = 1 / 144  # por segundo
+ATENCION_MEDIA = 10 * 60        # segundos
+ATENCION_DESVIO = 5 * 60        # segundos
+PACIENCIA = 30 * 60             # segundos hasta abandonar la cola
+COSTO_BOX = 1000                # $ por box abierto toda la mañana
+COSTO_ABANDONO = 10_000         # $ por cliente que se va sin ser atendido
+
+# Afluencia del TP8: intensidad normal centrada a las 10 (2 h desde la apertura), truncada al horario de 8 a 12
+CLIENTES_ESPERADOS = 100        # clientes por mañana
+PICO_AFLUENCIA = 2 * 3600       # segundos desde la apertura
+DESVIO_AFLUENCIA = 2 * 3600     # segundos
+
+# Estado de cada cliente
+ESPERANDO, ATENDIDO, ABANDONADO = 0, 1, 2
+
+
+def llegadas_poisson(rng, tasa=PROBABILIDAD_LLEGADA, apertura=APERTURA):
+    """
+    Instantes de llegada de una mañana con tiempos entre llegadas exponenciales.
+
+    rng: np.random.Generator
+    tasa: Clientes por segundo
+    apertura: Duración del horario de ingreso (s)
+
+    Devuelve un array ordenado de instantes en [0, apertura).
+    """
+    # Sorteamos de una vez con margen (media + 6 desvíos) y completamos si no alcanza
+    esperados = tasa * apertura
+    tanda = int(esperados + 6 * np.sqrt(esperados)) + 10
+    llegadas = np.cumsum(rng.exponential(1 / tasa, tanda))
+    while llegadas[-1] < apertura:
+        llegadas = np.concatenate([llegadas, llegadas[-1] + np.cumsum(rng.exponential(1 / tasa, tanda))])
+    return llegadas[:np.searchsorted(llegadas, apertura)]
+
+
+def llegadas_poisson_lote(rng, n_mananas, tasa=PROBABILIDAD_LLEGADA, apertura=APERTURA):
+    """
+    Llegadas Poisson de `n_mananas` mañanas a la vez.
+
+    Se sortea la cantidad de clientes de cada mañana (Poisson) y, dada la cantidad,
+    sus instantes son uniformes en [0, apertura) ordenados, lo que equivale a
+    tiempos entre llegadas exponenciales.
+
+    Devuelve un array (n_mananas, K) ordenado por fila, completado con inf donde
+    la mañana tiene menos de K clientes.
+    """
+    cantidades = rng.poisson(tasa * apertura, n_mananas)
+    llegadas = rng.uniform(0, apertura, (n_mananas, max(int(cantidades.max()), 1)))
+    llegadas[np.arange(llegadas.shape[1]) >= cantidades[:, np.newaxis]] = np.inf
+    llegadas.sort(axis=1)
+    return llegadas
+
+
+def _limites_normales(pico, desvio, apertura):
+    """Función de distribución normal estándar en los extremos del horario."""
+    return special.ndtr(-pico / desvio), special.ndtr((apertura - pico) / desvio)
+
+
+def intensidad_normal(t, esperados=CLIENTES_ESPERADOS, pico=PICO_AFLUENCIA, desvio=DESVIO_AFLUENCIA,
+                      apertura=APERTURA):
+    """
+    Intensidad de llegadas del TP8 (clientes por segundo) en los instantes t.
+
+    Es la densidad normal(pico, desvio) truncada a [0, apertura), escalada para
+    que su integral en el horario sea `esperados`. Vale 0 fuera del horario.
+    """
+    t = np.asarray(t, dtype=float)
+    inferior, superior = _limites_normales(pico, desvio, apertura)
+    densidad = np.exp(-0.5 * ((t - pico) / desvio)**2) / (desvio * np.sqrt(2 * np.pi) * (superior - inferior))
+    return np.where((t >= 0) & (t < apertura), esperados * densidad, 0.0)
+
+
+def llegadas_normales_lote(rng, n_mananas, esperados=CLIENTES_ESPERADOS, pico=PICO_AFLUENCIA,
+                           desvio=DESVIO_AFLUENCIA, apertura=APERTURA):
+    """
+    Llegadas del TP8 de `n_mananas` mañanas a la vez.
+
+    rng: np.random.Generator
+    esperados: Clientes esperados por mañana
+    pico, desvio: Media y desvío de la afluencia (s desde la apertura)
+    apertura: Duración del horario de ingreso (s); la normal se trunca a [0, apertura)
+
+    La cantidad de clientes es Poisson(esperados) y los instantes se sortean por
+    inversión: uniformes entre Φ(0) y Φ(apertura) transformadas con la inversa de
+    la normal. Devuelve un array (n_mananas, K) como `llegadas_poisson_lote`.
+    """
+    inferior, superior = _limites_normales(pico, desvio, apertura)
+    cantidades = rng.poisson(esperados, n_mananas)
+    u = rng.uniform(inferior, superior, (n_mananas, max(int(cantidades.max()), 1)))
+    llegadas = np.clip(pico + desvio * special.ndtri(u), 0.0, np.nextafter(apertura, 0))
+    llegadas[np.arange(llegadas.shape[1]) >= cantidades[:, np.newaxis]] = np.inf
+    llegadas.sort(axis=1)
+    return llegadas
+
+
+def llegadas_normales(rng, esperados=CLIENTES_ESPERADOS, pico=PICO_AFLUENCIA, desvio=DESVIO_AFLUENCIA,
+                      apertura=APERTURA):
+    """Instantes de llegada ordenados de una mañana del TP8 (ver `llegadas_normales_lote`)."""
+    llegadas = llegadas_normales_lote(rng, 1, esperados, pico, desvio, apertura)[0]
+    return llegadas[np.isfinite(llegadas)]
+
+
+def llegadas_por_raleo(rng, n_mananas, intensidad=intensidad_normal, intensidad_maxima=None, apertura=APERTURA):
+    """
+    Llegadas de un Poisson no homogéneo por raleo (thinning), para `n_mananas` mañanas a la vez.
+
+    intensidad: Función vectorizada t -> clientes por segundo en [0, apertura)
+    intensidad_maxima: Cota superior de la intensidad en el horario; si se omite se
+        estima sobre una grilla de un segundo con un 1% de margen
+
+    Se sortea un Poisson homogéneo con la intensidad máxima y se conserva cada
+    llegada con probabilidad intensidad(t) / intensidad_maxima. Cuanto más
+    picuda la intensidad, más candidatos se descartan. Devuelve un array
+    (n_mananas, K) como `llegadas_poisson_lote`. Para usarla en `estudiar_boxes`
+    con otro perfil, fijar los argumentos con functools.partial sobre funciones
+    de nivel de módulo.
+    """
+    if intensidad_maxima is None:
+        intensidad_maxima = 1.01 * float(np.max(intensidad(np.arange(0, apertura, 1.0))))
+    candidatos = llegadas_poisson_lote(rng, n_mananas, intensidad_maxima, apertura)
+    presentes = np.isfinite(candidatos)
+    aceptadas = np.zeros(candidatos.shape, dtype=bool)
+    aceptadas[presentes] = (rng.uniform(0, intensidad_maxima, presentes.sum())
+                            < intensidad(candidatos[presentes]))
+    llegadas = np.where(aceptadas, candidatos, np.inf)
+    llegadas.sort(axis=1)
+    return llegadas[:, :max(int(aceptadas.sum(axis=1).max()), 1)]
+
+
+def tiempos_atencion(rng, n, media=ATENCION_MEDIA, desvio=ATENCION_DESVIO):
+    """Tiempos de atención (s) de n clientes: normal(media, desvio) truncada en 0."""
+    return np.maximum(rng.normal(media, desvio, n), 0.0)
+
+
+class ColaEspera:
+    """
+    Cola FIFO de clientes que abandonan después de esperar `paciencia` segundos.
+
+    Los clientes y sus instantes de llegada se guardan en arrays de `capacidad`
+    lugares y la cola es el tramo [frente, fondo). Cada cliente entra una sola vez,
+    así que alcanza con la cantidad de clientes de la mañana. Con la misma
+    paciencia para todos, el orden de vencimiento es el de llegada y `vencer`
+    sólo avanza el frente.
+
+    capacidad: Cantidad máxima de clientes que pueden entrar a la cola
+    paciencia: Espera máxima (s)
+    """
+
+    def __init__(self, capacidad, paciencia=PACIENCIA):
+        self.clientes = array('q', bytes(8 * capacidad))
+        self.llegadas = array('d', bytes(8 * capacidad))
+        self.paciencia = paciencia
+        self.frente = 0
+        self.fondo = 0
+
+    def __len__(self):
+        return self.fondo - self.frente
+
+    def agregar(self, cliente, llegada):
+        """Pone al cliente al final de la cola."""
+        self.clientes[self.fondo] = cliente
+        self.llegadas[self.fondo] = llegada
+        self.fondo += 1
+
+    def vencer(self, t):
+        """Saca del frente a los que en el instante t esperaron más de `paciencia` y los devuelve."""
+        inicio = frente = self.frente
+        llegadas, paciencia, fondo = self.llegadas, self.paciencia, self.fondo
+        while frente < fondo and llegadas[frente] + paciencia < t:
+            frente += 1
+        self.frente = frente
+        return self.clientes[inicio:frente]
+
+    def sacar(self):
+        """Saca y devuelve al primero de la cola."""
+        self.frente += 1
+        return self.clientes[self.frente - 1]
+
+
+def simular_manana(n_boxes, llegadas, atenciones, paciencia=PACIENCIA, costo_box=COSTO_BOX,
+                   costo_abandono=COSTO_ABANDONO):
+    """
+    Motor por eventos discretos de una mañana.
+
+    n_boxes: Cantidad de boxes abiertos
+    llegadas: Instantes de llegada (s), ordenados
+    atenciones: Tiempo de atención (s) de cada cliente, en el mismo orden
+    paciencia: Espera máxima en la cola antes de abandonar (s)
+    costo_box, costo_abandono: Costos de la operación ($)
+
+    Devuelve un diccionario con:
+        ingresados, atendidos, abandonos: Cantidades de clientes
+        inicio: Instante (s) en que cada cliente atendido entra a un box, en orden de llegada
+        espera: Espera en el salón (s) de cada cliente atendido
+        atencion: Tiempo en el box (s) de cada cliente atendido
+        estado: Estado final de cada cliente (ATENDIDO o ABANDONADO)
+        cierre: Instante en que se va el último cliente (s)
+        costo: Costo de la operación ($)
+    """
+    llegadas = llegadas.tolist() if isinstance(llegadas, np.ndarray) else list(llegadas)
+    atenciones = atenciones.tolist() if isinstance(atenciones, np.ndarray) else list(atenciones)
+    n = len(llegadas)
+
+    cola = ColaEspera(n, paciencia)
+    fines = []  # Heap con el fin de atención de cada box ocupado
+    estado = bytearray(n)
+    inicio = list(llegadas)
+    libres = n_boxes
+    abandonos = 0
+    # Cada abandono se descarta en un fin de atención posterior: la última salida es el último fin
+    cierre = 0.0
+    k = 0
+
+    while k < n or fines:
+        if fines and (k == n or fines[0] <= llegadas[k]):
+            t = cierre = fines[0]
+            vencidos = cola.vencer(t)
+            for j in vencidos:
+                estado[j] = ABANDONADO
+            abandonos += len(vencidos)
+            if cola:
+                j = cola.sacar()
+                estado[j] = ATENDIDO
+                inicio[j] = t
+                heapreplace(fines, t + atenciones[j])
+            else:
+                heappop(fines)
+                libres += 1
+        else:
+            t = llegadas[k]
+            if libres:
+                libres -= 1
+                estado[k] = ATENDIDO
+                heappush(fines, t + atenciones[k])
+            else:
+                cola.agregar(k, t)
+            k += 1
+
+    atendido = np.frombuffer(bytes(estado), dtype=np.uint8) == ATENDIDO
+    inicio = np.array(inicio)[atendido]
+    return {
+        'ingresados': n,
+        'atendidos': n - abandonos,
+        'abandonos': abandonos,
+        'inicio': inicio,
+        'espera': inicio - np.array(llegadas)[atendido],
+        'atencion': np.array(atenciones)[atendido],
+        'estado': np.frombuffer(bytes(estado), dtype=np.uint8).copy(),
+        'cierre': cierre,
+        'costo': n_boxes * costo_box + abandonos * costo_abandono,
+    }
+
+
+def simular_atencion(n_boxes, rng, tasa=PROBABILIDAD_LLEGADA, apertura=APERTURA, media=ATENCION_MEDIA,
+                     desvio=ATENCION_DESVIO, paciencia=PACIENCIA):
+    """Una mañana del TP7: llegadas Poisson, atención normal truncada y el motor por eventos."""
+    llegadas = llegadas_poisson(rng, tasa, apertura)
+    return simular_manana(n_boxes, llegadas, tiempos_atencion(rng, len(llegadas), media, desvio), paciencia)
+
+
+def simular_mananas(n_boxes, llegadas, atenciones, paciencia=PACIENCIA, costo_box=COSTO_BOX,
+                    costo_abandono=COSTO_ABANDONO):
+    """
+    Versión vectorizada de `simular_manana` para muchas mañanas.
+
+    llegadas: Array (n_mananas, K) ordenado por fila, con inf donde no hay cliente
+    atenciones: Array (n_mananas, K) de tiempos de atención (s)
+
+    Devuelve un diccionario de arrays con un valor por mañana: 'ingresados',
+    'atendidos', 'abandonos', 'espera_media' (de los atendidos), 'espera_maxima'
+    (los que abandonan cuentan con la paciencia completa) y 'costo'.
+    """
+    n_mananas, k = llegadas.shape
+    # Ordenamos las mañanas de más a menos clientes: las que tienen cliente j son un prefijo.
+    # Un cliente por fila, para que cada paso lea memoria contigua
+    cantidades = np.isfinite(llegadas).sum(axis=1)
+    orden = np.argsort(-cantidades, kind='stable')
+    llegadas, atenciones = np.ascontiguousarray(llegadas[orden].T), np.ascontiguousarray(atenciones[orden].T)
+    activas = np.searchsorted(-cantidades[orden], -np.arange(k), side='left')
+
+    # Instante en que se libera cada box, ordenado de menor a mayor en cada mañana (columna)
+    libre_desde = np.zeros((n_boxes, n_mananas))
+    nuevo = np.empty_like(libre_desde)
+    atendidos = np.zeros(n_mananas, dtype=np.int64)
+    suma_espera = np.zeros(n_mananas)
+    espera_maxima = np.zeros(n_mananas)
+
+    for j in range(k):
+        m = activas[j]
+        libre, siguiente = libre_desde[:, :m], nuevo[:, :m]
+        llegada = llegadas[j, :m]
+        espera = libre[0] - llegada
+        np.maximum(espera, 0.0, out=espera)
+        atiende = espera <= paciencia
+
+        # El cliente ocupa el primer box libre; insertamos su fin de atención manteniendo el orden
+        fin = llegada + espera + atenciones[j, :m]
+        np.minimum(libre[1:], fin, out=siguiente[:-1])
+        np.maximum(siguiente[:-1], libre[:-1], out=siguiente[:-1])
+        np.maximum(libre[-1], fin, out=siguiente[-1])
+        np.copyto(libre, siguiente, where=atiende)
+
+        atendidos[:m] += atiende
+        suma_espera[:m] += np.where(atiende, espera, 0.0)
+        np.maximum(espera_maxima[:m], np.minimum(espera, paciencia), out=espera_maxima[:m])
+
+    # Volvemos al orden original de las mañanas
+    inversa = np.empty_like(orden)
+    inversa[orden] = np.arange(n_mananas)
+    atendidos, suma_espera, espera_maxima = atendidos[inversa], suma_espera[inversa], espera_maxima[inversa]
+    ingresados = cantidades
+    abandonos = ingresados - atendidos
+    return {
+        'ingresados': ingresados,
+        'atendidos': atendidos,
+        'abandonos': abandonos,
+        'espera_media': suma_espera / np.maximum(atendidos, 1),
+        'espera_maxima': espera_maxima,
+        'costo': n_boxes * costo_box + abandonos * costo_abandono,
+    }
+
+
+METRICAS = ('costo', 'atendidos', 'abandonos', 'espera_media', 'espera_maxima')
+
+
+def _lote_estudio(boxes, n_mananas, semilla, generar_llegadas, parametros):
+    """Sumas de un lote de mañanas para cada cantidad de boxes (corre en un proceso del pool)."""
+    rng = np.random.default_rng(semilla)
+    llegadas = generar_llegadas(rng, n_mananas)
+    atenciones = tiempos_atencion(rng, llegadas.shape, parametros['media'], parametros['desvio'])
+    sumas = {m: np.zeros(len(boxes)) for m in METRICAS}
+    cuadrados = {m: np.zeros(len(boxes)) for m in METRICAS}
+    costos = np.empty((n_mananas, len(boxes)))
+    for b, n_boxes in enumerate(boxes):
+        resultado = simular_mananas(n_boxes, llegadas, atenciones, parametros['paciencia'])
+        for m in METRICAS:
+            sumas[m][b] = resultado[m].sum()
+            cuadrados[m][b] = np.square(resultado[m], dtype=float).sum()
+        costos[:, b] = resultado['costo']
+    # Productos cruzados de costos para las diferencias apareadas entre cantidades de boxes
+    return n_mananas, sumas, cuadrados, costos.T @ costos
+
+
+def estudiar_boxes(boxes=range(1, 11), n_mananas=100_000, semilla=None, procesos=None, tamano_lote=20_000,
+                   confianza=0.95, generar_llegadas=llegadas_poisson_lote, media=ATENCION_MEDIA,
+                   desvio=ATENCION_DESVIO, paciencia=PACIENCIA):
+    """
+    Estudio replicado de la cantidad de boxes.
+
+    boxes: Cantidades de boxes a comparar
+    n_mananas: Mañanas independientes simuladas (las mismas para todas las cantidades de boxes)
+    semilla: Semilla raíz; cada lote recibe una semilla derivada (np.random.SeedSequence)
+    procesos: Procesos del pool (por defecto, uno por núcleo; con 1 no se crea pool)
+    tamano_lote: Mañanas por tarea del pool
+    generar_llegadas: Función (rng, n_mananas) -> llegadas como en `llegadas_poisson_lote`;
+        debe ser de nivel de módulo para poder enviarla al pool
+
+    Devuelve un diccionario con 'boxes', 'n_mananas', un diccionario por métrica de
+    `METRICAS` con 'media' y 'semiancho' (intervalo t de la media) por cantidad de boxes,
+    'mejor' (cantidad de boxes con menor costo medio) y 'diferencia' con la diferencia
+    media de costo contra la mejor, su 'semiancho' y 'distinguible' (el intervalo no
+    incluye al 0).
+    """
+    boxes = list(boxes)
+    parametros = {'media': media, 'desvio': desvio, 'paciencia': paciencia}
+    tamanos = [min(tamano_lote, n_mananas - inicio) for inicio in range(0, n_mananas, tamano_lote)]
+    semillas = np.random.SeedSequence(semilla).spawn(len(tamanos))
+    tareas = [(boxes, n, s, generar_llegadas, parametros) for n, s in zip(tamanos, semillas)]
+
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1:
+        parciales = [_lote_estudio(*tarea) for tarea in tareas]
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            parciales = list(pool.map(_lote_estudio, *zip(*tareas)))
+
+    n = sum(p[0] for p in parciales)
+    cuantil = stats.t.ppf(0.5 + confianza / 2, n - 1)
+    resultado = {'boxes': np.array(boxes), 'n_mananas': n}
+    for m in METRICAS:
+        suma = sum(p[1][m] for p in parciales)
+        cuadrado = sum(p[2][m] for p in parciales)
+        media_m = suma / n
+        varianza = np.maximum(cuadrado - n * media_m**2, 0.0) / (n - 1)
+        resultado[m] = {'media': media_m, 'semiancho': cuantil * np.sqrt(varianza / n)}
+
+    # Diferencias apareadas de costo contra la mejor cantidad de boxes: Var(Ci - Cj) sale de la matriz de productos
+    costo = resultado['costo']['media']
+    cruzados = sum(p[3] for p in parciales)
+    mejor = int(np.argmin(costo))
+    diferencia = costo - costo[mejor]
+    varianza = np.diag(cruzados) + cruzados[mejor, mejor] - 2 * cruzados[:, mejor] - n * diferencia**2
+    semiancho = cuantil * np.sqrt(np.maximum(varianza, 0.0) / (n - 1) / n)
+    resultado['mejor'] = boxes[mejor]
+    resultado['diferencia'] = {
+        'media': diferencia,
+        'semiancho': semiancho,
+        'distinguible': np.abs(diferencia) > semiancho,
+    }
+    return resultado
+
+
+LINEA = ('cola', 'ocupados', 'ingresados', 'atendidos', 'abandonos')
+
+
+def linea_de_tiempo(llegadas, manana, paciencia=PACIENCIA):
+    """
+    Estado del local en cada instante en que cambia, reconstruido del resultado de `simular_manana`.
+
+    llegadas: Instantes de llegada con los que se simuló la mañana
+    manana: Diccionario devuelto por `simular_manana`
+    paciencia: La misma espera máxima de la simulación (s)
+
+    Cada cliente atendido entra al box en su 'inicio' y sale atencion después;
+    cada uno que abandonó sale de la cola en llegada + paciencia. Devuelve un
+    diccionario con 'tiempo' (instantes de cambio ordenados, empezando en 0) y un
+    array int32 por campo de `LINEA`: el estado después de procesar todos los
+    eventos de ese instante ('atendidos' cuenta a los que ya entraron a un box).
+    El estado entre dos instantes es el del anterior.
+    """
+    llegadas = np.asarray(llegadas, dtype=float)
+    atendido = manana['estado'] == ATENDIDO
+    inicio = manana['inicio']
+    partes = [
+        (np.zeros(1), (0, 0, 0, 0, 0)),
+        (llegadas, (1, 0, 1, 0, 0)),
+        (inicio, (-1, 1, 0, 1, 0)),
+        (inicio + manana['atencion'], (0, -1, 0, 0, 0)),
+        (llegadas[~atendido] + paciencia, (-1, 0, 0, 0, 1)),
+    ]
+    tiempo = np.concatenate([t for t, _ in partes])
+    cambios = np.concatenate([np.tile(np.array(c, dtype=np.int32), (len(t), 1)) for t, c in partes])
+    orden = np.argsort(tiempo, kind='stable')
+    tiempo = tiempo[orden]
+    estado = np.cumsum(cambios[orden], axis=0, dtype=np.int32)
+    # Un único estado por instante: el que queda después del último evento
+    ultimo = np.append(tiempo[1:] != tiempo[:-1], True)
+    linea = {'tiempo': tiempo[ultimo]}
+    linea.update({campo: estado[ultimo, j] for j, campo in enumerate(LINEA)})
+    return linea
+
+
+def muestrear_linea(linea, instantes):
+    """
+    Estado de una `linea_de_tiempo` en los instantes pedidos (ordenados), por ejemplo uno por segundo.
+
+    Además de los campos de `LINEA` devuelve 'cola_maxima', la cola más larga entre
+    el instante anterior y cada instante, para que un muestreo grueso no esconda
+    los picos.
+    """
+    instantes = np.asarray(instantes, dtype=float)
+    indices = np.maximum(np.searchsorted(linea['tiempo'], instantes, side='right') - 1, 0)
+    muestra = {'tiempo': instantes}
+    muestra.update({campo: linea[campo][indices] for campo in LINEA})
+    # Máximo sobre los estados [indice anterior, indice actual] de cada intervalo
+    desde = np.concatenate([indices[:1], indices[:-1]])
+    cola = np.append(linea['cola'], 0)
+    muestra['cola_maxima'] = np.maximum.reduceat(cola, np.column_stack([desde, indices + 1]).ravel())[::2]
+    return muestra
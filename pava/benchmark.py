@@ -0,0 +1,408 @@
+"""
+Suite de benchmarks de los núcleos de simulación de los TPs.
+
+Corre cada núcleo sin interfaz gráfica con varios tamaños de problema
+(escenarios × pasos) y mide tiempo de reloj, memoria pico (tracemalloc) y
+rendimiento en pasos por segundo. Los resultados se guardan en JSON y se pueden
+comparar con una corrida anterior para detectar regresiones:
+
+    python -m pava.benchmark --salida base.json
+    python -m pava.benchmark --comparar base.json --salida nueva.json
+
+Para sumar un núcleo nuevo alcanza con registrar una función de preparación con
+`@nucleo(nombre, tamanos)`: recibe (escenarios, pasos), prepara los datos y
+devuelve la función sin argumentos que se cronometra.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+from pava.modelo import CALENTADOR_BASE
+
+NUCLEOS = {}
+
+TEMP_INICIAL = 20.0
+TEMP_AMBIENTE = 20.0
+INTERVALO = 5  # segundos, como en el TP4/TP5
+
+
+def nucleo(nombre, tamanos):
+    """Registra un núcleo con la lista de tamaños (escenarios, pasos) a medir."""
+    def registrar(preparar):
+        NUCLEOS[nombre] = (preparar, tamanos)
+        return preparar
+    return registrar
+
+
+def _eventos_aleatorios(rng, pasos, probabilidad=1/300):
+    """Eventos del TP6 sorteados tick a tick, como en el notebook."""
+    eventos, restante = [], 0
+    for t in range(1, pasos + 1):
+        if restante <= 0 and rng.random() < probabilidad:
+            restante = rng.randint(5, 30)
+            eventos.append({'tiempo_inicio': t, 'descenso': rng.uniform(5, 50), 'duracion': restante})
+        restante -= 1
+    return eventos
+
+
+@nucleo('euler_tp4', [(1, 120), (10, 120), (10, 1200)])
+def _euler_tp4(escenarios, pasos):
+    """Bucle de Euler escalar del TP4, una curva por vez."""
+    c = CALENTADOR_BASE
+
+    def correr():
+        for _ in range(escenarios):
+            temperaturas = []
+            temperatura_actual = TEMP_INICIAL
+            for _ in range(pasos):
+                temperaturas.append(temperatura_actual)
+                potencia_efectiva = c.potencia - c.perdida_calor * (temperatura_actual - TEMP_AMBIENTE)
+                temperatura_actual += potencia_efectiva * INTERVALO / c.capacidad_termica
+    return correr
+
+
+@nucleo('ensamble_tp5', [(5, 120), (1_000, 120), (100_000, 120)])
+def _ensamble_tp5(escenarios, pasos):
+    """Integrador por lotes del TP5 sobre un barrido de resistencias."""
+    from pava.ensamble import simular_ensamble
+    c = CALENTADOR_BASE
+    tiempo = np.arange(pasos + 1) * INTERVALO
+    resistencias = np.linspace(0.18, 0.28, escenarios)
+    return lambda: simular_ensamble(tiempo, resistencias, c.voltaje, TEMP_INICIAL, TEMP_AMBIENTE,
+                                    c.masa_agua, c.perdida_calor, c.calor_especifico)
+
+
+@nucleo('analitico_tp5', [(1_000, 120), (100_000, 120)])
+def _analitico_tp5(escenarios, pasos):
+    """Solución exacta evaluada en la misma grilla que el integrador por lotes."""
+    from pava.analitico import temperatura_exacta
+    c = CALENTADOR_BASE
+    tiempo = np.arange(pasos + 1) * INTERVALO
+    resistencias = np.linspace(0.18, 0.28, escenarios)
+    return lambda: temperatura_exacta(tiempo, resistencias, c.voltaje, TEMP_INICIAL, TEMP_AMBIENTE,
+                                      c.masa_agua, c.perdida_calor, c.calor_especifico)
+
+
+@nucleo('cruces', [(10_000, 120), (100_000, 120)])
+def _cruces(escenarios, pasos):
+    """Detección del tiempo hasta 80°C sobre un lote de trayectorias."""
+    from pava.analitico import temperatura_exacta
+    from pava.cruces import tiempos_de_cruce
+    c = CALENTADOR_BASE
+    tiempo = np.arange(pasos + 1) * INTERVALO
+    trayectorias = temperatura_exacta(tiempo, np.linspace(0.18, 0.28, escenarios), c.voltaje, TEMP_INICIAL,
+                                      TEMP_AMBIENTE, c.masa_agua, c.perdida_calor, c.calor_especifico)
+    return lambda: tiempos_de_cruce(tiempo, trayectorias, 80.0)
+
+
+@nucleo('odeint_tp6', [(1, 600)])
+def _odeint_tp6(escenarios, pasos):
+    """Versión original del TP6: una llamada a odeint por tick."""
+    from scipy.integrate import odeint
+    c = CALENTADOR_BASE
+    rng = random.Random(42)
+
+    # Temperatura ambiente de cada tick, preparada fuera de la medición
+    ambientes = []
+    for _ in range(escenarios):
+        temp_ambiente = np.full(pasos, TEMP_AMBIENTE)
+        for e in _eventos_aleatorios(rng, pasos):
+            temp_ambiente[e['tiempo_inicio'] - 1:e['tiempo_inicio'] - 1 + e['duracion']] -= e['descenso']
+        ambientes.append(temp_ambiente)
+
+    def modelo(T, t, T_ambiente):
+        return (c.potencia - c.perdida_calor * (T - T_ambiente)) / c.capacidad_termica
+
+    def correr():
+        for temp_ambiente in ambientes:
+            temperatura = TEMP_INICIAL
+            for t in range(1, pasos + 1):
+                temperatura = odeint(modelo, temperatura, [t - 1, t], args=(temp_ambiente[t - 1],))[-1, 0]
+    return correr
+
+
+@nucleo('tramos_tp6', [(1, 600), (100, 600), (1, 31_536_000)])
+def _tramos_tp6(escenarios, pasos):
+    """Integrador exacto por tramos del TP6 (sólo evalúa en los límites de los tramos)."""
+    from pava.estocastico import integrar_por_tramos, tramos_ambiente
+    c = CALENTADOR_BASE
+    rng = np.random.default_rng(42)
+    tramos = []
+    for _ in range(escenarios):
+        # Eventos con tiempos entre llegadas geométricos, para no recorrer el horizonte tick a tick
+        inicios = np.cumsum(rng.geometric(1/300, size=int(pasos / 300 * 1.2) + 10) + 30)
+        eventos = [{'tiempo_inicio': t, 'descenso': rng.uniform(5, 50), 'duracion': int(rng.integers(5, 31))}
+                   for t in inicios[inicios < pasos]]
+        tramos.append(tramos_ambiente(eventos, TEMP_AMBIENTE, pasos))
+
+    def correr():
+        for limites, temps_ambiente in tramos:
+            integrar_por_tramos(limites, temps_ambiente, TEMP_INICIAL, c.potencia, c.perdida_calor,
+                                c.masa_agua, c.calor_especifico)
+    return correr
+
+
+@nucleo('montecarlo_tp6', [(1_000, 600), (20_000, 600)])
+def _montecarlo_tp6(escenarios, pasos):
+    """Réplicas Monte Carlo del TP6 con estadísticas en streaming."""
+    from pava.montecarlo import simular_replicas
+    c = CALENTADOR_BASE
+    return lambda: simular_replicas(escenarios, pasos, TEMP_INICIAL, TEMP_AMBIENTE, c.potencia, c.perdida_calor,
+                                    c.masa_agua, c.calor_especifico, semilla=42)
+
+
+@nucleo('hielo_tp4', [(1, 100), (1, 600)])
+def _hielo_tp4(escenarios, pasos):
+    """Integrador adaptativo con fusión de hielo (pasos = horizonte en segundos)."""
+    from pava.hielo import simular_con_hielo
+    adiciones = [{'tiempo': pasos / 2, 'masa': 0.04, 'cubos': 4}]
+
+    def correr():
+        for _ in range(escenarios):
+            simular_con_hielo(CALENTADOR_BASE, TEMP_INICIAL, TEMP_AMBIENTE, pasos, adiciones)
+    return correr
+
+
+@nucleo('disenos', [(10_000, 1), (1_000_000, 1)])
+def _disenos(escenarios, pasos):
+    """Evaluación vectorizada de diseños candidatos del optimizador."""
+    from pava.optimizacion import evaluar_disenos
+    rng = np.random.default_rng(42)
+    disenos = {'resistencia': rng.uniform(0.1, 1.0, escenarios), 'espesor_aislante': rng.uniform(0.1, 3.0, escenarios),
+               'diametro': rng.uniform(5, 15, escenarios), 'altura': rng.uniform(8, 25, escenarios)}
+    return lambda: evaluar_disenos(disenos)
+
+
+@nucleo('lttb', [(1_000, 120), (100_000, 120)])
+def _lttb(escenarios, pasos):
+    """Reducción LTTB a 30 puntos de un lote de curvas antes de graficarlas."""
+    from pava.analitico import temperatura_exacta
+    from pava.graficos import lttb
+    c = CALENTADOR_BASE
+    tiempo = np.arange(pasos + 1) * INTERVALO
+    trayectorias = temperatura_exacta(tiempo, np.linspace(0.18, 0.28, escenarios), c.voltaje, TEMP_INICIAL,
+                                      TEMP_AMBIENTE, c.masa_agua, c.perdida_calor, c.calor_especifico)
+    return lambda: lttb(tiempo, trayectorias, 30)
+
+
+@nucleo('sobol', [(2**12, 1), (2**17, 1)])
+def _sobol(escenarios, pasos):
+    """Índices de Sobol del tiempo hasta 80°C (N·(d+2) evaluaciones, sin bootstrap)."""
+    from scipy import stats
+    from pava.analitico import tiempo_hasta_objetivo
+    from pava.sensibilidad import indices_sobol
+    c = CALENTADOR_BASE
+
+    def modelo(resistencia, voltaje, temp_inicial, temp_ambiente):
+        return np.minimum(tiempo_hasta_objetivo(80.0, resistencia, voltaje, temp_inicial, temp_ambiente,
+                                                c.masa_agua, c.perdida_calor, c.calor_especifico), 3600)
+
+    distribuciones = {'resistencia': stats.uniform(0.18, 0.1), 'voltaje': stats.truncnorm(-3, np.inf, 12, 4),
+                      'temp_inicial': stats.norm(10, 5), 'temp_ambiente': stats.uniform(-20, 70)}
+    return lambda: indices_sobol(modelo, distribuciones, n=escenarios, semilla=42, n_bootstrap=0)
+
+
+@nucleo('no_lineal_tp5', [(1_000, 120), (100_000, 120)])
+def _no_lineal_tp5(escenarios, pasos):
+    """Modelo no lineal con tablas de propiedades, RK4 por lotes."""
+    from pava.no_lineal import simular_no_lineal, tablas_no_lineales
+    c = CALENTADOR_BASE
+    tiempo = np.arange(pasos + 1) * INTERVALO
+    tablas = tablas_no_lineales(c)
+    variantes = c.variante(resistencia=np.linspace(0.18, 0.28, escenarios))
+    return lambda: simular_no_lineal(tiempo, variantes, TEMP_INICIAL, TEMP_AMBIENTE, tablas)
+
+
+@nucleo('estratificado', [(200, 600), (5_000, 600)])
+def _estratificado(escenarios, pasos):
+    """Perfil axial con Crank-Nicolson; acá `escenarios` es la cantidad de capas de la malla."""
+    from pava.estratificado import simular_estratificado
+    tiempo = np.arange(pasos + 1) * 1.0
+    return lambda: simular_estratificado(CALENTADOR_BASE, tiempo, TEMP_INICIAL, TEMP_AMBIENTE, n_celdas=escenarios)
+
+
+@nucleo('control_tp6', [(1_000, 600), (10_000, 600)])
+def _control_tp6(escenarios, pasos):
+    """Barrido de ganancias PID en lazo cerrado con PWM (una combinación por escenario)."""
+    from pava.control import barrer_ganancias
+    kp = np.geomspace(0.01, 5, escenarios // 100)
+    ki = np.r_[0, np.geomspace(1e-4, 0.1, 9)]
+    kd = np.r_[0, np.geomspace(0.1, 30, 9)]
+    return lambda: barrer_ganancias(CALENTADOR_BASE, 80.0, kp, ki, kd, tiempo_total=pasos, temp_ambiente=TEMP_AMBIENTE)
+
+
+@nucleo('flujo_tp6', [(1, 600), (1, 1_000_000)])
+def _flujo_tp6(escenarios, pasos):
+    """Generador tick a tick del TP6 consumido sin guardar nada."""
+    from collections import deque
+    from pava.flujo import flujo_estocastico
+    return lambda: deque(flujo_estocastico(CALENTADOR_BASE, TEMP_INICIAL, TEMP_AMBIENTE, pasos, semilla=42), maxlen=0)
+
+
+@nucleo('largo_plazo_tp6', [(1, 86_400), (1, 31_536_000)])
+def _largo_plazo_tp6(escenarios, pasos):
+    """Horizonte largo por bloques de un día, resumido por hora."""
+    from pava.largo_plazo import HORA, simular_largo_plazo
+    c = CALENTADOR_BASE
+    return lambda: simular_largo_plazo(pasos, TEMP_INICIAL, TEMP_AMBIENTE, c.potencia, c.perdida_calor, c.masa_agua,
+                                       c.calor_especifico, intervalo=HORA, semilla=42)
+
+
+@nucleo('atencion_tp7', [(1_000, 14_400), (10_000, 14_400)])
+def _atencion_tp7(escenarios, pasos):
+    """Motor por eventos discretos del TP7: `escenarios` mañanas de `pasos` segundos con 6 boxes."""
+    from pava.atencion import simular_atencion
+
+    def correr():
+        rng = np.random.default_rng(42)
+        for _ in range(escenarios):
+            simular_atencion(6, rng, apertura=pasos)
+    return correr
+
+
+@nucleo('atencion_saturada', [(10, 14_400), (100, 14_400)])
+def _atencion_saturada(escenarios, pasos):
+    """Carga patológica del TP7: 1 box, un cliente cada 2 s y paciencia de 4 horas (miles de clientes en la fila)."""
+    from pava.atencion import simular_atencion
+
+    def correr():
+        rng = np.random.default_rng(42)
+        for _ in range(escenarios):
+            simular_atencion(1, rng, tasa=1 / 2, apertura=pasos, paciencia=4 * 3600)
+    return correr
+
+
+@nucleo('estudio_tp7', [(1_000, 14_400), (6_000, 14_400)])
+def _estudio_tp7(escenarios, pasos):
+    """Estudio replicado del TP7: `escenarios` mañanas de 4 horas vectorizadas, para 1 a 10 boxes y en un solo proceso."""
+    from functools import partial
+    from pava.atencion import estudiar_boxes
+    return partial(estudiar_boxes, range(1, 11), escenarios, semilla=42, procesos=1)
+
+
+@nucleo('animacion_tp7', [(1, 14_400)])
+def _animacion_tp7(escenarios, pasos):
+    """Exportación a video de una mañana de `pasos` segundos con 3 boxes, a x600 y 15 cuadros por segundo."""
+    import os
+    import tempfile
+    from pava.animacion import exportar_animacion
+    from pava.atencion import linea_de_tiempo, llegadas_poisson, simular_manana, tiempos_atencion
+    rng = np.random.default_rng(42)
+    llegadas = llegadas_poisson(rng, apertura=pasos)
+    linea = linea_de_tiempo(llegadas, simular_manana(3, llegadas, tiempos_atencion(rng, len(llegadas))))
+    archivo = os.path.join(tempfile.gettempdir(), 'pava_benchmark_animacion.avi')
+    return lambda: exportar_animacion(linea, archivo, 3, velocidad=600, fps=15)
+
+
+def medir(nombre, escenarios, pasos, repeticiones=3):
+    """
+    Mide un núcleo con un tamaño dado.
+
+    El tiempo es el mejor de `repeticiones` corridas; la memoria pico se mide
+    aparte, en una corrida con tracemalloc activo (que agrega sobrecosto).
+    """
+    preparar, _ = NUCLEOS[nombre]
+    correr = preparar(escenarios, pasos)
+
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        correr()
+        tiempos.append(time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    correr()
+    _, memoria_pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tiempo = min(tiempos)
+    return {
+        'nucleo': nombre,
+        'escenarios': escenarios,
+        'pasos': pasos,
+        'tiempo': tiempo,
+        'memoria_pico': memoria_pico,
+        'pasos_por_segundo': escenarios * pasos / tiempo if tiempo > 0 else float('inf'),
+    }
+
+
+def correr_suite(nombres=None, repeticiones=3, tamano_maximo=None, informar=print):
+    """
+    Corre los núcleos pedidos (todos por defecto) en todos sus tamaños.
+
+    tamano_maximo: Omite los tamaños con más de este número de escenarios × pasos
+    """
+    resultados = []
+    for nombre in nombres or NUCLEOS:
+        _, tamanos = NUCLEOS[nombre]
+        for escenarios, pasos in tamanos:
+            if tamano_maximo is not None and escenarios * pasos > tamano_maximo:
+                continue
+            resultado = medir(nombre, escenarios, pasos, repeticiones)
+            resultados.append(resultado)
+            informar(f"{nombre:>16} {escenarios:>9} x {pasos:<9} {resultado['tiempo']*1000:10.2f} ms "
+                     f"{resultado['memoria_pico']/2**20:9.2f} MiB {resultado['pasos_por_segundo']:12.3e} pasos/s")
+    return {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'plataforma': platform.platform(),
+        'resultados': resultados,
+    }
+
+
+def comparar(actual, anterior, tolerancia=0.2):
+    """
+    Compara dos corridas y devuelve las regresiones.
+
+    Una medición es regresión si su tiempo supera en más de `tolerancia` (fracción)
+    al de la misma combinación núcleo/tamaño en la corrida anterior.
+    """
+    previas = {(r['nucleo'], r['escenarios'], r['pasos']): r for r in anterior['resultados']}
+    regresiones = []
+    for r in actual['resultados']:
+        previa = previas.get((r['nucleo'], r['escenarios'], r['pasos']))
+        if previa is not None and r['tiempo'] > previa['tiempo'] * (1 + tolerancia):
+            regresiones.append({**r, 'tiempo_anterior': previa['tiempo'], 'factor': r['tiempo'] / previa['tiempo']})
+    return regresiones
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de los núcleos de simulación")
+    parser.add_argument('--nucleos', nargs='+', choices=sorted(NUCLEOS), help="Núcleos a medir (todos por defecto)")
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--tamano-maximo', type=float, default=1e8,
+                        help="Omite tamaños con más escenarios × pasos (por defecto 1e8)")
+    parser.add_argument('--salida', help="Archivo JSON donde guardar los resultados")
+    parser.add_argument('--comparar', help="JSON de una corrida anterior para detectar regresiones")
+    parser.add_argument('--tolerancia', type=float, default=0.2, help="Aumento de tiempo tolerado (fracción)")
+    args = parser.parse_args(argumentos)
+
+    actual = correr_suite(args.nucleos, args.repeticiones, args.tamano_maximo)
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            json.dump(actual, archivo, indent=2)
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as archivo:
+            regresiones = comparar(actual, json.load(archivo), args.tolerancia)
+        for r in regresiones:
+            print(f"REGRESIÓN {r['nucleo']} {r['escenarios']} x {r['pasos']}: "
+                  f"{r['tiempo_anterior']*1000:.2f} ms -> {r['tiempo']*1000:.2f} ms ({r['factor']:.2f}x)")
+        if regresiones:
+            return 1
+        print("Sin regresiones")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,248 @@
+"""
+Cache persistente en disco de resultados de simulación, con desalojo LRU.
+
+Cada vez que se re-ejecuta un notebook (o se sincroniza con jupytext) los TP5 y
+TP6 vuelven a simular todos los barridos aunque no haya cambiado ningún
+parámetro. `memoizar` envuelve una función de simulación para que su resultado
+se guarde en disco bajo una clave que es el hash de:
+
+- el nombre de la función y el código fuente de su módulo y de los módulos del
+  mismo paquete que éste importa (cambiar el modelo, el integrador o, por
+  ejemplo, `pava.modelo` o `pava.almacen` invalida sus entradas),
+- todos los argumentos: parámetros del modelo, ajustes del integrador y semilla.
+  Los arrays se hashean por tipo, forma y contenido; los `Calentador` (y
+  cualquier dataclass) por sus campos.
+
+No se usa el cache (se simula siempre) cuando una corrida no es reproducible o
+tiene efectos además de su resultado: si la semilla es None, o si se pide un
+argumento con efectos como `ruta_trayectorias` (que escribe las trayectorias en
+disco y no se escribiría en un acierto).
+
+Las entradas son archivos pickle en el directorio del cache (`PAVA_CACHE` o
+`~/.cache/pava`). Cada acierto actualiza la fecha de modificación del archivo, y
+cuando el total supera el límite se borran las entradas usadas hace más tiempo.
+Las escrituras son atómicas, así que varios procesos (por ejemplo los de
+`pava.lote`) pueden compartir el cache. Con `PAVA_SIN_CACHE=1` se desactiva.
+"""
+
+import ast
+import contextlib
+import dataclasses
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+LIMITE_BYTES = 2 * 1024**3  # 2 GiB
+SEMILLAS = ('semilla',)  # Argumentos que con None dan una corrida no reproducible
+EFECTOS = ('ruta_trayectorias',)  # Argumentos que, si no son None, hacen algo más que devolver un resultado
+
+
+def _hashear(h, objeto):
+    """Agrega a `h` una representación canónica de `objeto`."""
+    if objeto is None or isinstance(objeto, (bool, int, str, bytes)):
+        h.update(f'{type(objeto).__name__}:{objeto!r};'.encode())
+    elif isinstance(objeto, float):
+        h.update(f'float:{objeto.hex()};'.encode())
+    elif isinstance(objeto, (np.ndarray, np.generic)):
+        arreglo = np.ascontiguousarray(objeto)
+        h.update(f'ndarray:{arreglo.dtype.str}:{arreglo.shape};'.encode())
+        h.update(arreglo.view(np.uint8).data if arreglo.size else b'')
+    elif isinstance(objeto, np.dtype) or (isinstance(objeto, type) and issubclass(objeto, np.generic)):
+        h.update(f'dtype:{np.dtype(objeto).str};'.encode())
+    elif isinstance(objeto, (list, tuple)):
+        h.update(f'{type(objeto).__name__}:{len(objeto)}['.encode())
+        for elemento in objeto:
+            _hashear(h, elemento)
+        h.update(b']')
+    elif isinstance(objeto, dict):
+        h.update(f'dict:{len(objeto)}{{'.encode())
+        for clave in sorted(objeto, key=repr):
+            _hashear(h, clave)
+            _hashear(h, objeto[clave])
+        h.update(b'}')
+    elif dataclasses.is_dataclass(objeto) and not isinstance(objeto, type):
+        h.update(f'{type(objeto).__qualname__}('.encode())
+        for campo in dataclasses.fields(objeto):
+            if not campo.name.startswith('_'):
+                _hashear(h, campo.name)
+                _hashear(h, getattr(objeto, campo.name))
+        h.update(b')')
+    elif isinstance(objeto, Path):
+        h.update(f'Path:{objeto};'.encode())
+    else:
+        raise TypeError(f"No se puede usar un {type(objeto).__name__} como parte de la clave del cache")
+
+
+def _dependencias(modulo):
+    """El módulo y los módulos de su mismo paquete que importa, directa o indirectamente, ordenados por nombre."""
+    paquete = modulo.__name__.split('.')[0]
+    pendientes, vistos = [modulo], {}
+    while pendientes:
+        actual = pendientes.pop()
+        if actual.__name__ in vistos:
+            continue
+        vistos[actual.__name__] = actual
+        try:
+            arbol = ast.parse(inspect.getsource(actual))
+        except (OSError, TypeError, SyntaxError):
+            continue
+        # Sentencias `import` y `from ... import` (también las de adentro de funciones)
+        for nodo in ast.walk(arbol):
+            if isinstance(nodo, ast.Import):
+                nombres = [alias.name for alias in nodo.names]
+            elif isinstance(nodo, ast.ImportFrom) and nodo.module and not nodo.level:
+                nombres = [nodo.module] + [f'{nodo.module}.{alias.name}' for alias in nodo.names]
+            else:
+                continue
+            pendientes += [sys.modules[n] for n in nombres if n.split('.')[0] == paquete and n in sys.modules]
+    return [vistos[nombre] for nombre in sorted(vistos)]
+
+
+def _version(funcion):
+    """Hash del código fuente de la función, de su módulo y de los módulos del paquete de los que depende."""
+    h = hashlib.sha256()
+    modulo = sys.modules.get(funcion.__module__)
+    for parte in _dependencias(modulo) if modulo is not None else [funcion]:
+        try:
+            codigo = inspect.getsource(parte)
+        except (OSError, TypeError):
+            codigo = getattr(parte, '__qualname__', parte.__name__)
+        h.update(f'{parte.__name__}:{len(codigo)};'.encode())
+        h.update(codigo.encode())
+    return h.hexdigest()
+
+
+def clave(*partes):
+    """Hash hexadecimal (SHA-256) de una combinación de valores."""
+    h = hashlib.sha256()
+    for parte in partes:
+        _hashear(h, parte)
+    return h.hexdigest()
+
+
+class CacheSimulaciones:
+    """
+    Directorio de resultados memoizados con límite de tamaño y desalojo LRU.
+
+    directorio: Dónde guardar las entradas (por defecto `PAVA_CACHE` o ~/.cache/pava)
+    limite_bytes: Tamaño total máximo; al superarlo se borran las entradas menos usadas
+    """
+
+    def __init__(self, directorio=None, limite_bytes=LIMITE_BYTES):
+        if directorio is None:
+            directorio = os.environ.get('PAVA_CACHE', Path.home() / '.cache' / 'pava')
+        self.directorio = Path(directorio)
+        self.limite_bytes = limite_bytes
+        self.aciertos = 0
+        self.fallos = 0
+        self.salteados = 0  # Llamadas que no usaron el cache (sin semilla o con efectos)
+
+    def _ruta(self, clave):
+        return self.directorio / f'{clave}.pkl'
+
+    def obtener(self, clave):
+        """Devuelve (True, valor) si la clave está en el cache, o (False, None)."""
+        ruta = self._ruta(clave)
+        try:
+            with open(ruta, 'rb') as archivo:
+                valor = pickle.load(archivo)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            self.fallos += 1
+            return False, None
+        # Marcamos la entrada como recién usada para el LRU (otro proceso pudo haberla desalojado)
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(ruta)
+        self.aciertos += 1
+        return True, valor
+
+    def guardar(self, clave, valor):
+        """Guarda `valor` en forma atómica y desaloja entradas viejas si hace falta."""
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        descriptor, temporal = tempfile.mkstemp(dir=self.directorio, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as archivo:
+                pickle.dump(valor, archivo, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporal, self._ruta(clave))
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(temporal)
+            raise
+        self.desalojar()
+
+    def entradas(self):
+        """Lista de (ruta, tamaño, último uso) de las entradas, de la más vieja a la más nueva."""
+        entradas = []
+        for ruta in self.directorio.glob('*.pkl'):
+            with contextlib.suppress(FileNotFoundError):
+                estado = ruta.stat()
+                entradas.append((ruta, estado.st_size, estado.st_mtime))
+        return sorted(entradas, key=lambda e: e[2])
+
+    def tamano(self):
+        """Tamaño total del cache en bytes."""
+        return sum(tamano for _, tamano, _ in self.entradas())
+
+    def desalojar(self):
+        """Borra las entradas menos usadas hasta quedar por debajo del límite."""
+        entradas = self.entradas()
+        total = sum(tamano for _, tamano, _ in entradas)
+        for ruta, tamano, _ in entradas:
+            if total <= self.limite_bytes:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                ruta.unlink()
+            total -= tamano
+
+    def limpiar(self):
+        """Borra todas las entradas."""
+        for ruta, _, _ in self.entradas():
+            with contextlib.suppress(FileNotFoundError):
+                ruta.unlink()
+
+    def memoizar(self, funcion, semillas=SEMILLAS, efectos=EFECTOS):
+        """
+        Decorador: guarda en este cache los resultados de `funcion`.
+
+        semillas: Argumentos de semilla; si alguno es None la llamada no usa el cache
+        efectos: Argumentos con efectos; si alguno no es None la llamada no usa el cache
+        """
+        version = _version(funcion)
+        firma = inspect.signature(funcion)
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if os.environ.get('PAVA_SIN_CACHE'):
+                return funcion(*args, **kwargs)
+            argumentos = firma.bind(*args, **kwargs)
+            argumentos.apply_defaults()
+            valores = argumentos.arguments
+            if (any(n in valores and valores[n] is None for n in semillas)
+                    or any(valores.get(n) is not None for n in efectos)):
+                self.salteados += 1
+                return funcion(*args, **kwargs)
+            k = clave(funcion.__module__, funcion.__qualname__, version, dict(valores))
+
+            encontrado, valor = self.obtener(k)
+            if encontrado:
+                return valor
+            valor = funcion(*args, **kwargs)
+            self.guardar(k, valor)
+            return valor
+
+        envoltura.cache = self
+        return envoltura
+
+
+CACHE = CacheSimulaciones()
+
+
+def memoizar(funcion, semillas=SEMILLAS, efectos=EFECTOS):
+    """Memoiza `funcion` en el cache compartido `CACHE` (ver `CacheSimulaciones.memoizar`)."""
+    return CACHE.memoizar(funcion, semillas, efectos)
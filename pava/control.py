@@ -0,0 +1,278 @@
+"""
+Control en lazo cerrado del calentador: termostato, PI/PID y PWM sobre la fuente de 12 V.
+
+En los TP anteriores la resistencia está siempre conectada a plena tensión. Acá
+un controlador mide la temperatura del agua al comienzo de cada tick y decide el
+ciclo de trabajo d ∈ [0, 1] de un PWM sobre la fuente: durante los primeros d·Δt
+segundos del tick la resistencia recibe la tensión completa y el resto del tick
+queda desconectada. Como el ambiente es constante dentro del tick, cada parte se
+integra en forma exacta (`pava.estocastico.avanzar_exacto`), así que el PWM no se
+aproxima con su potencia media.
+
+Controladores (todos vectorizados: las ganancias pueden ser arrays y cada
+elemento es un lazo independiente):
+
+- `Termostato`: encendido/apagado con histéresis; d vale 0 o 1.
+- `PID`: d = kp·e + I + D con e = consigna - T. La acción derivativa se calcula
+  sobre la medición (sin salto al cambiar la consigna) y la integral sólo
+  acumula mientras la salida no está saturada o cuando el error la saca de la
+  saturación (anti-windup por integración condicional). Un PI es un PID con kd = 0.
+
+`barrer_ganancias` simula miles de combinaciones de ganancias por lotes y las
+ordena por sobrepico, tiempo de establecimiento y energía consumida.
+
+`integrar_termostato` da la misma trayectoria que `simular_lazo_cerrado` con un
+`Termostato` escalar sin recorrer los ticks uno por uno: mientras el ambiente y
+el estado de la resistencia no cambian, la temperatura es una exponencial y el
+tick de la próxima conmutación se despeja con un logaritmo. Sirve para
+horizontes de millones de ticks (`pava.largo_plazo`).
+"""
+
+import math
+
+import numpy as np
+
+from pava.estocastico import avanzar_exacto
+
+
+class Termostato:
+    """
+    Control encendido/apagado con histéresis.
+
+    consigna: Temperatura deseada (°C)
+    histeresis: Ancho de la banda (°C); enciende debajo de consigna - h/2 y apaga arriba de consigna + h/2
+    """
+
+    def __init__(self, consigna, histeresis=2.0):
+        self.consigna = np.asarray(consigna, dtype=float)
+        self.histeresis = np.asarray(histeresis, dtype=float)
+        self.encendido = None
+
+    @property
+    def forma(self):
+        """Forma del conjunto de lazos que representa el controlador."""
+        return np.broadcast_shapes(self.consigna.shape, self.histeresis.shape)
+
+    def reiniciar(self, forma):
+        """Prepara el estado interno para lazos de la forma dada."""
+        self.encendido = np.ones(forma, dtype=bool)
+
+    def accion(self, temperatura, tick):
+        """Ciclo de trabajo (0 o 1) para el próximo tick."""
+        self.encendido = np.where(temperatura < self.consigna - self.histeresis / 2, True,
+                                  np.where(temperatura > self.consigna + self.histeresis / 2, False, self.encendido))
+        return self.encendido.astype(float)
+
+
+class PID:
+    """
+    Controlador PID discreto con anti-windup, cuya salida es el ciclo de trabajo del PWM.
+
+    consigna: Temperatura deseada (°C)
+    kp: Ganancia proporcional (1/°C)
+    ki: Ganancia integral (1/(°C·s))
+    kd: Ganancia derivativa (s/°C)
+    """
+
+    def __init__(self, consigna, kp, ki=0.0, kd=0.0):
+        self.consigna = np.asarray(consigna, dtype=float)
+        self.kp = np.asarray(kp, dtype=float)
+        self.ki = np.asarray(ki, dtype=float)
+        self.kd = np.asarray(kd, dtype=float)
+        self.integral = None
+        self.medicion_anterior = None
+
+    @property
+    def forma(self):
+        """Forma del conjunto de lazos que representa el controlador."""
+        return np.broadcast_shapes(self.consigna.shape, self.kp.shape, self.ki.shape, self.kd.shape)
+
+    def reiniciar(self, forma):
+        """Prepara el estado interno para lazos de la forma dada."""
+        self.integral = np.zeros(forma)
+        self.medicion_anterior = None
+
+    def accion(self, temperatura, tick):
+        """Ciclo de trabajo en [0, 1] para el próximo tick."""
+        error = self.consigna - temperatura
+        derivada = 0.0
+        if self.medicion_anterior is not None:
+            derivada = -self.kd * (temperatura - self.medicion_anterior) / tick
+        self.medicion_anterior = temperatura
+
+        # Integración condicional: no acumular si la salida ya está saturada en el sentido del error
+        integral = self.integral + self.ki * error * tick
+        salida = self.kp * error + integral + derivada
+        satura = ((salida > 1) & (error > 0)) | ((salida < 0) & (error < 0))
+        self.integral = np.where(satura, self.integral, integral)
+        return np.clip(self.kp * error + self.integral + derivada, 0.0, 1.0)
+
+
+def simular_lazo_cerrado(controlador, calentador, tiempo_total, temp_inicial, temp_ambiente, tick=1.0):
+    """
+    Simula el calentador gobernado por `controlador`.
+
+    controlador: `Termostato`, `PID` o cualquier objeto con `forma`, `reiniciar(forma)` y
+        `accion(temperatura, tick)`
+    calentador: `pava.modelo.Calentador`; su potencia es la de la tensión completa
+    tiempo_total: Horizonte (s)
+    temp_inicial: Temperatura inicial (°C)
+    temp_ambiente: Escalar, array por tick (n_ticks,) o por lazo y tick (..., n_ticks)
+    tick: Período de muestreo del controlador y del PWM (s)
+
+    Devuelve un diccionario con 'tiempo', 'temperatura' (..., n_ticks + 1), 'ciclo_trabajo'
+    (..., n_ticks) y 'energia' (J consumidos por la resistencia en todo el horizonte).
+    """
+    n_ticks = int(round(tiempo_total / tick))
+    tiempo = np.arange(n_ticks + 1) * tick
+    temp_ambiente = np.asarray(temp_ambiente, dtype=float)
+    if temp_ambiente.ndim == 0:
+        temp_ambiente = np.full(n_ticks, float(temp_ambiente))
+    temp_ambiente = temp_ambiente[..., :n_ticks]
+
+    # La forma de los lazos sale de combinar las ganancias con el ambiente
+    forma = np.broadcast_shapes(temp_ambiente.shape[:-1], controlador.forma)
+    controlador.reiniciar(forma)
+
+    potencia, perdida, capacidad = calentador.potencia, calentador.perdida_calor, calentador.capacidad_termica
+    temperatura = np.full(forma, float(temp_inicial))
+    temperaturas = np.empty(forma + (n_ticks + 1,))
+    ciclos = np.empty(forma + (n_ticks,))
+    temperaturas[..., 0] = temperatura
+    for i in range(n_ticks):
+        ciclo = controlador.accion(temperatura, tick)
+        ambiente = temp_ambiente[..., i]
+        temperatura = avanzar_exacto(temperatura, ciclo * tick, ambiente, potencia, perdida, capacidad)
+        temperatura = avanzar_exacto(temperatura, (1 - ciclo) * tick, ambiente, 0.0, perdida, capacidad)
+        temperaturas[..., i + 1] = temperatura
+        ciclos[..., i] = ciclo
+
+    return {
+        'tiempo': tiempo,
+        'temperatura': temperaturas,
+        'ciclo_trabajo': ciclos,
+        'energia': ciclos.sum(axis=-1) * potencia * tick,
+    }
+
+
+def integrar_termostato(temp_ambiente, temp_inicial, termostato, potencia, perdida_calor, capacidad_termica,
+                        tick=1.0, encendido=True):
+    """
+    Simula un `Termostato` escalar saltando de una conmutación a la siguiente.
+
+    temp_ambiente: Temperatura ambiente de cada tick (n_ticks,)
+    temp_inicial: Temperatura del agua al comienzo (°C)
+    termostato: `Termostato` con consigna e histéresis escalares
+    potencia, perdida_calor, capacidad_termica: Parámetros del modelo (perdida_calor > 0)
+    tick: Período de muestreo del termostato (s)
+    encendido: Estado de la resistencia antes del primer tick (para continuar una corrida)
+
+    Devuelve (temperaturas, ciclo_trabajo, encendido): la temperatura en cada instante
+    (n_ticks + 1,), el ciclo de trabajo (0 o 1) de cada tick y el estado final.
+    """
+    temp_ambiente = np.asarray(temp_ambiente, dtype=float)
+    n_ticks = len(temp_ambiente)
+    a = math.exp(-perdida_calor * tick / capacidad_termica)
+    salto = potencia / perdida_calor
+    bajo = float(termostato.consigna - termostato.histeresis / 2)
+    alto = float(termostato.consigna + termostato.histeresis / 2)
+
+    # Tramos de ambiente constante; dentro de cada uno se avanza de conmutación en conmutación
+    limites = [0, *(np.flatnonzero(np.diff(temp_ambiente)) + 1).tolist(), n_ticks]
+    inicios, largos, iniciales, objetivos, estados = [], [], [], [], []
+    temperatura, encendido = float(temp_inicial), bool(encendido)
+    for i, fin in zip(limites[:-1], limites[1:]):
+        ambiente = float(temp_ambiente[i])
+        while i < fin:
+            if temperatura < bajo:
+                encendido = True
+            elif temperatura > alto:
+                encendido = False
+            # T(i + k) = objetivo + (T(i) - objetivo)·a^k; conmuta en el primer k con a^k < r
+            objetivo = ambiente + salto if encendido else ambiente
+            umbral = alto if encendido else bajo
+            k = fin - i
+            if (objetivo > alto) if encendido else (objetivo < bajo):
+                r = (objetivo - umbral) / (objetivo - temperatura)
+                k = min(max(int(math.log(r) / math.log(a)) + 1, 1), k)
+                # El logaritmo puede pasarse un tick por redondeo (si se queda corto, el próximo paso lo corrige)
+                anterior = objetivo + (temperatura - objetivo) * a ** (k - 1)
+                if k > 1 and ((anterior > alto) if encendido else (anterior < bajo)):
+                    k -= 1
+            inicios.append(i)
+            largos.append(k)
+            iniciales.append(temperatura)
+            objetivos.append(objetivo)
+            estados.append(encendido)
+            temperatura = objetivo + (temperatura - objetivo) * a ** k
+            i += k
+
+    objetivos = np.array(objetivos)
+    paso = np.arange(n_ticks) - np.repeat(inicios, largos)
+    temperaturas = np.empty(n_ticks + 1)
+    temperaturas[:-1] = np.repeat(objetivos, largos) + np.repeat(np.array(iniciales) - objetivos, largos) * a ** paso
+    temperaturas[-1] = temperatura
+    return temperaturas, np.repeat(np.array(estados, dtype=float), largos), encendido
+
+
+def metricas_respuesta(tiempo, temperatura, consigna, banda=1.0):
+    """
+    Indicadores de la respuesta de cada lazo.
+
+    banda: Semiancho (°C) de la franja alrededor de la consigna para el tiempo de establecimiento
+
+    Devuelve un diccionario con 'sobrepico' (°C por encima de la consigna, 0 si no la supera)
+    y 'establecimiento' (s desde el cual la temperatura queda dentro de la banda; inf si al
+    final del horizonte sigue afuera).
+    """
+    afuera = np.abs(temperatura - consigna) > banda
+    # Último instante fuera de la banda, contado desde el final
+    ultimo = temperatura.shape[-1] - 1 - np.argmax(afuera[..., ::-1], axis=-1)
+    establecimiento = np.where(afuera.any(axis=-1), tiempo[np.minimum(ultimo + 1, len(tiempo) - 1)], tiempo[0])
+    establecimiento = np.where(afuera[..., -1], np.inf, establecimiento)
+    return {
+        'sobrepico': np.maximum(temperatura.max(axis=-1) - consigna, 0.0),
+        'establecimiento': establecimiento,
+    }
+
+
+def barrer_ganancias(calentador, consigna, kp, ki, kd=(0.0,), tiempo_total=600.0, temp_inicial=20.0,
+                     temp_ambiente=20.0, tick=1.0, banda=1.0, tamano_lote=5_000):
+    """
+    Evalúa todas las combinaciones de ganancias de un PID y las ordena.
+
+    kp, ki, kd: Valores a probar de cada ganancia; se evalúa la grilla completa
+    temp_ambiente: Escalar o array por tick (la misma perturbación para todos los lazos)
+    tamano_lote: Combinaciones simuladas a la vez; acota la memoria usada
+
+    Cada combinación recibe el promedio de sus puestos en sobrepico, tiempo de
+    establecimiento y energía (menor es mejor en los tres). Devuelve un diccionario
+    con 'kp', 'ki', 'kd', 'sobrepico', 'establecimiento', 'energia' y 'puntaje'
+    (arrays planos, uno por combinación) y 'orden' (índices de la mejor a la peor).
+    """
+    grilla = np.meshgrid(np.asarray(kp, dtype=float), np.asarray(ki, dtype=float), np.asarray(kd, dtype=float),
+                         indexing='ij')
+    kp, ki, kd = (g.ravel() for g in grilla)
+    sobrepico, establecimiento, energia = np.empty(len(kp)), np.empty(len(kp)), np.empty(len(kp))
+
+    for inicio in range(0, len(kp), tamano_lote):
+        lote = slice(inicio, inicio + tamano_lote)
+        pid = PID(consigna, kp[lote], ki[lote], kd[lote])
+        respuesta = simular_lazo_cerrado(pid, calentador, tiempo_total, temp_inicial, temp_ambiente, tick)
+        metricas = metricas_respuesta(respuesta['tiempo'], respuesta['temperatura'], consigna, banda)
+        sobrepico[lote] = metricas['sobrepico']
+        establecimiento[lote] = metricas['establecimiento']
+        energia[lote] = respuesta['energia']
+
+    # Puesto promedio en los tres indicadores (los empates comparten puesto)
+    puestos = [np.unique(m, return_inverse=True)[1] for m in (np.round(sobrepico, 3), establecimiento,
+                                                              np.round(energia, 0))]
+    puntaje = np.mean([p / max(p.max(), 1) for p in puestos], axis=0)
+    return {
+        'kp': kp, 'ki': ki, 'kd': kd,
+        'sobrepico': sobrepico,
+        'establecimiento': establecimiento,
+        'energia': energia,
+        'puntaje': puntaje,
+        'orden': np.argsort(puntaje, kind='stable'),
+    }
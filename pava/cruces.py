@@ -0,0 +1,73 @@
+"""
+Detección vectorizada del instante en que las trayectorias cruzan un umbral.
+
+Sirve para el tiempo hasta la temperatura objetivo (80°C) o hasta el corte de
+seguridad (100°C) de un lote entero de trayectorias con una sola llamada. El
+instante exacto se obtiene interpolando entre las dos muestras que rodean el
+cruce, así que el resultado no queda cuantizado al paso de la grilla:
+
+- Sin derivadas se interpola linealmente.
+- Si se pasan las derivadas dT/dt en cada muestra (por ejemplo con
+  `Calentador.derivada`), se usa el interpolante cúbico de Hermite y se busca
+  la raíz con unas pocas iteraciones de Newton dentro del intervalo.
+"""
+
+import numpy as np
+
+
+def tiempos_de_cruce(tiempo, trayectorias, umbral, derivadas=None, descendente=False, iteraciones=4):
+    """
+    Primer instante en que cada trayectoria alcanza `umbral`.
+
+    tiempo: Grilla de tiempos (s), de longitud n_tiempos
+    trayectorias: Array de forma (n_escenarios..., n_tiempos)
+    umbral: Temperatura umbral (escalar o array compatible con n_escenarios...)
+    derivadas: dT/dt en cada muestra, misma forma que `trayectorias` (opcional)
+    descendente: Si es True busca el primer valor <= umbral en lugar de >= umbral
+    iteraciones: Iteraciones de Newton sobre el interpolante de Hermite
+
+    Devuelve un array de forma (n_escenarios...) con el instante de cruce; las
+    trayectorias que nunca cruzan valen `np.inf` (como en `pava.analitico`).
+    """
+    tiempo = np.asarray(tiempo, dtype=float)
+    trayectorias = np.asarray(trayectorias, dtype=float)
+    umbral = np.asarray(umbral, dtype=float)
+
+    # Trabajamos siempre con cruces ascendentes
+    signo = -1.0 if descendente else 1.0
+    valores = signo * trayectorias
+    nivel = signo * umbral[..., np.newaxis]
+
+    alcanzado = valores >= nivel
+    cruza = alcanzado.any(axis=-1)
+    indice = np.argmax(alcanzado, axis=-1)
+
+    # Muestras a ambos lados del cruce (con el índice 0 el cruce es el instante inicial)
+    derecha = indice[..., np.newaxis]
+    izquierda = np.maximum(derecha - 1, 0)
+    nivel = nivel[..., 0]
+    y0 = np.take_along_axis(valores, izquierda, axis=-1)[..., 0]
+    y1 = np.take_along_axis(valores, derecha, axis=-1)[..., 0]
+    t0 = tiempo[izquierda[..., 0]]
+    h = tiempo[derecha[..., 0]] - t0
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fraccion = np.where(y1 > y0, (nivel - y0) / (y1 - y0), 0.0)
+    fraccion = np.clip(fraccion, 0.0, 1.0)
+
+    if derivadas is not None:
+        derivadas = signo * np.asarray(derivadas, dtype=float)
+        m0 = np.take_along_axis(derivadas, izquierda, axis=-1)[..., 0] * h
+        m1 = np.take_along_axis(derivadas, derecha, axis=-1)[..., 0] * h
+        for _ in range(iteraciones):
+            s = fraccion
+            # Interpolante cúbico de Hermite en [0, 1] y su derivada
+            h00, h10, h01, h11 = 2*s**3 - 3*s**2 + 1, s**3 - 2*s**2 + s, -2*s**3 + 3*s**2, s**3 - s**2
+            d00, d10, d01, d11 = 6*s**2 - 6*s, 3*s**2 - 4*s + 1, -6*s**2 + 6*s, 3*s**2 - 2*s
+            valor = h00*y0 + h10*m0 + h01*y1 + h11*m1 - nivel
+            pendiente = d00*y0 + d10*m0 + d01*y1 + d11*m1
+            with np.errstate(divide='ignore', invalid='ignore'):
+                paso = np.where(pendiente != 0, valor / pendiente, 0.0)
+            fraccion = np.clip(s - paso, 0.0, 1.0)
+
+    return np.where(cruza, t0 + fraccion * h, np.inf)
@@ -0,0 +1,67 @@
+"""
+Integrador por lotes (ensamble) del modelo de calentamiento con pérdidas.
+
+Todos los escenarios se avanzan juntos como un único vector de estado de NumPy,
+de modo que barrer 10^5-10^6 combinaciones de parámetros cuesta lo mismo, en
+cantidad de pasos de Python, que simular una sola curva.
+
+Modelo (Euler explícito, igual que en el TP4/TP5):
+
+    T[i+1] = T[i] + (V²/R - k·(T[i] - Tamb)) · dt / (m·c)
+"""
+
+import numpy as np
+
+from pava.modelo import CALOR_ESPECIFICO_AGUA
+
+
+def simular_ensamble(tiempo, resistencia, voltaje, temp_inicial, temp_ambiente,
+                     masa, perdida_calor, calor_especifico=CALOR_ESPECIFICO_AGUA,
+                     dtype=np.float64):
+    """
+    Simula una familia de curvas de calentamiento con pérdidas.
+
+    tiempo: Grilla de tiempos (s), de longitud n_tiempos. El paso puede no ser uniforme.
+    resistencia: Resistencia del calentador (Ω)
+    voltaje: Tensión de alimentación (V)
+    temp_inicial: Temperatura inicial del fluido (°C)
+    temp_ambiente: Temperatura ambiente (°C)
+    masa: Masa del fluido (kg)
+    perdida_calor: Coeficiente de pérdida de calor (W/K)
+    calor_especifico: Calor específico del fluido (J/(kg·°C))
+    dtype: Tipo de dato de la matriz de resultados (float32 reduce la memoria a la mitad)
+
+    Los parámetros pueden ser escalares o arrays; se combinan con las reglas de
+    broadcasting de NumPy y cada elemento del resultado es un escenario.
+
+    Devuelve un array de forma (n_escenarios..., n_tiempos) con la temperatura
+    del fluido en cada instante de `tiempo`.
+    """
+    tiempo = np.asarray(tiempo, dtype=float)
+    resistencia, voltaje, temp_inicial, temp_ambiente, masa, perdida_calor, calor_especifico = (
+        np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (
+            resistencia, voltaje, temp_inicial, temp_ambiente, masa, perdida_calor, calor_especifico)))
+    )
+
+    # Coeficientes constantes de cada escenario, calculados una sola vez
+    potencia = voltaje**2 / resistencia
+    capacidad_termica = masa * calor_especifico
+
+    # Guardamos con el tiempo como primer eje para que cada paso escriba un bloque contiguo
+    temperaturas = np.empty(tiempo.shape + resistencia.shape, dtype=dtype)
+    temperatura_actual = temp_inicial.copy()
+    temperaturas[0] = temperatura_actual
+    potencia_efectiva = np.empty_like(temperatura_actual)
+
+    # Un paso de Python por instante de tiempo, vectorizado sobre todos los escenarios
+    for i, dt in enumerate(np.diff(tiempo), start=1):
+        # potencia_efectiva = (V²/R - k·(T - Tamb)) · dt / (m·c), sin arrays temporales
+        np.subtract(temperatura_actual, temp_ambiente, out=potencia_efectiva)
+        potencia_efectiva *= perdida_calor
+        np.subtract(potencia, potencia_efectiva, out=potencia_efectiva)
+        potencia_efectiva *= dt
+        potencia_efectiva /= capacidad_termica
+        temperatura_actual += potencia_efectiva
+        temperaturas[i] = temperatura_actual
+
+    return np.moveaxis(temperaturas, 0, -1)
@@ -0,0 +1,126 @@
+"""
+Integración exacta por tramos para el TP6 (caídas estocásticas de temperatura ambiente).
+
+Entre dos eventos la temperatura ambiente es constante, así que la ecuación
+
+    dT/dt = (P - k·(T - Tamb)) / (m·c)
+
+se resuelve en forma cerrada en cada tramo:
+
+    T(t0 + Δt) = T(t0) + (P - k·(T(t0) - Tamb)) · Δt/(m·c) · φ(k·Δt/(m·c)),
+    φ(x) = (1 - exp(-x)) / x
+
+(φ → 1 cuando k → 0, lo que recupera el caso sin pérdidas). El integrador salta
+de un límite de tramo al siguiente con una exponencial por tramo y sólo evalúa
+la temperatura en los instantes que se le pidan.
+"""
+
+import numpy as np
+
+from pava.modelo import CALOR_ESPECIFICO_AGUA
+
+
+def avanzar_exacto(temperatura, dt, temp_ambiente, potencia, perdida_calor, capacidad_termica):
+    """Avanza exactamente la temperatura un intervalo dt con ambiente constante."""
+    x = perdida_calor * dt / capacidad_termica
+    with np.errstate(divide='ignore', invalid='ignore'):
+        phi = np.where(x > 0, -np.expm1(-x) / np.where(x > 0, x, 1.0), 1.0)
+    return temperatura + (potencia - perdida_calor * (temperatura - temp_ambiente)) * dt / capacidad_termica * phi
+
+
+def tramos_ambiente(eventos, temp_ambiente_base, tiempo_total, tiempo_inicial=0.0):
+    """
+    Convierte una lista de eventos en tramos de temperatura ambiente constante.
+
+    eventos: Lista de diccionarios con 'tiempo_inicio', 'descenso' y 'duracion' (como en el TP6).
+        Durante [tiempo_inicio, tiempo_inicio + duracion) el ambiente baja `descenso` grados.
+    temp_ambiente_base: Temperatura ambiente sin perturbaciones (°C)
+    tiempo_total: Fin del horizonte simulado (s)
+
+    Devuelve (limites, temps_ambiente): los n+1 instantes que delimitan los tramos
+    y la temperatura ambiente de cada uno de los n tramos.
+    """
+    limites = [tiempo_inicial]
+    temps_ambiente = []
+    for evento in sorted(eventos, key=lambda e: e['tiempo_inicio']):
+        inicio = min(max(evento['tiempo_inicio'], limites[-1]), tiempo_total)
+        fin = min(evento['tiempo_inicio'] + evento['duracion'], tiempo_total)
+        if fin <= inicio:
+            continue
+        if inicio > limites[-1]:
+            limites.append(inicio)
+            temps_ambiente.append(temp_ambiente_base)
+        limites.append(fin)
+        temps_ambiente.append(temp_ambiente_base - evento['descenso'])
+    if limites[-1] < tiempo_total:
+        limites.append(tiempo_total)
+        temps_ambiente.append(temp_ambiente_base)
+    return np.array(limites, dtype=float), np.array(temps_ambiente, dtype=float)
+
+
+def integrar_por_tramos(limites, temps_ambiente, temp_inicial, potencia, perdida_calor, masa,
+                        calor_especifico=CALOR_ESPECIFICO_AGUA):
+    """
+    Temperatura exacta del fluido en cada límite de tramo.
+
+    limites: Instantes que delimitan los tramos (s), forma (..., n+1). Se admiten
+        tramos de longitud cero, útiles para rellenar réplicas con menos eventos.
+    temps_ambiente: Temperatura ambiente de cada tramo (°C), forma (..., n)
+    temp_inicial: Temperatura del fluido en limites[..., 0] (°C)
+    potencia, perdida_calor, masa, calor_especifico: Parámetros del modelo
+
+    Devuelve un array de forma (..., n+1). El costo es una exponencial por tramo,
+    independientemente de la longitud de cada uno.
+    """
+    limites = np.asarray(limites, dtype=float)
+    temps_ambiente = np.asarray(temps_ambiente, dtype=float)
+    capacidad_termica = np.asarray(masa, dtype=float) * calor_especifico
+
+    temperaturas = np.empty(np.broadcast_shapes(limites.shape, np.shape(temp_inicial) + (1,)))
+    temperaturas[..., 0] = temp_inicial
+    duraciones = np.diff(limites, axis=-1)
+    for j in range(temps_ambiente.shape[-1]):
+        temperaturas[..., j + 1] = avanzar_exacto(
+            temperaturas[..., j], duraciones[..., j], temps_ambiente[..., j],
+            potencia, perdida_calor, capacidad_termica,
+        )
+    return temperaturas
+
+
+def evaluar_por_tramos(tiempos, limites, temps_ambiente, temps_limites, potencia, perdida_calor, masa,
+                       calor_especifico=CALOR_ESPECIFICO_AGUA):
+    """
+    Evalúa la temperatura del fluido en instantes arbitrarios a partir de los tramos.
+
+    tiempos: Instantes donde muestrear (s), dentro de [limites[0], limites[-1]]
+    limites, temps_ambiente: Tramos de una réplica (arrays 1-D)
+    temps_limites: Resultado de `integrar_por_tramos` para esos tramos
+
+    Devuelve (temperaturas_fluido, temperaturas_ambiente) en cada instante pedido.
+    """
+    tiempos = np.asarray(tiempos, dtype=float)
+    n_tramos = len(temps_ambiente)
+    tramo = np.clip(np.searchsorted(limites, tiempos, side='right') - 1, 0, n_tramos - 1)
+
+    temp_ambiente = temps_ambiente[tramo]
+    temp_fluido = avanzar_exacto(
+        temps_limites[tramo], tiempos - limites[tramo], temp_ambiente,
+        potencia, perdida_calor, np.asarray(masa, dtype=float) * calor_especifico,
+    )
+    return temp_fluido, temp_ambiente
+
+
+def simular_con_eventos(tiempos, eventos, temp_inicial, temp_ambiente_base, potencia, perdida_calor, masa,
+                        calor_especifico=CALOR_ESPECIFICO_AGUA):
+    """
+    Simula una réplica del TP6 y la muestrea en `tiempos`.
+
+    Combina `tramos_ambiente`, `integrar_por_tramos` y `evaluar_por_tramos`.
+    Devuelve (temperaturas_fluido, temperaturas_ambiente) en cada instante.
+    """
+    tiempos = np.asarray(tiempos, dtype=float)
+    limites, temps_ambiente = tramos_ambiente(eventos, temp_ambiente_base, tiempos[-1], tiempos[0])
+    temps_limites = integrar_por_tramos(
+        limites, temps_ambiente, temp_inicial, potencia, perdida_calor, masa, calor_especifico)
+    return evaluar_por_tramos(
+        tiempos, limites, temps_ambiente, temps_limites, potencia, perdida_calor, masa, calor_especifico)
@@ -0,0 +1,163 @@
+"""
+Modelo estratificado (1D axial) del agua del calentador, con Crank-Nicolson.
+
+El TP3 trata el cilindro de 8×15 cm como una única temperatura. Acá la columna
+de agua se divide en `n_celdas` capas horizontales de espesor Δz:
+
+    C_i · dT_i/dt = G·(T_{i-1} - T_i) + G·(T_{i+1} - T_i) - k_i·(T_i - Tamb) + P_i
+
+- C_i: capacidad térmica de la capa (J/K), G = λ_agua·A/Δz la conductancia entre capas.
+- k_i: pérdida por la pared lateral de la capa y, en la primera y la última, por
+  las bases, con el mismo aislante del modelo concentrado (λ·S/e).
+- P_i: parte de la potencia de la resistencia que cae en la capa; la resistencia
+  ocupa una franja de alturas `zona_resistencia` y no todo el volumen.
+
+El sistema es lineal, C·dT/dt = -L·T + b, con L tridiagonal. Crank-Nicolson
+
+    (C/Δt + L/2)·T^{n+1} = (C/Δt - L/2)·T^n + b
+
+es incondicionalmente estable y de segundo orden. La matriz de la izquierda se
+guarda dispersa y se factoriza (LU) una sola vez; cada paso es un producto
+disperso y una sustitución con la factorización ya hecha. Varios escenarios
+(temperaturas iniciales o ambiente distintas) se resuelven juntos como columnas.
+
+La conducción pura subestima la mezcla: el agua caliente que queda debajo de agua
+fría sube por convección. Con `mezcla=True`, después de cada paso las capas
+invertidas se mezclan conservando la energía (regresión isotónica ponderada por
+capacidad, el esquema de "mezcla por inversión" de los modelos de tanques
+estratificados). Por eso una resistencia en el fondo calienta toda la columna,
+mientras que una a media altura deja frío el fondo.
+
+El modelo no tiene cambio de fase: una capa que pasa los 100 °C sigue
+calentándose como agua líquida. Los resultados sólo valen mientras ninguna capa
+llega a `TEMP_EBULLICION`; `simular_estratificado` informa en qué instante pasa
+eso en cada escenario para poder descartar (o acortar) las corridas.
+"""
+
+import numpy as np
+from scipy.optimize import isotonic_regression
+from scipy.sparse import diags
+from scipy.sparse.linalg import splu
+
+CONDUCTIVIDAD_AGUA = 0.6  # W/(m·K)
+TEMP_EBULLICION = 100.0  # °C, a presión atmosférica
+
+
+def malla_axial(calentador, n_celdas=100, zona_resistencia=(0.0, 0.02), conductividad_agua=CONDUCTIVIDAD_AGUA):
+    """
+    Discretización axial de la columna de agua.
+
+    calentador: `pava.modelo.Calentador` (parámetros escalares)
+    n_celdas: Cantidad de capas, de abajo hacia arriba
+    zona_resistencia: Alturas (m, desde el fondo) entre las que está la resistencia
+    conductividad_agua: Conductividad del agua (W/(m·K)); un valor mayor representa
+        una mezcla turbulenta adicional
+
+    Devuelve un diccionario con 'z' (centro de cada capa, m), 'dz', 'capacidad' (J/K),
+    'conductancia' (W/K entre capas vecinas), 'perdida' (W/K) y 'fuente' (W) por capa.
+    """
+    altura, radio = calentador.altura_m, calentador.radio_m
+    dz = altura / n_celdas
+    bordes = np.linspace(0.0, altura, n_celdas + 1)
+    area = np.pi * radio**2
+
+    # El agua ocupa el cilindro completo; la masa se reparte en partes iguales
+    capacidad = np.full(n_celdas, calentador.capacidad_termica / n_celdas)
+
+    # Pérdidas por la pared de cada capa y por las bases en los extremos
+    perdida = np.full(n_celdas, calentador.conductividad_aislante * 2 * np.pi * radio * dz / calentador.espesor_m)
+    perdida[[0, -1]] += calentador.conductividad_aislante * area / calentador.espesor_m
+
+    # Potencia proporcional al solapamiento de cada capa con la zona de la resistencia
+    inferior, superior = zona_resistencia
+    solapamiento = np.clip(np.minimum(bordes[1:], superior) - np.maximum(bordes[:-1], inferior), 0.0, None)
+    if solapamiento.sum() <= 0:
+        raise ValueError(f"La zona de la resistencia {zona_resistencia} no está dentro de la columna de agua")
+    fuente = calentador.potencia * solapamiento / solapamiento.sum()
+
+    return {
+        'z': (bordes[1:] + bordes[:-1]) / 2,
+        'dz': dz,
+        'capacidad': capacidad,
+        'conductancia': np.full(n_celdas - 1, conductividad_agua * area / dz),
+        'perdida': perdida,
+        'fuente': fuente,
+    }
+
+
+def _operadores(malla, paso):
+    """Factorización LU de (C/Δt + L/2) y matriz dispersa (C/Δt - L/2) para un paso Δt."""
+    g = malla['conductancia']
+    diagonal = malla['perdida'] + np.concatenate([g, [0.0]]) + np.concatenate([[0.0], g])
+    laplaciano = diags([-g, diagonal, -g], [-1, 0, 1], format='csc')
+    masa = diags(malla['capacidad'] / paso, format='csc')
+    return splu((masa + laplaciano / 2).tocsc()), (masa - laplaciano / 2).tocsr()
+
+
+def _mezclar(temperaturas, capacidad):
+    """Mezcla por inversión: perfil no decreciente con la altura que conserva la energía."""
+    for j in range(temperaturas.shape[1]):
+        columna = temperaturas[:, j]
+        if np.any(np.diff(columna) < 0):
+            temperaturas[:, j] = isotonic_regression(columna, weights=capacidad).x
+
+
+def simular_estratificado(calentador, tiempo, temp_inicial, temp_ambiente, n_celdas=100, paso=1.0,
+                          zona_resistencia=(0.0, 0.02), conductividad_agua=CONDUCTIVIDAD_AGUA, mezcla=True):
+    """
+    Simula el perfil vertical de temperatura del agua.
+
+    calentador: `pava.modelo.Calentador` (parámetros escalares)
+    tiempo: Instantes de salida (s)
+    temp_inicial, temp_ambiente: Escalares o arrays 1-D, uno por escenario (°C)
+    n_celdas, zona_resistencia, conductividad_agua: Ver `malla_axial`
+    paso: Paso máximo de integración (s); cada intervalo de `tiempo` se divide en pasos iguales
+    mezcla: Mezclar las capas invertidas después de cada paso
+
+    Devuelve un diccionario con:
+        tiempo, z: Instantes y alturas de las capas
+        temperaturas: Array (escenarios..., n_celdas, n_tiempos)
+        media: Temperatura media ponderada por capacidad (escenarios..., n_tiempos)
+        factorizaciones: Cantidad de factorizaciones LU hechas (una por cada Δt distinto)
+        ebullicion: Primer instante de salida en que alguna capa llega a `TEMP_EBULLICION`
+            (escenarios...); nan si no llega. Desde ahí el perfil ya no es físico.
+    """
+    tiempo = np.asarray(tiempo, dtype=float)
+    temp_inicial, temp_ambiente = np.broadcast_arrays(np.asarray(temp_inicial, dtype=float),
+                                                      np.asarray(temp_ambiente, dtype=float))
+    forma = temp_inicial.shape
+    malla = malla_axial(calentador, n_celdas, zona_resistencia, conductividad_agua)
+    capacidad = malla['capacidad']
+
+    # Estado: una columna por escenario
+    estado = np.tile(temp_inicial.reshape(1, -1), (n_celdas, 1))
+    fuentes = malla['fuente'][:, np.newaxis] + malla['perdida'][:, np.newaxis] * temp_ambiente.reshape(1, -1)
+
+    resultado = np.empty((len(tiempo),) + estado.shape)
+    resultado[0] = estado
+    operadores = {}
+    for i, intervalo in enumerate(np.diff(tiempo), start=1):
+        n_pasos = max(int(np.ceil(intervalo / paso - 1e-9)), 1)
+        dt = intervalo / n_pasos
+        clave = round(dt, 12)
+        if clave not in operadores:
+            operadores[clave] = _operadores(malla, dt)
+        factorizacion, derecha = operadores[clave]
+        for _ in range(n_pasos):
+            estado = factorizacion.solve(derecha @ estado + fuentes)
+            if mezcla:
+                _mezclar(estado, capacidad)
+        resultado[i] = estado
+
+    # (n_tiempos, n_celdas, escenarios) -> (escenarios..., n_celdas, n_tiempos)
+    temperaturas = np.moveaxis(resultado, 0, -1)
+    temperaturas = np.moveaxis(temperaturas, 1, 0).reshape(forma + (n_celdas, len(tiempo)))
+    hierve = (temperaturas >= TEMP_EBULLICION).any(axis=-2)
+    return {
+        'tiempo': tiempo,
+        'z': malla['z'],
+        'temperaturas': temperaturas,
+        'media': np.tensordot(capacidad / capacidad.sum(), temperaturas, axes=([0], [-2])),
+        'factorizaciones': len(operadores),
+        'ebullicion': np.where(hierve.any(axis=-1), tiempo[np.argmax(hierve, axis=-1)], np.nan),
+    }
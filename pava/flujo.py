@@ -0,0 +1,269 @@
+"""
+Simulación en streaming: generadores que entregan un tick por vez, con memoria constante.
+
+Los TP guardan trayectorias completas y grafican al final. Acá las simulaciones
+son generadores que producen un `Tick(tiempo, temp_fluido, temp_ambiente, evento)`
+por paso y no guardan nada, así que se pueden consumir a medida que avanzan:
+mirarlas en vivo (`VistaEnVivo`), cortarlas con `itertools.islice`, resumirlas o
+volcarlas a un archivo o a otro programa sin esperar a que terminen:
+
+    python -m pava.flujo --tiempo-total 86400 | gzip > dia.csv.gz
+    python -m pava.flujo --vivo
+
+Cada tick se integra en forma exacta con el ambiente constante dentro del tick
+(la misma recurrencia de `pava.montecarlo.integrar_por_tick`, en aritmética escalar
+de Python, que para un solo valor es mucho más rápida que NumPy). Los eventos estocásticos siguen las reglas del
+TP6: con probabilidad p por tick, y sólo si no hay otro activo, empieza un
+descenso uniforme en [5, 50] °C durante un número entero uniforme de [5, 30]
+segundos. Los números aleatorios se sortean por bloques para no pagar una
+llamada al generador por tick. Con un `pava.control.Termostato` la resistencia
+se enciende y apaga como en `pava.control.simular_lazo_cerrado`; sin él está
+siempre a plena potencia y el agua sube sin límite hacia Tamb + P/k.
+"""
+
+import argparse
+import itertools
+import math
+import sys
+from collections import deque, namedtuple
+
+import numpy as np
+
+from pava.control import Termostato
+from pava.modelo import CALENTADOR_BASE
+from pava.montecarlo import DESCENSO, DURACION, PROBABILIDAD_EVENTO
+
+Tick = namedtuple('Tick', 'tiempo temp_fluido temp_ambiente evento')
+Tick.__doc__ = """
+Estado de la simulación al comienzo de un tick.
+
+tiempo: Instante (s)
+temp_fluido: Temperatura del agua en ese instante (°C)
+temp_ambiente: Temperatura ambiente durante el tick que empieza (°C)
+evento: Diccionario del evento que empieza en este tick (como en el TP6) o None
+"""
+
+TAMANO_BLOQUE = 4096  # Números aleatorios sorteados por llamada al generador
+
+
+def _instantes(tiempo_total, tick):
+    """Índices de tick hasta el horizonte, o sin fin si tiempo_total es None."""
+    if tiempo_total is None:
+        return itertools.count()
+    return range(int(round(tiempo_total / tick)) + 1)
+
+
+def _paso_exacto(calentador, tick, potencia=None):
+    """Función escalar (T, Tamb) -> T un tick después, con ambiente constante en el tick."""
+    potencia = float(calentador.potencia if potencia is None else potencia)
+    perdida, capacidad = float(calentador.perdida_calor), float(calentador.capacidad_termica)
+    if perdida <= 0:
+        incremento = potencia * tick / capacidad
+        return lambda temperatura, ambiente: temperatura + incremento
+    a = math.exp(-perdida * tick / capacidad)
+    salto = potencia / perdida
+    return lambda temperatura, ambiente: ambiente + salto + (temperatura - ambiente - salto) * a
+
+
+def flujo_calentamiento(calentador, temp_inicial, temp_ambiente, tiempo_total=None, tick=1.0):
+    """
+    Calentamiento sin perturbaciones, un `Tick` por vez.
+
+    calentador: `pava.modelo.Calentador` (parámetros escalares)
+    temp_inicial, temp_ambiente: Temperaturas (°C)
+    tiempo_total: Horizonte (s); None para una corrida sin fin
+    tick: Paso entre ticks (s)
+    """
+    avanzar = _paso_exacto(calentador, tick)
+    temperatura = float(temp_inicial)
+    for i in _instantes(tiempo_total, tick):
+        yield Tick(i * tick, temperatura, temp_ambiente, None)
+        temperatura = avanzar(temperatura, temp_ambiente)
+
+
+def flujo_estocastico(calentador, temp_inicial, temp_ambiente_base, tiempo_total=None, tick=1.0,
+                      probabilidad=PROBABILIDAD_EVENTO, descenso=DESCENSO, duracion=DURACION, semilla=None,
+                      termostato=None):
+    """
+    Calentamiento con las caídas estocásticas de temperatura ambiente del TP6, un `Tick` por vez.
+
+    calentador: `pava.modelo.Calentador` (parámetros escalares)
+    temp_inicial, temp_ambiente_base: Temperaturas (°C)
+    tiempo_total: Horizonte (s); None para una corrida sin fin
+    tick: Paso entre ticks (s); la duración de los eventos se cuenta en ticks
+    probabilidad, descenso, duracion: Parámetros del fenómeno estocástico
+    semilla: Semilla del generador (np.random.default_rng)
+    termostato: `pava.control.Termostato` escalar que enciende y apaga la resistencia, o None
+        para tenerla siempre a plena potencia
+    """
+    rng = np.random.default_rng(semilla)
+    avanzar, enfriar = _paso_exacto(calentador, tick), _paso_exacto(calentador, tick, potencia=0.0)
+    if termostato is not None:
+        bajo = float(termostato.consigna - termostato.histeresis / 2)
+        alto = float(termostato.consigna + termostato.histeresis / 2)
+    temperatura, encendido = float(temp_inicial), True
+    restante, caida = 0, 0.0
+    sorteos = iter(())
+    for i in _instantes(tiempo_total, tick):
+        evento = None
+        if restante <= 0:
+            caida = 0.0
+            u = next(sorteos, None)
+            if u is None:
+                sorteos = iter(rng.random(TAMANO_BLOQUE).tolist())
+                u = next(sorteos)
+            # Como en el TP6, no se sortean eventos en el primer tick
+            if i > 0 and u < probabilidad:
+                caida = float(rng.uniform(descenso[0], descenso[1]))
+                restante = int(rng.integers(duracion[0], duracion[1] + 1))
+                evento = {'tiempo_inicio': i * tick, 'descenso': caida, 'duracion': restante * tick}
+        ambiente = temp_ambiente_base - caida
+        yield Tick(i * tick, temperatura, ambiente, evento)
+        if termostato is not None:
+            if temperatura < bajo:
+                encendido = True
+            elif temperatura > alto:
+                encendido = False
+        temperatura = (avanzar if encendido else enfriar)(temperatura, ambiente)
+        restante -= 1
+
+
+def escribir_csv(flujo, archivo=sys.stdout, cada=1):
+    """
+    Vuelca un flujo de ticks como CSV (una línea por tick, sin guardar nada en memoria).
+
+    cada: Escribir sólo uno de cada `cada` ticks (los que traen un evento se escriben siempre)
+
+    Devuelve la cantidad de ticks consumidos.
+    """
+    archivo.write('tiempo,temp_fluido,temp_ambiente,descenso,duracion\n')
+    n = 0
+    for n, t in enumerate(flujo, start=1):
+        if t.evento is not None:
+            archivo.write(f'{t.tiempo:g},{t.temp_fluido:.6f},{t.temp_ambiente:.6f},'
+                          f'{t.evento["descenso"]:.6f},{t.evento["duracion"]:g}\n')
+        elif (n - 1) % cada == 0:
+            archivo.write(f'{t.tiempo:g},{t.temp_fluido:.6f},{t.temp_ambiente:.6f},,\n')
+    return n
+
+
+class VistaEnVivo:
+    """
+    Gráfico que se actualiza a medida que llegan los ticks, con blitting.
+
+    Sólo se redibujan las curvas sobre un fondo guardado; los ejes se redibujan
+    completos únicamente cuando la ventana de tiempo se desplaza o la temperatura
+    sale del rango visible. Guarda como mucho `ventana` segundos de datos.
+
+    ventana: Ancho de la ventana de tiempo visible (s)
+    cada: Ticks entre actualizaciones de la pantalla
+    """
+
+    def __init__(self, ventana=600.0, cada=10, titulo='Simulación en vivo'):
+        import matplotlib.pyplot as plt
+        self.ventana = ventana
+        self.cada = cada
+        self.figura, self.ax = plt.subplots(figsize=(12, 6))
+        self.ax.set_title(titulo, fontsize=14)
+        self.ax.set_xlabel('Tiempo (segundos)', fontsize=12)
+        self.ax.set_ylabel('Temperatura (°C)', fontsize=12)
+        self.ax.grid(True, alpha=0.3)
+        self.ax.set_xlim(0, ventana)
+        self.ax.set_ylim(0, 100)
+        self.linea_fluido, = self.ax.plot([], [], 'b-', linewidth=2, label='Temperatura del fluido', animated=True)
+        self.linea_ambiente, = self.ax.plot([], [], 'g--', linewidth=1, label='Temperatura ambiente', animated=True)
+        self.ax.legend(loc='upper left')
+        self.datos = deque()
+        self.ticks = 0
+        self.eventos = 0
+        self.redibujados = 0
+        self.fondo = None
+        self.figura.canvas.mpl_connect('draw_event', self._guardar_fondo)
+        plt.show(block=False)
+        self._redibujar()
+
+    def _guardar_fondo(self, _evento=None):
+        self.fondo = self.figura.canvas.copy_from_bbox(self.figura.bbox)
+
+    def _redibujar(self):
+        """Redibujo completo de los ejes; también guarda el fondo nuevo."""
+        self.redibujados += 1
+        self.figura.canvas.draw()
+        self._guardar_fondo()
+
+    def agregar(self, tick):
+        """Incorpora un tick y refresca la pantalla cada `cada` ticks."""
+        self.datos.append((tick.tiempo, tick.temp_fluido, tick.temp_ambiente))
+        self.ticks += 1
+        self.eventos += tick.evento is not None
+        while self.datos[0][0] < tick.tiempo - self.ventana:
+            self.datos.popleft()
+        if self.ticks % self.cada == 0 or tick.evento is not None:
+            self.refrescar()
+
+    def refrescar(self):
+        """Dibuja los datos de la ventana actual."""
+        if not self.datos:
+            return
+        tiempo, fluido, ambiente = np.array(self.datos).T
+        ajustar = False
+        x_min, x_max = self.ax.get_xlim()
+        if tiempo[-1] > x_max:
+            self.ax.set_xlim(tiempo[-1] - self.ventana / 2, tiempo[-1] + self.ventana / 2)
+            ajustar = True
+        y_min, y_max = self.ax.get_ylim()
+        bajo, alto = min(fluido.min(), ambiente.min()), max(fluido.max(), ambiente.max())
+        if bajo < y_min or alto > y_max:
+            # Dejamos margen para no tener que redibujar los ejes en cada tick mientras la curva sube
+            margen = 0.25 * (alto - bajo) + 5
+            self.ax.set_ylim(bajo - margen, alto + margen)
+            ajustar = True
+
+        self.linea_fluido.set_data(tiempo, fluido)
+        self.linea_ambiente.set_data(tiempo, ambiente)
+        if ajustar or self.fondo is None:
+            self._redibujar()
+        canvas = self.figura.canvas
+        canvas.restore_region(self.fondo)
+        self.ax.draw_artist(self.linea_ambiente)
+        self.ax.draw_artist(self.linea_fluido)
+        canvas.blit(self.figura.bbox)
+        canvas.flush_events()
+
+    def consumir(self, flujo):
+        """Muestra todo el flujo en vivo. Devuelve el último tick."""
+        ultimo = None
+        for ultimo in flujo:
+            self.agregar(ultimo)
+        self.refrescar()
+        return ultimo
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Simulación del TP6 en streaming (CSV por la salida estándar).")
+    parser.add_argument('--tiempo-total', type=float, default=None, help="Horizonte en segundos (sin fin si se omite)")
+    parser.add_argument('--tick', type=float, default=1.0, help="Paso entre ticks (s)")
+    parser.add_argument('--temp-inicial', type=float, default=20.0)
+    parser.add_argument('--temp-ambiente', type=float, default=20.0)
+    parser.add_argument('--semilla', type=int, default=None)
+    parser.add_argument('--consigna', type=float, default=None,
+                        help="Consigna de un termostato (°C); sin control si se omite")
+    parser.add_argument('--cada', type=int, default=1, help="Escribir uno de cada N ticks")
+    parser.add_argument('--vivo', action='store_true', help="Mostrar un gráfico en vivo en lugar de escribir CSV")
+    args = parser.parse_args(argumentos)
+
+    flujo = flujo_estocastico(CALENTADOR_BASE, args.temp_inicial, args.temp_ambiente, args.tiempo_total,
+                              args.tick, semilla=args.semilla,
+                              termostato=None if args.consigna is None else Termostato(args.consigna))
+    try:
+        if args.vivo:
+            VistaEnVivo(cada=args.cada).consumir(flujo)
+        else:
+            escribir_csv(flujo, sys.stdout, args.cada)
+    except (BrokenPipeError, KeyboardInterrupt):
+        # El consumidor (head, un gráfico cerrado...) dejó de leer: terminamos sin traza
+        sys.stderr.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""
+Gráficos rápidos de familias enormes de trayectorias.
+
+Dibujar cada curva con su propio `plt.plot` crea un objeto `Line2D` por curva y
+deja de ser usable con miles de escenarios. Acá una familia entera se dibuja de
+una vez:
+
+- `dibujar_familia`: todas las curvas en una única `LineCollection`, cada una
+  reducida antes con `lttb` a unos pocos puntos que conservan su forma.
+- `dibujar_bandas`: bandas entre percentiles y la mediana, calculados por instante.
+- `dibujar_densidad`: imagen con la cantidad de curvas que pasan por cada celda
+  (tiempo, temperatura), útil cuando las líneas se tapan unas a otras.
+
+`lttb` implementa "Largest Triangle Three Buckets" (Steinarsson, 2013): divide
+la curva en baldes y de cada uno se queda con el punto que forma el triángulo de
+mayor área con el punto elegido en el balde anterior y el promedio del siguiente.
+El recorrido por baldes es secuencial, pero cada paso se hace sobre todas las
+curvas del lote a la vez.
+"""
+
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.colors import LogNorm
+
+
+def lttb(tiempo, trayectorias, n_puntos):
+    """
+    Reduce cada trayectoria a `n_puntos` muestras conservando su forma (LTTB).
+
+    tiempo: Grilla de tiempos común, de longitud n_tiempos
+    trayectorias: Array de forma (n_curvas, n_tiempos)
+    n_puntos: Puntos a conservar por curva (incluye el primero y el último)
+
+    Devuelve (tiempos, valores), ambos de forma (n_curvas, n_puntos). Si la curva
+    ya tiene n_puntos o menos se devuelve completa.
+    """
+    tiempo = np.asarray(tiempo, dtype=float)
+    trayectorias = np.atleast_2d(np.asarray(trayectorias, dtype=float))
+    n_curvas, n_tiempos = trayectorias.shape
+    if n_puntos >= n_tiempos or n_puntos < 3:
+        return np.broadcast_to(tiempo, trayectorias.shape), trayectorias
+
+    # Baldes de los puntos interiores; el primero y el último se conservan siempre
+    bordes = (np.arange(n_puntos - 1) * (n_tiempos - 2) / (n_puntos - 2)).astype(int) + 1
+    bordes[-1] = n_tiempos - 1
+    filas = np.arange(n_curvas)
+
+    indices = np.empty((n_curvas, n_puntos), dtype=np.intp)
+    indices[:, 0] = 0
+    indices[:, -1] = n_tiempos - 1
+    elegido = np.zeros(n_curvas, dtype=np.intp)
+    for i in range(n_puntos - 2):
+        inicio, fin = bordes[i], bordes[i + 1]
+
+        # Punto de referencia: promedio del balde siguiente (o el último punto)
+        if i + 2 < len(bordes):
+            siguiente = slice(fin, bordes[i + 2])
+            x_c = tiempo[siguiente].mean()
+            y_c = trayectorias[:, siguiente].mean(axis=1)
+        else:
+            x_c, y_c = tiempo[-1], trayectorias[:, -1]
+
+        x_a = tiempo[elegido][:, np.newaxis]
+        y_a = trayectorias[filas, elegido][:, np.newaxis]
+        x_b = tiempo[inicio:fin]
+        y_b = trayectorias[:, inicio:fin]
+        # El doble del área del triángulo alcanza para comparar
+        area = np.abs((x_a - x_c) * (y_b - y_a) - (x_a - x_b) * (y_c[:, np.newaxis] - y_a))
+        elegido = inicio + np.argmax(area, axis=1)
+        indices[:, i + 1] = elegido
+
+    return tiempo[indices], np.take_along_axis(trayectorias, indices, axis=1)
+
+
+def dibujar_familia(ax, tiempo, trayectorias, n_puntos=100, colores=None, **estilo):
+    """
+    Dibuja todas las trayectorias como una sola `LineCollection`.
+
+    ax: Ejes de matplotlib
+    tiempo: Grilla de tiempos común, de longitud n_tiempos
+    trayectorias: Array de forma (n_curvas, n_tiempos)
+    n_puntos: Puntos por curva después de reducir con `lttb` (None para no reducir)
+    colores: Un color para todas, o uno por curva
+    estilo: Opciones de `LineCollection` (linewidths, linestyles, alpha, label, ...)
+
+    Devuelve la colección agregada a los ejes.
+    """
+    trayectorias = np.atleast_2d(trayectorias)
+    if n_puntos is None:
+        x, y = np.broadcast_to(np.asarray(tiempo, dtype=float), trayectorias.shape), trayectorias
+    else:
+        x, y = lttb(tiempo, trayectorias, n_puntos)
+
+    coleccion = LineCollection(np.stack([x, y], axis=-1), colors=colores, **estilo)
+    ax.add_collection(coleccion)
+    ax.autoscale_view()
+    return coleccion
+
+
+def dibujar_bandas(ax, tiempo, trayectorias, percentiles=(5, 25, 75, 95), color='C0', alpha=0.2,
+                   mediana=True, label=None):
+    """
+    Dibuja bandas entre pares de percentiles de la familia y, opcionalmente, la mediana.
+
+    percentiles: Percentiles en orden creciente; se sombrea entre el primero y el último,
+        el segundo y el anteúltimo, etc., con las bandas interiores más oscuras
+    """
+    trayectorias = np.atleast_2d(trayectorias)
+    niveles = np.percentile(trayectorias, list(percentiles) + [50], axis=0)
+    n_bandas = len(percentiles) // 2
+    for j in range(n_bandas):
+        ax.fill_between(tiempo, niveles[j], niveles[len(percentiles) - 1 - j], color=color,
+                        alpha=alpha, linewidth=0,
+                        label=f"P{percentiles[j]:g}-P{percentiles[-1 - j]:g}" if label is None else None)
+    if mediana:
+        ax.plot(tiempo, niveles[-1], color=color, linewidth=2, label='Mediana' if label is None else label)
+    return niveles
+
+
+def dibujar_densidad(ax, tiempo, trayectorias, n_bins=200, rango=None, cmap='viridis'):
+    """
+    Dibuja la densidad de curvas por celda (tiempo, valor) como imagen.
+
+    n_bins: Cantidad de intervalos en el eje de valores
+    rango: (mínimo, máximo) del eje de valores; por defecto el de las trayectorias
+
+    Devuelve la imagen (`QuadMesh`), útil para agregarle una barra de color.
+    """
+    tiempo = np.asarray(tiempo, dtype=float)
+    trayectorias = np.atleast_2d(trayectorias)
+    minimo, maximo = rango if rango is not None else (trayectorias.min(), trayectorias.max())
+    if maximo <= minimo:
+        maximo = minimo + 1.0
+
+    # Histograma de cada columna de tiempo con un único bincount
+    bins = np.clip(((trayectorias - minimo) / (maximo - minimo) * n_bins).astype(np.intp), 0, n_bins - 1)
+    celdas = bins + n_bins * np.arange(len(tiempo))
+    conteos = np.bincount(celdas.ravel(), minlength=n_bins * len(tiempo)).reshape(len(tiempo), n_bins)
+
+    bordes_t = np.concatenate([tiempo[:1], (tiempo[1:] + tiempo[:-1]) / 2, tiempo[-1:]])
+    bordes_y = np.linspace(minimo, maximo, n_bins + 1)
+    conteos = np.ma.masked_equal(conteos.T, 0)
+    return ax.pcolormesh(bordes_t, bordes_y, conteos, cmap=cmap, norm=LogNorm(), shading='flat')
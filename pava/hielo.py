@@ -0,0 +1,129 @@
+"""
+Integración de paso adaptativo con un modelo físico de fusión de hielo (TP4).
+
+En el TP4 el hielo se modelaba como una caída instantánea de temperatura en un
+tick de la grilla. Acá el hielo es una fase aparte que se derrite a la velocidad
+que fija el intercambio de calor con el agua:
+
+    Q_h   = h · A(m_h) · (T - T_hielo)                  (calor que recibe el hielo, W)
+    dm_h/dt = -Q_h / L                                   (hielo que se derrite)
+    dm_w/dt = +Q_h / L                                   (agua de fusión que se suma a T_hielo)
+    m_w·c·dT/dt = P - k·(T - Tamb) - Q_h - (dm_w/dt)·c·(T - T_hielo)
+
+El área de intercambio es la de `cubos` cubitos iguales que se achican con la masa,
+A = cubos · 6 · (m_h / (cubos·ρ_h))^(2/3).
+
+Las ecuaciones se integran con `scipy.integrate.solve_ivp` (Runge-Kutta 4/5 con
+control de error), que achica el paso durante la fusión y lo agranda en el resto.
+Los instantes de adición de hielo son floats arbitrarios: el horizonte se corta en
+esos instantes y el fin de la fusión se detecta como evento del integrador.
+"""
+
+import numpy as np
+from scipy.integrate import solve_ivp
+
+CALOR_LATENTE_FUSION = 334000  # J/kg
+DENSIDAD_HIELO = 917           # kg/m³
+TEMP_HIELO = 0.0               # °C
+COEF_CONVECCION_HIELO = 500    # W/(m²·K), agua en contacto con hielo (valor supuesto)
+
+
+def area_hielo(masa_hielo, cubos):
+    """Área de intercambio (m²) de `cubos` cubitos iguales con masa total `masa_hielo` (kg)."""
+    masa_hielo = np.maximum(masa_hielo, 0.0)
+    return cubos * 6 * (masa_hielo / (cubos * DENSIDAD_HIELO))**(2/3)
+
+
+def _derivadas(calentador, temp_ambiente, cubos, coef_conveccion):
+    """Lado derecho del sistema (T, m_agua, m_hielo) para un tramo con `cubos` cubitos."""
+    c = calentador.calor_especifico
+
+    def f(t, y):
+        temperatura, masa_agua, masa_hielo = y
+        calor_hielo = coef_conveccion * area_hielo(masa_hielo, cubos) * (temperatura - TEMP_HIELO) if cubos else 0.0
+        fusion = calor_hielo / CALOR_LATENTE_FUSION
+        potencia_neta = (calentador.potencia - calentador.perdida_calor * (temperatura - temp_ambiente)
+                         - calor_hielo - fusion * c * (temperatura - TEMP_HIELO))
+        return [potencia_neta / (masa_agua * c), fusion, -fusion]
+
+    return f
+
+
+def simular_con_hielo(calentador, temp_inicial, temp_ambiente, tiempo_total, adiciones,
+                      coef_conveccion=COEF_CONVECCION_HIELO, rtol=1e-6, atol=1e-9, paso_maximo=np.inf):
+    """
+    Simula el calentamiento con adiciones de hielo usando paso adaptativo.
+
+    calentador: `pava.modelo.Calentador` con los parámetros del equipo
+    temp_inicial, temp_ambiente: Temperaturas inicial del fluido y ambiente (°C)
+    tiempo_total: Fin de la simulación (s)
+    adiciones: Lista de diccionarios con 'tiempo' (s, float arbitrario), 'masa' (kg) y
+        'cubos' (cantidad de cubitos) de cada adición de hielo
+    coef_conveccion: Coeficiente de intercambio agua-hielo (W/(m²·K))
+    rtol, atol, paso_maximo: Control de error y paso máximo del integrador
+
+    Devuelve un diccionario con:
+        tiempo, temperatura, masa_agua, masa_hielo: Valores en los pasos aceptados por el integrador
+        pasos: Tamaño de cada paso aceptado (s)
+        fin_fusion: Instantes en que se terminó de derretir el hielo
+        evaluar: Función que devuelve (temperatura, masa_agua, masa_hielo) en tiempos arbitrarios
+    """
+    adiciones = sorted((a for a in adiciones if 0 <= a['tiempo'] < tiempo_total), key=lambda a: a['tiempo'])
+    cortes = [0.0] + [float(a['tiempo']) for a in adiciones] + [float(tiempo_total)]
+
+    estado = np.array([temp_inicial, calentador.masa_agua, 0.0])
+    cubos = 0
+    tramos, fin_fusion = [], []
+    t = 0.0
+
+    def derretido(t, y):
+        # Evento terminal: la masa de hielo cruza (bajando) un umbral despreciable
+        return y[2] - 1e-9 * calentador.masa_agua
+    derretido.terminal, derretido.direction = True, -1
+
+    for k in range(len(cortes) - 1):
+        # Agregamos el hielo de esta adición (el primer tramo no tiene adición)
+        if k > 0:
+            estado[2] += adiciones[k - 1]['masa']
+            cubos += adiciones[k - 1]['cubos']
+
+        t_fin = cortes[k + 1]
+        while t < t_fin:
+            sol = solve_ivp(
+                _derivadas(calentador, temp_ambiente, cubos if estado[2] > 0 else 0, coef_conveccion),
+                (t, t_fin), estado, method='RK45', rtol=rtol, atol=atol, max_step=paso_maximo,
+                dense_output=True, events=derretido if estado[2] > 0 else None,
+            )
+            if sol.status == -1:
+                raise RuntimeError(f"El integrador falló en t={t:.3f}s: {sol.message}")
+            tramos.append(sol)
+            t, estado = sol.t[-1], sol.y[:, -1].copy()
+            if sol.status == 1:
+                # Se terminó de derretir: pasamos el resto de hielo al agua y seguimos sin hielo
+                fin_fusion.append(t)
+                estado[1] += estado[2]
+                estado[2] = 0.0
+                cubos = 0
+
+    tiempo = np.concatenate([tramos[0].t[:1]] + [s.t[1:] for s in tramos])
+    valores = np.concatenate([tramos[0].y[:, :1]] + [s.y[:, 1:] for s in tramos], axis=1)
+    inicios = np.array([s.t[0] for s in tramos])
+
+    def evaluar(tiempos):
+        tiempos = np.asarray(tiempos, dtype=float)
+        resultado = np.empty((3,) + tiempos.shape)
+        # Un instante de corte pertenece al tramo que empieza en él (ya con el hielo agregado)
+        tramo = np.clip(np.searchsorted(inicios, tiempos, side='right') - 1, 0, len(tramos) - 1)
+        for j in np.unique(tramo):
+            resultado[:, tramo == j] = tramos[j].sol(tiempos[tramo == j])
+        return resultado
+
+    return {
+        'tiempo': tiempo,
+        'temperatura': valores[0],
+        'masa_agua': valores[1],
+        'masa_hielo': valores[2],
+        'pasos': np.diff(tiempo),
+        'fin_fusion': fin_fusion,
+        'evaluar': evaluar,
+    }
@@ -0,0 +1,179 @@
+"""
+Simulación de horizontes largos (días a un año de ticks de 1 s) por bloques, con resumen sobre la marcha.
+
+Un año son unos 31,5 millones de ticks: guardar la trayectoria completa en
+float64 ocupa 250 MB y graficarla no tiene sentido. Acá el horizonte se avanza
+en bloques de tamaño fijo y cada bloque se resume apenas se simula:
+
+- Eventos: se sortean con tiempos entre llegadas geométricos, como en
+  `pava.montecarlo`, en tandas que se guardan hasta que el bloque las consume.
+  El resultado no depende del tamaño de bloque elegido.
+- Integración: la recurrencia exacta por tick (`integrar_por_tick`) arranca en
+  la última temperatura del bloque anterior. Sin control la resistencia está
+  siempre encendida y el agua tiende a Tamb + P/k, muy por encima de la
+  ebullición; con un `pava.control.Termostato` el bloque se integra con
+  `pava.control.integrar_termostato`, que continúa el estado del termostato.
+- Resumen: por cada intervalo (un minuto, una hora...) mínimo, media y máximo de
+  la temperatura del fluido, mínimo del ambiente, eventos iniciados, energía
+  entregada por la resistencia y energía perdida por el aislante (por balance:
+  entregada - C·ΔT, exacto).
+
+`resumenes_por_bloque` es un generador que entrega el resumen de cada bloque y
+ocupa memoria constante sin importar el horizonte; `simular_largo_plazo` los
+junta en arrays (uno por intervalo) y agrega los totales del horizonte.
+"""
+
+import numpy as np
+
+from pava.control import integrar_termostato
+from pava.modelo import CALOR_ESPECIFICO_AGUA
+from pava.montecarlo import (DESCENSO, DURACION, PROBABILIDAD_EVENTO, integrar_por_tick,
+                             temperaturas_ambiente)
+
+MINUTO = 60
+HORA = 3600
+DIA = 86_400
+ANIO = 365 * DIA
+
+CAMPOS = ('inicio', 'minimo', 'media', 'maximo', 'ambiente_minimo', 'eventos', 'energia', 'perdidas')
+
+
+class _FuenteEventos:
+    """Eventos sorteados en tandas y entregados en orden a medida que se los pide."""
+
+    def __init__(self, rng, probabilidad, descenso, duracion, tamano_tanda=4096):
+        self.rng = rng
+        self.probabilidad = probabilidad
+        self.descenso = descenso
+        self.duracion = duracion
+        self.tamano_tanda = tamano_tanda
+        self.inicios = np.empty(0, dtype=np.int64)
+        self.duraciones = np.empty(0, dtype=np.int64)
+        self.descensos = np.empty(0)
+        self.proximo = int(rng.geometric(probabilidad))
+
+    def _sortear_tanda(self):
+        # inicio[k+1] = inicio[k] + duracion[k] - 1 + G: el siguiente evento no empieza mientras hay uno activo
+        n = self.tamano_tanda
+        duraciones = self.rng.integers(self.duracion[0], self.duracion[1] + 1, size=n)
+        esperas = self.rng.geometric(self.probabilidad, size=n)
+        desplazamientos = np.concatenate([[0], np.cumsum(duraciones[:-1] - 1 + esperas[:-1])])
+        inicios = self.proximo + desplazamientos
+        self.proximo = int(inicios[-1] + duraciones[-1] - 1 + esperas[-1])
+        self.inicios = np.concatenate([self.inicios, inicios])
+        self.duraciones = np.concatenate([self.duraciones, duraciones])
+        self.descensos = np.concatenate([self.descensos, self.rng.uniform(self.descenso[0], self.descenso[1], size=n)])
+
+    def hasta(self, fin):
+        """
+        Eventos que tocan los ticks [.., fin): devuelve (inicios, duraciones, descensos).
+
+        Se descartan los que terminaron antes de `fin`; el último puede seguir activo
+        en el bloque siguiente y se vuelve a entregar.
+        """
+        while self.proximo < fin:
+            self._sortear_tanda()
+        cantidad = np.searchsorted(self.inicios, fin)
+        eventos = self.inicios[:cantidad], self.duraciones[:cantidad], self.descensos[:cantidad]
+        terminados = np.searchsorted(self.inicios + self.duraciones, fin, side='right')
+        terminados = min(terminados, cantidad)
+        self.inicios, self.duraciones, self.descensos = (
+            self.inicios[terminados:], self.duraciones[terminados:], self.descensos[terminados:])
+        return eventos
+
+
+def resumenes_por_bloque(tiempo_total, temp_inicial, temp_ambiente_base, potencia, perdida_calor, masa,
+                         calor_especifico=CALOR_ESPECIFICO_AGUA, intervalo=MINUTO, tamano_bloque=1440 * MINUTO,
+                         probabilidad=PROBABILIDAD_EVENTO, descenso=DESCENSO, duracion=DURACION, semilla=None,
+                         termostato=None):
+    """
+    Avanza el horizonte por bloques y entrega el resumen de cada uno (generador).
+
+    tiempo_total: Horizonte en segundos (ticks de 1 s)
+    temp_inicial, temp_ambiente_base, potencia, perdida_calor, masa, calor_especifico:
+        Parámetros del modelo (escalares)
+    intervalo: Ticks por intervalo del resumen (por ejemplo `MINUTO` o `HORA`)
+    tamano_bloque: Ticks simulados a la vez; se redondea a un múltiplo de `intervalo`
+    probabilidad, descenso, duracion: Parámetros del fenómeno estocástico
+    semilla: Semilla del generador (np.random.default_rng)
+    termostato: `pava.control.Termostato` escalar que enciende y apaga la resistencia, o
+        None para tenerla siempre a plena potencia
+
+    Cada resumen es un diccionario con un array por campo de `CAMPOS` (un valor por
+    intervalo) y 'temp_final', la temperatura al final del bloque. El último
+    intervalo puede ser más corto si el horizonte no es múltiplo de `intervalo`.
+    """
+    rng = np.random.default_rng(semilla)
+    fuente = _FuenteEventos(rng, probabilidad, descenso, duracion)
+    tamano_bloque = max(tamano_bloque // intervalo, 1) * intervalo
+    capacidad_termica = masa * calor_especifico
+
+    temperatura, encendido = float(temp_inicial), True
+    for inicio in range(0, tiempo_total, tamano_bloque):
+        fin = min(inicio + tamano_bloque, tiempo_total)
+        tiempo = np.arange(inicio, fin + 1)
+
+        # Ambiente de cada tick [t, t+1) y temperatura en cada instante del bloque (incluido el final)
+        inicios, duraciones, descensos = fuente.hasta(fin)
+        ambiente = temperaturas_ambiente(tiempo, inicios[np.newaxis], duraciones[np.newaxis],
+                                         descensos[np.newaxis], temp_ambiente_base)
+        if termostato is None:
+            trayectoria = integrar_por_tick(ambiente, temperatura, potencia, perdida_calor, masa, calor_especifico)[0]
+        else:
+            trayectoria, ciclo, encendido = integrar_termostato(ambiente[0, :-1], temperatura, termostato, potencia,
+                                                                perdida_calor, capacidad_termica, encendido=encendido)
+        ambiente = ambiente[0, :-1]
+
+        # Resumen por intervalo sobre los instantes [inicio, fin); el balance usa la temperatura al cierre
+        bordes = np.arange(0, fin - inicio, intervalo)
+        ticks = np.diff(np.append(bordes, fin - inicio))
+        valores = trayectoria[:-1]
+        energia = potencia * (ticks if termostato is None else np.add.reduceat(ciclo, bordes))
+        yield {
+            'inicio': tiempo[bordes],
+            'minimo': np.minimum.reduceat(valores, bordes),
+            'media': np.add.reduceat(valores, bordes) / ticks,
+            'maximo': np.maximum.reduceat(valores, bordes),
+            'ambiente_minimo': np.minimum.reduceat(ambiente, bordes),
+            'eventos': np.bincount((inicios[inicios >= inicio] - inicio) // intervalo, minlength=len(bordes))[:len(bordes)],
+            'energia': energia,
+            'perdidas': energia - capacidad_termica * np.diff(trayectoria[np.append(bordes, fin - inicio)]),
+            'temp_final': trayectoria[-1],
+        }
+        temperatura = trayectoria[-1]
+
+
+def simular_largo_plazo(tiempo_total, temp_inicial, temp_ambiente_base, potencia, perdida_calor, masa,
+                        calor_especifico=CALOR_ESPECIFICO_AGUA, intervalo=HORA, tamano_bloque=1440 * MINUTO,
+                        probabilidad=PROBABILIDAD_EVENTO, descenso=DESCENSO, duracion=DURACION, semilla=None,
+                        termostato=None):
+    """
+    Simula un horizonte largo y devuelve el resumen por intervalo.
+
+    Los parámetros son los de `resumenes_por_bloque`. La memoria usada depende del
+    tamaño de bloque y de la cantidad de intervalos (tiempo_total / intervalo), no de
+    la cantidad de ticks.
+
+    Devuelve un diccionario con un array por campo de `CAMPOS` y los totales del
+    horizonte: 'temp_final', 'eventos_totales', 'energia_total', 'perdidas_totales',
+    'minimo_global' y 'maximo_global'.
+    """
+    partes = {campo: [] for campo in CAMPOS}
+    temp_final = float(temp_inicial)
+    for resumen in resumenes_por_bloque(tiempo_total, temp_inicial, temp_ambiente_base, potencia, perdida_calor,
+                                        masa, calor_especifico, intervalo, tamano_bloque, probabilidad, descenso,
+                                        duracion, semilla, termostato):
+        for campo in CAMPOS:
+            partes[campo].append(resumen[campo])
+        temp_final = resumen['temp_final']
+
+    resultado = {campo: np.concatenate(valores) for campo, valores in partes.items()}
+    resultado.update({
+        'temp_final': temp_final,
+        'eventos_totales': int(resultado['eventos'].sum()),
+        'energia_total': float(resultado['energia'].sum()),
+        'perdidas_totales': float(resultado['perdidas'].sum()),
+        'minimo_global': float(resultado['minimo'].min()),
+        'maximo_global': float(max(resultado['maximo'].max(), temp_final)),
+    })
+    return resultado
@@ -0,0 +1,144 @@
+"""
+Ejecución por lotes de las simulaciones de los TPs, sin ventanas y en paralelo.
+
+    python -m pava.lote                          # todos los TPs con simulación
+    python -m pava.lote tp5 tp6 --semillas 1 2 3 -j 4 --salida resultados
+
+Cada tarea (un TP, o un TP con una semilla) corre en su propio proceso con el
+backend Agg de matplotlib, así que `plt.show()` no bloquea y los estilos o el
+estado de un TP no contaminan al siguiente. El directorio de trabajo de cada
+tarea es su carpeta de resultados: las figuras que guarda el script (siempre con
+nombres relativos) y su salida por consola (`salida.txt`) quedan juntas en
+
+    <salida>/tpN/                  (sin semilla)
+    <salida>/tpN/semilla_S/        (con --semillas)
+
+y en `<salida>/resumen.json` queda el estado, la duración y los archivos de
+cada tarea. Los escenarios son las semillas: los TPs estocásticos leen la
+variable de entorno `PAVA_SEMILLA`; los determinísticos la ignoran.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+
+def tps_disponibles():
+    """Nombres de los TPs cuyo `simulacion.py` tiene código."""
+    return sorted(
+        (p.parent.name for p in RAIZ.glob('tp*/simulacion.py') if p.stat().st_size > 0),
+        key=lambda nombre: int(nombre[2:]),
+    )
+
+
+def _correr_tarea(tp, semilla, destino):
+    """Ejecuta `tpN/simulacion.py` en un proceso aparte con `destino` como directorio de trabajo."""
+    os.environ['MPLBACKEND'] = 'Agg'
+    if semilla is not None:
+        os.environ['PAVA_SEMILLA'] = str(semilla)
+
+    import runpy
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    # Con Agg `plt.show()` no hace nada; cerramos la figura para no acumular memoria
+    plt.show = lambda *args, **kwargs: plt.close('all')
+
+    destino = Path(destino)
+    destino.mkdir(parents=True, exist_ok=True)
+    os.chdir(destino)
+
+    inicio = time.perf_counter()
+    error = None
+    with open('salida.txt', 'w', encoding='utf-8') as salida, \
+            contextlib.redirect_stdout(salida), contextlib.redirect_stderr(salida):
+        try:
+            runpy.run_path(str(RAIZ / tp / 'simulacion.py'), run_name='__main__')
+        except BaseException:
+            error = traceback.format_exc()
+            print(error)
+    plt.close('all')
+
+    return {
+        'tp': tp,
+        'semilla': semilla,
+        'estado': 'ok' if error is None else 'error',
+        'duracion': time.perf_counter() - inicio,
+        'directorio': str(destino),
+        'archivos': sorted(p.name for p in destino.iterdir() if p.is_file()),
+        'error': error,
+    }
+
+
+def ejecutar_lote(tps=None, semillas=None, salida='resultados', procesos=None, informar=print):
+    """
+    Ejecuta las simulaciones pedidas repartidas en un pool de procesos.
+
+    tps: Lista de TPs ('tp1', 'tp5', ...); por defecto `tps_disponibles()`
+    semillas: Lista de semillas; cada TP se corre una vez por semilla (None: una sola vez)
+    salida: Directorio de resultados
+    procesos: Cantidad de procesos del pool (por defecto, uno por núcleo)
+    informar: Función para reportar cada tarea terminada (None para no reportar)
+
+    Devuelve la lista de resultados de las tareas, en el orden en que se pidieron.
+    """
+    tps = tps_disponibles() if not tps else list(tps)
+    desconocidos = [tp for tp in tps if not (RAIZ / tp / 'simulacion.py').is_file()]
+    if desconocidos:
+        raise ValueError(f"TPs sin simulacion.py: {', '.join(desconocidos)}")
+
+    salida = Path(salida).resolve()
+    tareas = [
+        (tp, semilla, salida / tp if semilla is None else salida / tp / f'semilla_{semilla}')
+        for tp in tps for semilla in (semillas or [None])
+    ]
+
+    # Un proceso nuevo por tarea: cada script empieza con matplotlib y numpy limpios
+    resultados = [None] * len(tareas)
+    with ProcessPoolExecutor(max_workers=procesos, max_tasks_per_child=1) as pool:
+        futuros = {pool.submit(_correr_tarea, *tarea): i for i, tarea in enumerate(tareas)}
+        for futuro in as_completed(futuros):
+            resultado = futuro.result()
+            resultados[futuros[futuro]] = resultado
+            if informar:
+                etiqueta = resultado['tp'] if resultado['semilla'] is None else f"{resultado['tp']} (semilla {resultado['semilla']})"
+                informar(f"{etiqueta:24s} {resultado['estado']:5s} {resultado['duracion']:8.2f} s  "
+                         f"{len(resultado['archivos'])} archivos")
+
+    with open(salida / 'resumen.json', 'w', encoding='utf-8') as archivo:
+        json.dump(resultados, archivo, indent=2, ensure_ascii=False)
+    return resultados
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Ejecuta las simulaciones de los TPs sin ventanas y en paralelo.")
+    parser.add_argument('tps', nargs='*', help="TPs a ejecutar (por defecto, todos los que tienen simulación)")
+    parser.add_argument('--semillas', nargs='+', type=int, help="Semillas de los escenarios estocásticos")
+    parser.add_argument('--salida', default='resultados', help="Directorio de resultados")
+    parser.add_argument('-j', '--procesos', type=int, help="Procesos en paralelo (por defecto, uno por núcleo)")
+    args = parser.parse_args(argumentos)
+
+    inicio = time.perf_counter()
+    try:
+        resultados = ejecutar_lote(args.tps, args.semillas, args.salida, args.procesos)
+    except ValueError as error:
+        parser.error(str(error))
+    errores = [r for r in resultados if r['estado'] != 'ok']
+    print(f"{len(resultados) - len(errores)}/{len(resultados)} tareas sin errores en "
+          f"{time.perf_counter() - inicio:.1f} s; resultados en {Path(args.salida).resolve()}")
+    for resultado in errores:
+        print(f"\n--- {resultado['tp']} (semilla {resultado['semilla']}) ---\n{resultado['error']}")
+    return 1 if errores else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,184 @@
+"""
+Modelo compartido del calentador (geometría, aislante, parte eléctrica y fluido).
+
+Reemplaza el bloque de parámetros que se repetía en cada TP. `Calentador` es un
+objeto inmutable y compacto (`__slots__`): guarda sólo los parámetros de diseño y
+calcula las magnitudes derivadas (superficie, pérdida de calor, potencia, masa...)
+la primera vez que se piden, guardándolas en un caché propio de la instancia.
+
+Los campos pueden ser escalares o arrays de NumPy, así que un único `Calentador`
+puede representar millones de variantes de diseño a la vez:
+
+    variantes = Calentador(resistencia=np.linspace(0.1, 0.5, 1_000_000))
+    variantes.potencia  # array con la potencia de cada variante
+"""
+
+from dataclasses import dataclass, field, replace
+from functools import wraps
+
+import numpy as np
+
+CALOR_ESPECIFICO_AGUA = 4180  # J/(kg·°C)
+DENSIDAD_AGUA = 1.0           # kg/L
+
+
+def _derivada(funcion):
+    """Propiedad derivada que se calcula una sola vez por instancia."""
+    nombre = funcion.__name__
+
+    @property
+    @wraps(funcion)
+    def propiedad(self):
+        try:
+            return self._cache[nombre]
+        except KeyError:
+            valor = self._cache[nombre] = funcion(self)
+            return valor
+
+    return propiedad
+
+
+def derivada_temperatura(temperatura, temp_ambiente, potencia, perdida_calor, capacidad_termica):
+    """
+    Lado derecho del modelo: dT/dt = (P - k·(T - Tamb)) / (m·c).
+
+    Todos los argumentos pueden ser escalares o arrays compatibles.
+    """
+    return (potencia - perdida_calor * (temperatura - temp_ambiente)) / capacidad_termica
+
+
+def temperatura_equilibrio(temp_ambiente, potencia, perdida_calor):
+    """
+    Temperatura de equilibrio T∞ = Tamb + P/k a la que tiende el fluido.
+
+    Todos los argumentos pueden ser escalares o arrays compatibles. Con k = 0 no hay
+    equilibrio y devuelve infinito.
+    """
+    perdida_calor = np.asarray(perdida_calor, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(perdida_calor > 0, temp_ambiente + np.divide(potencia, perdida_calor), np.inf)
+
+
+@dataclass(frozen=True, slots=True)
+class Calentador:
+    """
+    Parámetros de diseño del calentador eléctrico de agua.
+
+    diametro, altura: Dimensiones del recipiente cilíndrico (cm)
+    espesor_aislante: Espesor del aislante (cm)
+    conductividad_aislante: Coeficiente de conductividad térmica del aislante (W/(m·K));
+        con 0 se obtiene el modelo sin pérdidas del TP1/TP2
+    voltaje: Tensión de alimentación (V)
+    resistencia: Resistencia de NICROM (Ω)
+    densidad_agua: Densidad del fluido (kg/L)
+    calor_especifico: Calor específico del fluido (J/(kg·°C))
+    volumen_agua: Volumen de fluido (L); si es None se usa la capacidad del cilindro
+    """
+
+    diametro: float = 8.0
+    altura: float = 15.0
+    espesor_aislante: float = 0.25
+    conductividad_aislante: float = 0.04
+    voltaje: float = 12.0
+    resistencia: float = 0.23
+    densidad_agua: float = DENSIDAD_AGUA
+    calor_especifico: float = CALOR_ESPECIFICO_AGUA
+    volumen_agua: float = None
+    _cache: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def variante(self, **cambios):
+        """Devuelve una copia con algunos parámetros cambiados (y su propio caché)."""
+        return replace(self, **cambios)
+
+    # Geometría
+    @_derivada
+    def radio(self):
+        """Radio del recipiente (cm)."""
+        return self.diametro / 2
+
+    @_derivada
+    def volumen(self):
+        """Volumen del cilindro (cm³)."""
+        return np.pi * self.radio**2 * self.altura
+
+    @_derivada
+    def capacidad(self):
+        """Capacidad del recipiente (L)."""
+        return self.volumen / 1000
+
+    @_derivada
+    def radio_m(self):
+        """Radio en metros."""
+        return self.radio / 100
+
+    @_derivada
+    def altura_m(self):
+        """Altura en metros."""
+        return self.altura / 100
+
+    @_derivada
+    def espesor_m(self):
+        """Espesor del aislante en metros."""
+        return self.espesor_aislante / 100
+
+    @_derivada
+    def sup_lateral(self):
+        """Superficie lateral (m²)."""
+        return 2 * np.pi * self.radio_m * self.altura_m
+
+    @_derivada
+    def sup_bases(self):
+        """Superficie de las dos bases (m²)."""
+        return 2 * np.pi * self.radio_m**2
+
+    @_derivada
+    def sup_total(self):
+        """Superficie total de intercambio (m²)."""
+        return self.sup_lateral + self.sup_bases
+
+    # Pérdidas
+    @_derivada
+    def perdida_calor(self):
+        """Coeficiente de pérdida de calor k = λ·S/e (W/K)."""
+        return self.conductividad_aislante * self.sup_total / self.espesor_m
+
+    # Parte eléctrica
+    @_derivada
+    def potencia(self):
+        """Potencia disipada P = V²/R (W)."""
+        return self.voltaje**2 / self.resistencia
+
+    @_derivada
+    def corriente(self):
+        """Corriente I = V/R (A)."""
+        return self.voltaje / self.resistencia
+
+    # Fluido
+    @_derivada
+    def masa_agua(self):
+        """Masa de fluido (kg)."""
+        volumen = self.capacidad if self.volumen_agua is None else self.volumen_agua
+        return volumen * self.densidad_agua
+
+    @_derivada
+    def capacidad_termica(self):
+        """Capacidad térmica del fluido m·c (J/°C)."""
+        return self.masa_agua * self.calor_especifico
+
+    @_derivada
+    def constante_tiempo(self):
+        """Constante de tiempo τ = m·c/k (s); infinita sin pérdidas."""
+        with np.errstate(divide='ignore'):
+            return np.divide(self.capacidad_termica, self.perdida_calor)
+
+    def temperatura_limite(self, temp_ambiente):
+        """Temperatura de equilibrio Tamb + P/k (°C); infinita sin pérdidas."""
+        return temperatura_equilibrio(temp_ambiente, self.potencia, self.perdida_calor)
+
+    def derivada(self, temperatura, temp_ambiente):
+        """dT/dt (°C/s) vectorizado sobre temperaturas y temperaturas ambiente."""
+        return derivada_temperatura(temperatura, temp_ambiente, self.potencia, self.perdida_calor,
+                                    self.capacidad_termica)
+
+
+CALENTADOR_BASE = Calentador()
@@ -0,0 +1,223 @@
+"""
+Réplicas Monte Carlo del TP6 con estadísticas por tick en streaming.
+
+En lugar de sortear un Bernoulli por tick con `random.random()`, cada réplica
+sortea directamente el instante del próximo evento con un tiempo entre llegadas
+geométrico (el número de ticks hasta el primer éxito con probabilidad p). El
+descenso es uniforme en [5, 50] °C y la duración un entero uniforme en [5, 30] s.
+
+Las réplicas se simulan por lotes de tamaño fijo: cada lote se integra en forma
+exacta tick a tick (la ecuación es lineal y el ambiente es constante dentro de
+cada tick) y se vuelca en acumuladores de media, varianza e histograma por tick.
+Así la memoria depende del tamaño del lote y no del número total de réplicas.
+"""
+
+import numpy as np
+from scipy.signal import lfilter
+
+from pava.almacen import EscritorEnsamble
+from pava.modelo import CALOR_ESPECIFICO_AGUA
+
+PROBABILIDAD_EVENTO = 1/300  # Probabilidad de ocurrencia por tick
+DESCENSO = (5, 50)           # Descenso mínimo y máximo (°C)
+DURACION = (5, 30)           # Duración mínima y máxima (s)
+
+
+def sortear_eventos(n_replicas, tiempo_total, rng, probabilidad=PROBABILIDAD_EVENTO,
+                    descenso=DESCENSO, duracion=DURACION):
+    """
+    Sortea los eventos de `n_replicas` réplicas independientes.
+
+    Un evento empieza en el tick `inicio` y baja la temperatura ambiente durante
+    [inicio, inicio + duracion). Mientras hay un evento activo no puede empezar otro,
+    así que el siguiente inicio es `fin - 1 + G`, con G geométrica de parámetro p.
+
+    Devuelve (inicios, duraciones, descensos), arrays de forma (n_replicas, K) donde K es
+    la máxima cantidad de eventos de una réplica. Los lugares sin evento tienen
+    inicio = tiempo_total + 1 y duración 0.
+    """
+    inicios, duraciones, descensos = [], [], []
+    proximo = rng.geometric(probabilidad, size=n_replicas)
+
+    # Una ronda por evento: todas las réplicas sortean su k-ésimo evento juntas
+    while np.any(proximo <= tiempo_total):
+        activo = proximo <= tiempo_total
+        d = np.where(activo, rng.integers(duracion[0], duracion[1] + 1, size=n_replicas), 0)
+        inicios.append(np.where(activo, proximo, tiempo_total + 1))
+        duraciones.append(d)
+        descensos.append(np.where(activo, rng.uniform(descenso[0], descenso[1], size=n_replicas), 0.0))
+        proximo = np.where(activo, proximo + d - 1 + rng.geometric(probabilidad, size=n_replicas), proximo)
+
+    if not inicios:
+        vacio = np.empty((n_replicas, 0))
+        return vacio.astype(int), vacio.astype(int), vacio
+    return np.stack(inicios, axis=1), np.stack(duraciones, axis=1), np.stack(descensos, axis=1)
+
+
+def temperaturas_ambiente(tiempo, inicios, duraciones, descensos, temp_ambiente_base):
+    """
+    Temperatura ambiente de cada réplica durante cada tick [tiempo[i], tiempo[i+1]).
+
+    Devuelve un array de forma (n_replicas, len(tiempo)).
+    """
+    # Marcamos cada evento como un escalón (-descenso al inicio, +descenso al final)
+    # y acumulamos a lo largo del tiempo, sin recorrer la grilla una vez por evento
+    n_replicas, n_ticks = inicios.shape[0], len(tiempo)
+    filas = np.arange(n_replicas)[:, np.newaxis] * (n_ticks + 1)
+    posicion_inicio = np.clip(np.searchsorted(tiempo, inicios), 0, n_ticks)
+    posicion_fin = np.clip(np.searchsorted(tiempo, inicios + duraciones), 0, n_ticks)
+
+    escalones = np.bincount((filas + posicion_inicio).ravel(), weights=-descensos.ravel(),
+                            minlength=n_replicas * (n_ticks + 1))
+    escalones += np.bincount((filas + posicion_fin).ravel(), weights=descensos.ravel(),
+                             minlength=n_replicas * (n_ticks + 1))
+    temp_ambiente = np.cumsum(escalones.reshape(n_replicas, n_ticks + 1)[:, :n_ticks], axis=1)
+    temp_ambiente += temp_ambiente_base
+    return temp_ambiente
+
+
+def integrar_por_tick(temp_ambiente, temp_inicial, potencia, perdida_calor, masa,
+                      calor_especifico=CALOR_ESPECIFICO_AGUA, tick=1):
+    """
+    Integra exactamente la temperatura del fluido con ambiente constante en cada tick.
+
+    Con a = exp(-k·Δt/(m·c)) la recurrencia exacta es
+        T[i+1] = a·T[i] + (1 - a)·(Tamb[i] + P/k),
+    un filtro lineal de primer orden que se aplica a todas las réplicas a la vez.
+    """
+    capacidad_termica = masa * calor_especifico
+    if perdida_calor > 0:
+        a = np.exp(-perdida_calor * tick / capacidad_termica)
+        entrada = (1 - a) * (temp_ambiente[:, :-1] + potencia / perdida_calor)
+    else:
+        a = 1.0
+        entrada = np.full(temp_ambiente[:, :-1].shape, potencia * tick / capacidad_termica)
+
+    entrada = np.concatenate([np.full((temp_ambiente.shape[0], 1), float(temp_inicial)), entrada], axis=1)
+    return lfilter([1.0], [1.0, -a], entrada, axis=1)
+
+
+class EstadisticasPorTick:
+    """
+    Acumulador en streaming de media, varianza y cuantiles por tick.
+
+    La media y la varianza se combinan lote a lote con la fórmula de Chan et al.;
+    los cuantiles se obtienen de un histograma por tick con `n_bins` intervalos
+    fijos en [minimo, maximo] (los valores fuera de rango caen en los extremos).
+    """
+
+    def __init__(self, n_ticks, minimo, maximo, n_bins=2000):
+        self.n = 0
+        self.media = np.zeros(n_ticks)
+        self.m2 = np.zeros(n_ticks)
+        self.bordes = np.linspace(minimo, maximo, n_bins + 1)
+        self.histograma = np.zeros((n_ticks, n_bins), dtype=np.int64)
+
+    def agregar(self, lote):
+        """Incorpora un lote de trayectorias de forma (n_replicas, n_ticks)."""
+        n_lote = lote.shape[0]
+        media_lote = lote.mean(axis=0)
+        desvios = lote - media_lote
+        desvios *= desvios
+        m2_lote = desvios.sum(axis=0)
+
+        delta = media_lote - self.media
+        total = self.n + n_lote
+        self.media += delta * n_lote / total
+        self.m2 += m2_lote + delta**2 * self.n * n_lote / total
+        self.n = total
+
+        n_ticks, n_bins = self.histograma.shape
+        ancho = self.bordes[1] - self.bordes[0]
+        # Reutilizamos el buffer de desvíos para calcular el intervalo de cada valor
+        np.subtract(lote, self.bordes[0], out=desvios)
+        desvios /= ancho
+        np.clip(desvios, 0, n_bins - 1, out=desvios)
+        bins = desvios.astype(np.int64)
+        bins += np.arange(n_ticks) * n_bins
+        self.histograma += np.bincount(bins.ravel(), minlength=n_ticks * n_bins).reshape(n_ticks, n_bins)
+
+    @property
+    def varianza(self):
+        """Varianza muestral por tick."""
+        return self.m2 / max(self.n - 1, 1)
+
+    def cuantiles(self, q):
+        """Cuantiles por tick, interpolados linealmente dentro de cada intervalo del histograma."""
+        acumulado = np.cumsum(self.histograma, axis=1)
+        resultado = np.empty((len(q), acumulado.shape[0]))
+        for j, qj in enumerate(q):
+            objetivo = qj * self.n
+            indice = np.minimum((acumulado < objetivo).sum(axis=1), acumulado.shape[1] - 1)
+            filas = np.arange(acumulado.shape[0])
+            previo = np.where(indice > 0, acumulado[filas, np.maximum(indice - 1, 0)], 0)
+            conteo = np.maximum(self.histograma[filas, indice], 1)
+            fraccion = np.clip((objetivo - previo) / conteo, 0, 1)
+            resultado[j] = self.bordes[indice] + fraccion * (self.bordes[1] - self.bordes[0])
+        return resultado
+
+
+def simular_replicas(n_replicas, tiempo_total, temp_inicial, temp_ambiente_base, potencia, perdida_calor,
+                     masa, calor_especifico=CALOR_ESPECIFICO_AGUA, probabilidad=PROBABILIDAD_EVENTO,
+                     descenso=DESCENSO, duracion=DURACION, cuantiles=(0.05, 0.5, 0.95),
+                     tamano_lote=20_000, n_bins=2000, semilla=None, ruta_trayectorias=None):
+    """
+    Corre `n_replicas` realizaciones independientes del TP6 y resume cada tick.
+
+    n_replicas: Cantidad de réplicas (10^6 entra cómodo en memoria)
+    tiempo_total: Horizonte en segundos, con ticks de 1 segundo
+    temp_inicial, temp_ambiente_base, potencia, perdida_calor, masa, calor_especifico:
+        Parámetros del modelo (escalares, comunes a todas las réplicas)
+    probabilidad, descenso, duracion: Parámetros del fenómeno estocástico
+    cuantiles: Cuantiles a reportar por tick
+    tamano_lote: Réplicas simuladas a la vez; acota la memoria usada
+    n_bins: Resolución del histograma usado para los cuantiles
+    semilla: Semilla del generador (np.random.default_rng)
+    ruta_trayectorias: Si se indica, las trayectorias de todas las réplicas se guardan
+        ahí por lotes como `pava.almacen.Ensamble` (float32, con la cantidad de eventos
+        de cada réplica en el parámetro 'eventos')
+
+    Devuelve un diccionario con 'tiempo', 'media', 'varianza', 'desvio',
+    'cuantiles' (forma (len(cuantiles), n_ticks)), 'n_replicas' y 'eventos_por_replica'.
+    """
+    rng = np.random.default_rng(semilla)
+    tiempo = np.arange(0, tiempo_total + 1)
+
+    # Cotas exactas para el histograma: con menor ambiente el fluido siempre está más frío,
+    # así que toda réplica queda entre la trayectoria sin eventos y la de descenso máximo permanente
+    extremos = integrar_por_tick(
+        np.array([[temp_ambiente_base - descenso[1]], [temp_ambiente_base]]) * np.ones(len(tiempo)),
+        temp_inicial, potencia, perdida_calor, masa, calor_especifico,
+    )
+    minimo, maximo = extremos[0].min(), extremos[1].max()
+    estadisticas = EstadisticasPorTick(len(tiempo), minimo, maximo + 1e-9, n_bins)
+
+    escritor = None
+    if ruta_trayectorias is not None:
+        escritor = EscritorEnsamble(ruta_trayectorias, tiempo, n_replicas, parametros=('eventos',))
+
+    total_eventos = 0
+    for inicio_lote in range(0, n_replicas, tamano_lote):
+        n_lote = min(tamano_lote, n_replicas - inicio_lote)
+        inicios, duraciones, descensos = sortear_eventos(
+            n_lote, tiempo_total, rng, probabilidad, descenso, duracion)
+        total_eventos += int((duraciones > 0).sum())
+
+        temp_ambiente = temperaturas_ambiente(tiempo, inicios, duraciones, descensos, temp_ambiente_base)
+        trayectorias = integrar_por_tick(temp_ambiente, temp_inicial, potencia, perdida_calor, masa, calor_especifico)
+        estadisticas.agregar(trayectorias)
+        if escritor is not None:
+            escritor.agregar(trayectorias, eventos=(duraciones > 0).sum(axis=1))
+
+    if escritor is not None:
+        escritor.cerrar()
+
+    return {
+        'tiempo': tiempo,
+        'media': estadisticas.media,
+        'varianza': estadisticas.varianza,
+        'desvio': np.sqrt(estadisticas.varianza),
+        'cuantiles': estadisticas.cuantiles(cuantiles),
+        'n_replicas': n_replicas,
+        'eventos_por_replica': total_eventos / n_replicas,
+    }
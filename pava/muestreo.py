@@ -0,0 +1,139 @@
+"""
+Muestreo de las fuentes de incertidumbre: cuasi-Monte Carlo, hipercubo latino y distribuciones truncadas.
+
+Con muestras pseudoaleatorias el error de una media baja como 1/√n. Los
+diseños que cubren el espacio en forma pareja bajan más rápido:
+
+- 'lhs': hipercubo latino, un punto por estrato en cada eje.
+- 'sobol' y 'halton': secuencias de baja discrepancia aleatorizadas (scrambled),
+  con error cercano a 1/n para salidas suaves.
+- 'aleatorio': muestreo pseudoaleatorio común, como referencia.
+
+Todos generan puntos uniformes en [0, 1)^d que se llevan a cada distribución con
+su inversa (`ppf`). Así una normal truncada (por ejemplo la tensión, que no puede
+ser negativa) se muestrea exactamente, sin descartar valores ni sesgar la muestra.
+
+Como los diseños aleatorizados son independientes entre sí, el error de un
+estimador se mide repitiendo el diseño con distintas semillas: `convergencia`
+reporta el semiancho del intervalo de confianza en función de n y
+`estimar_hasta_precision` duplica n hasta alcanzar la precisión pedida.
+"""
+
+import numpy as np
+from scipy import stats
+from scipy.stats import qmc
+
+METODOS = ('aleatorio', 'lhs', 'sobol', 'halton')
+
+
+def uniforme(minimo, maximo):
+    """Distribución uniforme en [minimo, maximo]."""
+    return stats.uniform(minimo, maximo - minimo)
+
+
+def normal_truncada(media, desvio, minimo=-np.inf, maximo=np.inf):
+    """Distribución normal(media, desvio) restringida a [minimo, maximo]."""
+    return stats.truncnorm((minimo - media) / desvio, (maximo - media) / desvio, loc=media, scale=desvio)
+
+
+def puntos_uniformes(n, d, metodo='sobol', semilla=None):
+    """
+    n puntos en [0, 1)^d con el método pedido.
+
+    Para 'sobol' se genera la potencia de 2 siguiente y se toman los primeros n
+    puntos, así que conviene pedir potencias de 2.
+    """
+    rng = np.random.default_rng(semilla)
+    if metodo == 'aleatorio':
+        return rng.random((n, d))
+    if metodo == 'lhs':
+        return qmc.LatinHypercube(d, seed=rng).random(n)
+    if metodo == 'sobol':
+        m = int(np.ceil(np.log2(max(n, 2))))
+        return qmc.Sobol(d, scramble=True, seed=rng).random_base2(m)[:n]
+    if metodo == 'halton':
+        return qmc.Halton(d, scramble=True, seed=rng).random(n)
+    raise ValueError(f"Método de muestreo desconocido: {metodo!r} (opciones: {', '.join(METODOS)})")
+
+
+def muestrear(distribuciones, n, metodo='sobol', semilla=None):
+    """
+    Muestra conjunta de entradas independientes.
+
+    distribuciones: Diccionario {entrada: distribución con `ppf`}
+    n: Cantidad de muestras
+    metodo: Uno de `METODOS`
+
+    Devuelve un diccionario {entrada: array de n valores}.
+    """
+    puntos = puntos_uniformes(n, len(distribuciones), metodo, semilla)
+    return {entrada: distribucion.ppf(puntos[:, j]) for j, (entrada, distribucion) in enumerate(distribuciones.items())}
+
+
+def _estimaciones(modelo, distribuciones, n, metodo, repeticiones, estadistico, rng):
+    """Estadístico de la salida en `repeticiones` diseños independientes de tamaño n."""
+    semillas = rng.integers(0, 2**63, repeticiones)
+    return np.array([estadistico(modelo(**muestrear(distribuciones, n, metodo, s))) for s in semillas])
+
+
+def _semiancho(estimaciones, confianza):
+    """Semiancho del intervalo t de Student para la media de las estimaciones."""
+    r = len(estimaciones)
+    return stats.t.ppf(0.5 + confianza / 2, r - 1) * np.std(estimaciones, ddof=1) / np.sqrt(r)
+
+
+def convergencia(modelo, distribuciones, tamanos, metodos=METODOS, estadistico=np.mean, repeticiones=16,
+                 confianza=0.95, semilla=None):
+    """
+    Precisión del estimador en función del tamaño de muestra, para cada método.
+
+    modelo: Función vectorizada que recibe un array por entrada (argumentos con nombre)
+    tamanos: Tamaños de muestra a probar
+    estadistico: Función que resume la salida del modelo (por defecto, la media)
+    repeticiones: Diseños independientes por tamaño, para estimar el error
+
+    Devuelve un diccionario {metodo: {'tamanos', 'estimacion', 'semiancho'}}, donde
+    'estimacion' es el promedio de las repeticiones y 'semiancho' el del intervalo de
+    confianza de una sola corrida de tamaño n (no del promedio).
+    """
+    rng = np.random.default_rng(semilla)
+    resultados = {}
+    for metodo in metodos:
+        estimacion, semiancho = [], []
+        for n in tamanos:
+            valores = _estimaciones(modelo, distribuciones, n, metodo, repeticiones, estadistico, rng)
+            estimacion.append(valores.mean())
+            semiancho.append(_semiancho(valores, confianza) * np.sqrt(repeticiones))
+        resultados[metodo] = {
+            'tamanos': np.asarray(tamanos),
+            'estimacion': np.array(estimacion),
+            'semiancho': np.array(semiancho),
+        }
+    return resultados
+
+
+def estimar_hasta_precision(modelo, distribuciones, tolerancia, metodo='sobol', estadistico=np.mean,
+                            repeticiones=8, n_inicial=64, n_maximo=2**20, confianza=0.95, semilla=None):
+    """
+    Duplica el tamaño de muestra hasta que el intervalo de confianza tenga semiancho <= tolerancia.
+
+    El estimador es el promedio de `repeticiones` diseños independientes de tamaño n,
+    así que el costo es repeticiones·n evaluaciones del modelo.
+
+    Devuelve un diccionario con 'estimacion', 'semiancho', 'n', 'evaluaciones' y
+    'alcanzada' (False si se llegó a n_maximo sin la precisión pedida).
+    """
+    rng = np.random.default_rng(semilla)
+    n = n_inicial
+    while True:
+        valores = _estimaciones(modelo, distribuciones, n, metodo, repeticiones, estadistico, rng)
+        semiancho = _semiancho(valores, confianza)
+        if semiancho <= tolerancia or n >= n_maximo:
+            return {
+                'estimacion': valores.mean(),
+                'semiancho': semiancho,
+                'n': n,
+                'evaluaciones': n * repeticiones,
+                'alcanzada': bool(semiancho <= tolerancia),
+            }
+        n *= 2
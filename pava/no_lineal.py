@@ -0,0 +1,238 @@
+"""
+Modelo no lineal del calentador con propiedades dependientes de la temperatura.
+
+El modelo lineal de los TPs toma como constantes la resistencia de NICROM, el
+calor específico del agua y el coeficiente de pérdidas, y supone que la cara
+exterior del aislante está a la temperatura ambiente. Acá:
+
+- La resistencia varía con la temperatura: R(T) = R0·(1 + α·(T - Tref)).
+- El calor específico cp(T) y la densidad ρ(T) del agua salen de tablas de
+  propiedades (0-100°C). La masa se fija con la densidad a la temperatura de
+  llenado (temp_inicial) y se conserva durante el calentamiento.
+- Las pérdidas combinan conducción a través del aislante con convección natural
+  (h = 1,42·(ΔT/L)^(1/4), aire en una pared vertical) y radiación (ε·σ·(Ts⁴ - Ta⁴))
+  desde la cara exterior, cuya temperatura Ts resulta del balance
+
+      k·(T - Ts) = A_ext·[h·(Ts - Ta) + ε·σ·(Ts⁴ - Ta⁴)]
+
+Nada de esto se evalúa con fórmulas en cada paso. `tablas_no_lineales` arma una
+vez tablas sobre grillas uniformes: factor de potencia, cp y ρ en función de T, y
+la pérdida Q(T, Ta) resolviendo el balance de la superficie en toda la grilla. En
+cada paso la búsqueda en una grilla uniforme es aritmética, sin `searchsorted`, y
+las tres tablas de T comparten la celda. Fuera del rango de las tablas se usa el
+valor del borde.
+
+`simular_no_lineal` integra el ensamble con `rk4_lote`, un Runge-Kutta explícito
+de orden 4 que avanza todos los escenarios juntos, como `simular_ensamble`.
+"""
+
+import numpy as np
+
+ALFA_NICROM = 0.0004          # Coeficiente de temperatura de la resistencia (1/K)
+TEMP_REFERENCIA = 20.0        # Temperatura a la que se mide R0 (°C)
+EMISIVIDAD = 0.9              # Emisividad de la cara exterior del aislante
+STEFAN_BOLTZMANN = 5.670374e-8  # W/(m²·K⁴)
+CERO_ABSOLUTO = 273.15
+
+# Propiedades del agua líquida a presión atmosférica
+TABLA_AGUA_TEMPERATURA = np.array([0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100], dtype=float)  # °C
+TABLA_AGUA_CALOR_ESPECIFICO = np.array(
+    [4217, 4192, 4182, 4178, 4179, 4181, 4184, 4190, 4196, 4205, 4216], dtype=float)  # J/(kg·K)
+TABLA_AGUA_DENSIDAD = np.array(
+    [999.84, 999.70, 998.21, 995.65, 992.22, 988.03, 983.20, 977.76, 971.80, 965.31, 958.35]) / 1000  # kg/L
+
+
+class TablaUniforme:
+    """
+    Tabla de una función sobre una grilla uniforme, con interpolación lineal.
+
+    inicio, paso: Primer punto y separación de la grilla en cada eje
+    valores: Valores de la función en la grilla (1 o 2 dimensiones)
+    """
+
+    def __init__(self, inicio, paso, valores):
+        self.valores = np.asarray(valores, dtype=float)
+        self.inicio = np.broadcast_to(np.asarray(inicio, dtype=float), (self.valores.ndim,))
+        self.paso = np.broadcast_to(np.asarray(paso, dtype=float), (self.valores.ndim,))
+
+    @classmethod
+    def desde_funcion(cls, funcion, limites, pasos):
+        """Tabula `funcion` (vectorizada) en la grilla [mínimo, máximo] de cada eje."""
+        ejes = [np.arange(minimo, maximo + paso / 2, paso) for (minimo, maximo), paso in zip(limites, pasos)]
+        return cls([e[0] for e in ejes], pasos, funcion(*np.meshgrid(*ejes, indexing='ij')))
+
+    def _ubicar(self, x, eje):
+        """Índice de la celda y fracción dentro de ella, con los valores recortados al rango."""
+        posicion = np.clip((x - self.inicio[eje]) / self.paso[eje], 0, self.valores.shape[eje] - 1)
+        indice = np.minimum(posicion.astype(np.intp), self.valores.shape[eje] - 2)
+        return indice, posicion - indice
+
+    def __call__(self, *x):
+        if len(x) == 1:
+            i, f = self._ubicar(np.asarray(x[0]), 0)
+            v = self.valores
+            return v[i] + f * (v[i + 1] - v[i])
+        i, fi = self._ubicar(np.asarray(x[0]), 0)
+        j, fj = self._ubicar(np.asarray(x[1]), 1)
+        v = self.valores
+        abajo = v[i, j] + fj * (v[i, j + 1] - v[i, j])
+        arriba = v[i + 1, j] + fj * (v[i + 1, j + 1] - v[i + 1, j])
+        return abajo + fi * (arriba - abajo)
+
+
+def area_exterior(calentador):
+    """Superficie de la cara exterior del aislante (m²)."""
+    radio = calentador.radio_m + calentador.espesor_m
+    altura = calentador.altura_m + 2 * calentador.espesor_m
+    return 2 * np.pi * radio * altura + 2 * np.pi * radio**2
+
+
+def perdidas_superficie(temperatura, temp_ambiente, calentador, emisividad=EMISIVIDAD, conveccion=True,
+                        iteraciones=60):
+    """
+    Potencia perdida (W) con conducción por el aislante en serie con convección y radiación.
+
+    Resuelve la temperatura de la cara exterior por bisección entre Ta y T (el balance
+    es monótono en Ts). Sin convección ni radiación, la cara exterior queda a la
+    temperatura ambiente y se recupera el modelo lineal k·(T - Ta).
+    """
+    temperatura, temp_ambiente = np.broadcast_arrays(np.asarray(temperatura, dtype=float),
+                                                     np.asarray(temp_ambiente, dtype=float))
+    k = calentador.perdida_calor
+    if not conveccion and emisividad == 0:
+        return k * (temperatura - temp_ambiente)
+
+    area = area_exterior(calentador)
+    longitud = calentador.altura_m + 2 * calentador.espesor_m
+    ta_k = temp_ambiente + CERO_ABSOLUTO
+
+    def exceso(ts):
+        """Calor que llega a la superficie menos el que sale de ella."""
+        dt = ts - temp_ambiente
+        h = 1.42 * (np.abs(dt) / longitud)**0.25 if conveccion else 0.0
+        salida = area * (h * dt + emisividad * STEFAN_BOLTZMANN * ((ts + CERO_ABSOLUTO)**4 - ta_k**4))
+        return k * (temperatura - ts) - salida
+
+    bajo, alto = np.minimum(temperatura, temp_ambiente), np.maximum(temperatura, temp_ambiente)
+    for _ in range(iteraciones):
+        medio = (bajo + alto) / 2
+        positivo = exceso(medio) > 0
+        bajo, alto = np.where(positivo, medio, bajo), np.where(positivo, alto, medio)
+    return k * (temperatura - (bajo + alto) / 2)
+
+
+def tablas_no_lineales(calentador, alfa=ALFA_NICROM, temp_referencia=TEMP_REFERENCIA, emisividad=EMISIVIDAD,
+                       conveccion=True, rango_temperatura=(-50.0, 300.0), rango_ambiente=(-50.0, 100.0),
+                       paso_temperatura=0.5, paso_ambiente=1.0):
+    """
+    Tablas de propiedades del modelo no lineal para un calentador.
+
+    La geometría y el aislante del calentador tienen que ser escalares (definen la tabla de
+    pérdidas); la tensión, la resistencia y las temperaturas pueden variar por escenario.
+
+    Devuelve un diccionario de `TablaUniforme`:
+        factor_potencia(T): R0/R(T), la potencia es V²/R0 por este factor
+        calor_especifico(T): cp del agua (J/(kg·K))
+        densidad(T): Densidad del agua (kg/L)
+        perdidas(T, Ta): Potencia perdida hacia el ambiente (W)
+    """
+    limites_t, limites_a = [rango_temperatura], [rango_temperatura, rango_ambiente]
+    return {
+        'factor_potencia': TablaUniforme.desde_funcion(
+            lambda t: 1 / (1 + alfa * (t - temp_referencia)), limites_t, [paso_temperatura]),
+        'calor_especifico': TablaUniforme.desde_funcion(
+            lambda t: np.interp(t, TABLA_AGUA_TEMPERATURA, TABLA_AGUA_CALOR_ESPECIFICO), limites_t, [paso_temperatura]),
+        'densidad': TablaUniforme.desde_funcion(
+            lambda t: np.interp(t, TABLA_AGUA_TEMPERATURA, TABLA_AGUA_DENSIDAD), limites_t, [paso_temperatura]),
+        'perdidas': TablaUniforme.desde_funcion(
+            lambda t, ta: perdidas_superficie(t, ta, calentador, emisividad, conveccion),
+            limites_a, [paso_temperatura, paso_ambiente]),
+    }
+
+
+def rk4_lote(derivada, estado_inicial, tiempo, subpasos=1, dtype=np.float64):
+    """
+    Runge-Kutta clásico de orden 4 sobre un lote de escenarios.
+
+    derivada: Función f(estado) -> d(estado)/dt, vectorizada sobre el lote (sistema autónomo)
+    estado_inicial: Array con el estado de cada escenario
+    tiempo: Grilla de salida (s); entre dos instantes se dan `subpasos` pasos iguales
+
+    Devuelve un array de forma estado_inicial.shape + (n_tiempos,).
+    """
+    tiempo = np.asarray(tiempo, dtype=float)
+    estado = np.array(estado_inicial, dtype=float)
+    resultado = np.empty(tiempo.shape + estado.shape, dtype=dtype)
+    resultado[0] = estado
+
+    for i, intervalo in enumerate(np.diff(tiempo), start=1):
+        h = intervalo / subpasos
+        for _ in range(subpasos):
+            k1 = derivada(estado)
+            k2 = derivada(estado + h / 2 * k1)
+            k3 = derivada(estado + h / 2 * k2)
+            k4 = derivada(estado + h * k3)
+            estado += h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+        resultado[i] = estado
+
+    return np.moveaxis(resultado, 0, -1)
+
+
+def simular_no_lineal(tiempo, calentador, temp_inicial, temp_ambiente, tablas=None, subpasos=1, dtype=np.float64):
+    """
+    Simula un ensamble de curvas de calentamiento con el modelo no lineal.
+
+    tiempo: Grilla de tiempos (s)
+    calentador: `pava.modelo.Calentador`; la tensión y la resistencia (R0 a Tref) pueden ser arrays
+    temp_inicial: Temperatura inicial y de llenado del agua (°C)
+    temp_ambiente: Temperatura ambiente (°C)
+    tablas: Resultado de `tablas_no_lineales` (por defecto se arman para `calentador`)
+    subpasos: Pasos de Runge-Kutta entre dos instantes de `tiempo`
+
+    Los parámetros se combinan por broadcasting y cada elemento es un escenario.
+    Devuelve un array de forma (n_escenarios..., n_tiempos), como `simular_ensamble`.
+    """
+    if tablas is None:
+        tablas = tablas_no_lineales(calentador)
+    voltaje, resistencia, temp_inicial, temp_ambiente = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (calentador.voltaje, calentador.resistencia, temp_inicial, temp_ambiente)))
+
+    # Coeficientes fijos de cada escenario
+    potencia_nominal = voltaje**2 / resistencia
+    volumen = calentador.capacidad if calentador.volumen_agua is None else calentador.volumen_agua
+    masa = volumen * tablas['densidad'](temp_inicial)
+
+    # Las tablas de T comparten grilla: en cada evaluación la celda de T se ubica una sola vez.
+    # La celda de Ta no cambia durante la simulación, así que se ubica antes de empezar.
+    factor_potencia, calor_especifico, perdidas = (
+        tablas['factor_potencia'], tablas['calor_especifico'], tablas['perdidas'])
+    n_t, n_a = perdidas.valores.shape
+    for tabla in (factor_potencia, calor_especifico):
+        if (len(tabla.valores) != n_t or tabla.inicio[0] != perdidas.inicio[0]
+                or tabla.paso[0] != perdidas.paso[0]):
+            raise ValueError("Las tablas de propiedades deben usar la misma grilla de temperaturas")
+    inicio, paso = perdidas.inicio[0], perdidas.paso[0]
+    tabla_potencia = factor_potencia.valores
+    tabla_inversa_cp = 1 / calor_especifico.valores
+    tabla_perdidas = perdidas.valores.ravel()
+    columna, fraccion_ambiente = perdidas._ubicar(temp_ambiente, 1)
+
+    def derivada(temperatura):
+        posicion = np.clip((temperatura - inicio) / paso, 0, n_t - 1)
+        fila = np.minimum(posicion.astype(np.intp), n_t - 2)
+        f = posicion - fila
+
+        # Pérdidas: interpolación bilineal en la tabla aplanada
+        k = fila * n_a + columna
+        q_abajo = tabla_perdidas[k]
+        q_abajo += fraccion_ambiente * (tabla_perdidas[k + 1] - q_abajo)
+        q_arriba = tabla_perdidas[k + n_a]
+        q_arriba += fraccion_ambiente * (tabla_perdidas[k + n_a + 1] - q_arriba)
+        q_abajo += f * (q_arriba - q_abajo)
+
+        a = tabla_potencia[fila]
+        potencia = potencia_nominal * (a + f * (tabla_potencia[fila + 1] - a))
+        b = tabla_inversa_cp[fila]
+        return (potencia - q_abajo) * (b + f * (tabla_inversa_cp[fila + 1] - b)) / masa
+
+    return rk4_lote(derivada, temp_inicial, tiempo, subpasos, dtype)
@@ -0,0 +1,178 @@
+"""
+Optimización del diseño del calentador (resistencia, aislante y geometría).
+
+Busca el diseño que llega a la temperatura objetivo dentro del tiempo deseado
+con la menor corriente y la menor energía, a tensión fija. Cada diseño se evalúa
+con la solución exacta de `pava.analitico` sobre un `Calentador` con campos
+vectoriales, así que evaluar miles de diseños es una sola operación de NumPy.
+
+La búsqueda tiene dos etapas:
+
+1. Una grilla gruesa sobre todo el espacio de diseño, evaluada de una vez.
+2. Un refinamiento local (búsqueda por patrones) desde los mejores puntos de la
+   grilla: se prueban los vecinos a distancia h en cada eje y, si ninguno mejora,
+   se reduce h a la mitad. Los puntos caen siempre sobre la misma red, así que el
+   objetivo se memoiza y un punto repetido nunca se vuelve a simular.
+"""
+
+import numpy as np
+
+from pava.analitico import tiempo_hasta_objetivo
+from pava.modelo import CALENTADOR_BASE
+
+# Rango de búsqueda de cada variable de diseño (Ω, cm, cm, cm)
+LIMITES = {
+    'resistencia': (0.1, 1.0),
+    'espesor_aislante': (0.1, 3.0),
+    'diametro': (5.0, 15.0),
+    'altura': (8.0, 25.0),
+}
+
+
+def evaluar_disenos(disenos, calentador_base=CALENTADOR_BASE, temp_objetivo=80.0, tiempo_deseado=300.0,
+                    temp_inicial=20.0, temp_ambiente=20.0, capacidad_minima=0.75, pesos=(1.0, 1.0)):
+    """
+    Evalúa un lote de diseños.
+
+    disenos: Diccionario {variable: array} con los valores de cada diseño; las variables
+        que no aparecen se toman de `calentador_base`
+    capacidad_minima: Volumen mínimo de agua (L) que debe calentar el diseño
+    pesos: Peso de la corriente y de la energía en el costo, relativas al diseño base
+
+    Devuelve un diccionario con 'tiempo', 'corriente', 'energia', 'factible' y 'costo'
+    (infinito para los diseños que no cumplen las restricciones).
+    """
+    calentador = calentador_base.variante(**disenos)
+    tiempo = tiempo_hasta_objetivo(
+        temp_objetivo, calentador.resistencia, calentador.voltaje, temp_inicial, temp_ambiente,
+        calentador.masa_agua, calentador.perdida_calor, calentador.calor_especifico,
+    )
+    corriente = calentador.corriente * np.ones_like(tiempo)
+    energia = calentador.potencia * tiempo
+
+    # Referencias para normalizar el costo: el diseño base
+    tiempo_ref = tiempo_hasta_objetivo(
+        temp_objetivo, calentador_base.resistencia, calentador_base.voltaje, temp_inicial, temp_ambiente,
+        calentador_base.masa_agua, calentador_base.perdida_calor, calentador_base.calor_especifico,
+    )
+    corriente_ref = calentador_base.corriente
+    energia_ref = calentador_base.potencia * tiempo_ref
+
+    factible = (tiempo <= tiempo_deseado) & (calentador.capacidad >= capacidad_minima)
+    costo = np.where(factible, pesos[0] * corriente / corriente_ref + pesos[1] * energia / energia_ref, np.inf)
+
+    return {
+        'tiempo': tiempo,
+        'corriente': corriente,
+        'energia': energia,
+        'factible': factible,
+        'costo': costo,
+    }
+
+
+class ObjetivoMemoizado:
+    """
+    Costo de diseños en coordenadas normalizadas [0, 1]^d, con memoria de los puntos ya evaluados.
+
+    Los puntos nuevos de cada llamada se evalúan juntos en un único lote vectorizado.
+    """
+
+    def __init__(self, limites, resolucion=2**-20, **opciones):
+        self.variables = tuple(limites)
+        self.inferior = np.array([limites[v][0] for v in self.variables], dtype=float)
+        self.superior = np.array([limites[v][1] for v in self.variables], dtype=float)
+        self.resolucion = resolucion
+        self.opciones = opciones
+        self.memoria = {}
+        self.evaluaciones = 0
+        self.aciertos = 0
+
+    def a_diseno(self, puntos):
+        """Convierte puntos normalizados (n, d) en un diccionario {variable: array}."""
+        valores = self.inferior + np.asarray(puntos) * (self.superior - self.inferior)
+        return {v: valores[..., j] for j, v in enumerate(self.variables)}
+
+    def __call__(self, puntos):
+        puntos = np.clip(np.atleast_2d(puntos), 0.0, 1.0)
+        claves = [tuple(fila) for fila in np.round(puntos / self.resolucion).astype(np.int64)]
+
+        nuevos = {}
+        for clave, punto in zip(claves, puntos):
+            if clave not in self.memoria and clave not in nuevos:
+                nuevos[clave] = punto
+        self.aciertos += len(claves) - len(nuevos)
+
+        if nuevos:
+            costos = evaluar_disenos(self.a_diseno(np.array(list(nuevos.values()))), **self.opciones)['costo']
+            self.memoria.update(zip(nuevos, costos))
+            self.evaluaciones += len(nuevos)
+
+        return np.array([self.memoria[clave] for clave in claves])
+
+
+def _busqueda_por_patrones(objetivo, inicio, paso, paso_minimo):
+    """Búsqueda por patrones (compass search) desde `inicio` dentro del cubo [0, 1]^d."""
+    actual = np.array(inicio, dtype=float)
+    costo_actual = objetivo(actual)[0]
+    direcciones = np.vstack([np.eye(len(actual)), -np.eye(len(actual))])
+
+    while paso >= paso_minimo:
+        vecinos = np.clip(actual + paso * direcciones, 0.0, 1.0)
+        costos = objetivo(vecinos)
+        mejor = np.argmin(costos)
+        if costos[mejor] < costo_actual:
+            actual, costo_actual = vecinos[mejor], costos[mejor]
+        else:
+            paso /= 2
+    return actual, costo_actual
+
+
+def optimizar_diseno(calentador_base=CALENTADOR_BASE, temp_objetivo=80.0, tiempo_deseado=300.0,
+                     temp_inicial=20.0, temp_ambiente=20.0, capacidad_minima=0.75, pesos=(1.0, 1.0),
+                     limites=None, puntos_grilla=12, candidatos=5, paso_minimo=2**-12):
+    """
+    Busca el mejor diseño con una grilla gruesa seguida de refinamiento local.
+
+    limites: Diccionario {variable: (mínimo, máximo)}; por defecto `LIMITES`
+    puntos_grilla: Puntos por eje de la grilla gruesa (se evalúan puntos_grilla^d diseños)
+    candidatos: Cantidad de mejores puntos de la grilla desde los que se refina
+    paso_minimo: Paso final del refinamiento, como fracción del rango de cada variable
+
+    Devuelve un diccionario con el diseño óptimo ('diseno' y 'calentador'), sus métricas
+    ('tiempo', 'corriente', 'energia', 'costo'), las variables que quedaron en un extremo
+    de su rango ('limites_activos': {variable: valor del extremo}; si no está vacío, ampliar
+    ese rango podría mejorar el diseño) y las estadísticas de la búsqueda ('evaluaciones'
+    y 'aciertos_memoria').
+    """
+    limites = LIMITES if limites is None else limites
+    opciones = dict(calentador_base=calentador_base, temp_objetivo=temp_objetivo, tiempo_deseado=tiempo_deseado,
+                    temp_inicial=temp_inicial, temp_ambiente=temp_ambiente, capacidad_minima=capacidad_minima,
+                    pesos=pesos)
+    objetivo = ObjetivoMemoizado(limites, **opciones)
+
+    # 1. Grilla gruesa, evaluada en un único lote
+    ejes = np.linspace(0.0, 1.0, puntos_grilla)
+    grilla = np.stack(np.meshgrid(*[ejes] * len(objetivo.variables), indexing='ij'), axis=-1)
+    grilla = grilla.reshape(-1, len(objetivo.variables))
+    costos = objetivo(grilla)
+    if not np.isfinite(costos).any():
+        raise ValueError("Ningún diseño de la grilla cumple las restricciones; ampliar los límites")
+
+    # 2. Refinamiento local desde los mejores puntos factibles
+    orden = np.argsort(costos)[:candidatos]
+    paso_inicial = ejes[1] - ejes[0]
+    resultados = [_busqueda_por_patrones(objetivo, grilla[i], paso_inicial, paso_minimo)
+                  for i in orden if np.isfinite(costos[i])]
+    mejor, _ = min(resultados, key=lambda r: r[1])
+
+    diseno = {v: float(x) for v, x in objetivo.a_diseno(mejor).items()}
+    metricas = evaluar_disenos({v: np.array([x]) for v, x in diseno.items()}, **opciones)
+    return {
+        'diseno': diseno,
+        'calentador': calentador_base.variante(**diseno),
+        'limites_activos': {v: float(limites[v][int(x >= 1.0)]) for v, x in zip(objetivo.variables, mejor)
+                            if x <= 0.0 or x >= 1.0},
+        **{clave: float(valor[0]) for clave, valor in metricas.items() if clave != 'factible'},
+        'evaluaciones': objetivo.evaluaciones,
+        'aciertos_memoria': objetivo.aciertos,
+    }
@@ -19,24 +19,30 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+from pava.modelo import Calentador
+from pava.cruces import tiempos_de_cruce
+
 # %% [markdown]
 # ## Parámetros del Calentador
 
 # %%
+# Diseño del calentador (modelo compartido); en el TP1 todavía no consideramos pérdidas
+CALENTADOR = Calentador(voltaje=12.0, resistencia=0.23, volumen_agua=0.75, conductividad_aislante=0.0)
+
 # Definición de parámetros
-VOLTAJE = 12.0                # Voltios (V)
-RESISTENCIA = 0.23            # Ohms (Ω)
-VOLUMEN_AGUA = 0.75           # Litros (L)
-DENSIDAD_AGUA = 1.0           # kg/L
-CALOR_ESPECIFICO_AGUA = 4180  # J/(kg·°C)
+VOLTAJE = CALENTADOR.voltaje                          # Voltios (V)
+RESISTENCIA = CALENTADOR.resistencia                  # Ohms (Ω)
+VOLUMEN_AGUA = CALENTADOR.volumen_agua                # Litros (L)
+DENSIDAD_AGUA = CALENTADOR.densidad_agua              # kg/L
+CALOR_ESPECIFICO_AGUA = CALENTADOR.calor_especifico   # J/(kg·°C)
 TEMP_INICIAL = 20.0           # °C
 TEMP_AMBIENTE = 20.0          # °C
 TEMP_OBJETIVO = 80.0          # °C (para el mate)
 TIEMPO_DESEADO = 300          # segundos (5 minutos)
 
 # Cálculos derivados
-POTENCIA = VOLTAJE**2 / RESISTENCIA   # Watts (W) o Joules/segundo (J/s)
-MASA_AGUA = VOLUMEN_AGUA * DENSIDAD_AGUA  # kg
+POTENCIA = CALENTADOR.potencia     # Watts (W) o Joules/segundo (J/s)
+MASA_AGUA = CALENTADOR.masa_agua    # kg
 ENERGIA_TOTAL_NECESARIA = MASA_AGUA * CALOR_ESPECIFICO_AGUA * (TEMP_OBJETIVO - TEMP_INICIAL)  # Joules
 
 # %% [markdown]
@@ -48,7 +54,7 @@ print(f"--- Parámetros del Calentador ---")
 print(f"Voltaje: {VOLTAJE} V")
 print(f"Resistencia: {RESISTENCIA} Ω")
 print(f"Potencia Calculada: {POTENCIA:.2f} W")
-print(f"Corriente (I = V/R): {VOLTAJE/RESISTENCIA:.2f} A")
+print(f"Corriente (I = V/R): {CALENTADOR.corriente:.2f} A")
 print(f"Volumen de Agua: {VOLUMEN_AGUA} L ({MASA_AGUA} kg)")
 print(f"Temperatura Inicial: {TEMP_INICIAL} °C")
 print(f"Temperatura Objetivo: {TEMP_OBJETIVO} °C")
@@ -70,40 +76,36 @@ temperatura = np.zeros(numero_pasos + 1)
 temperatura[0] = TEMP_INICIAL
 
 # Simulación sin pérdidas de calor
-tiempo_objetivo_alcanzado = -1
-
 for i in range(numero_pasos):
-    # Calcular energía añadida en este paso de tiempo
-    energia_paso = POTENCIA * dt
-    
-    # Calcular aumento de temperatura
-    delta_T = energia_paso / (MASA_AGUA * CALOR_ESPECIFICO_AGUA)
+    # Calcular aumento de temperatura (sin pérdidas: dT/dt = P / (m·c))
+    delta_T = CALENTADOR.derivada(temperatura[i], TEMP_AMBIENTE) * dt
     
     # Actualizar temperatura y tiempo
     temperatura[i+1] = temperatura[i] + delta_T
     tiempo[i+1] = tiempo[i] + dt
-    
-    # Registrar cuándo se alcanza la temperatura objetivo
-    if temperatura[i+1] >= TEMP_OBJETIVO and tiempo_objetivo_alcanzado < 0:
-        tiempo_objetivo_alcanzado = tiempo[i+1]
-        
-    # Detener si la temperatura se dispara (verificación de seguridad)
-    if temperatura[i+1] > 100:
-        print(f"Advertencia: Temperatura > 100°C en t={tiempo[i+1]:.1f}s. Deteniendo simulación.")
-        tiempo = tiempo[:i+2]
-        temperatura = temperatura[:i+2]
-        break
+
+# Instantes exactos (interpolados entre pasos) en que se cruzan el objetivo y el corte de seguridad
+derivadas = CALENTADOR.derivada(temperatura, TEMP_AMBIENTE)
+tiempo_objetivo_alcanzado = tiempos_de_cruce(tiempo, temperatura, TEMP_OBJETIVO, derivadas)
+tiempo_corte_seguridad = tiempos_de_cruce(tiempo, temperatura, 100, derivadas)
+
+# Detener si la temperatura se dispara (verificación de seguridad)
+if np.isfinite(tiempo_corte_seguridad):
+    print(f"Advertencia: Temperatura > 100°C en t={tiempo_corte_seguridad:.1f}s. Deteniendo simulación.")
+    ultimo = np.searchsorted(tiempo, tiempo_corte_seguridad) + 1
+    tiempo = tiempo[:ultimo]
+    temperatura = temperatura[:ultimo]
 
 # %% [markdown]
 # ## Análisis de Resultados
 
 # %%
 # Resultados del primer segundo
-delta_T_1s = POTENCIA * 1.0 / (MASA_AGUA * CALOR_ESPECIFICO_AGUA)
+delta_T_1s = CALENTADOR.derivada(TEMP_INICIAL, TEMP_AMBIENTE) * 1.0
 print(f"\n--- Resultados de la Simulación (sin pérdidas) ---")
 print(f"Aumento de Temperatura en el primer segundo: {delta_T_1s:.4f} °C")
 
-if tiempo_objetivo_alcanzado > 0:
+if np.isfinite(tiempo_objetivo_alcanzado):
     print(f"Tiempo para alcanzar {TEMP_OBJETIVO}°C: {tiempo_objetivo_alcanzado:.1f} s ({tiempo_objetivo_alcanzado/60:.1f} min)")
 else:
     print(f"La temperatura objetivo de {TEMP_OBJETIVO}°C no se alcanzó en {tiempo_total_simulacion/60:.1f} minutos.")
@@ -120,7 +122,7 @@ plt.axhline(y=TEMP_OBJETIVO, color='r', linestyle='--', label=f'Temperatura Obje
 plt.axvline(x=TIEMPO_DESEADO/60, color='g', linestyle='--', label=f'Tiempo Deseado ({TIEMPO_DESEADO/60:.1f} min)')
 
 # Si se alcanzó la temperatura objetivo, marcar el punto
-if tiempo_objetivo_alcanzado > 0:
+if np.isfinite(tiempo_objetivo_alcanzado):
     plt.plot(tiempo_objetivo_alcanzado/60, TEMP_OBJETIVO, 'ro', markersize=8, 
              label=f'Objetivo alcanzado en {tiempo_objetivo_alcanzado/60:.1f} min')
 
@@ -131,11 +133,11 @@ plt.legend()
 plt.grid(True)
 
 # Ajustar límites del gráfico
-if tiempo_objetivo_alcanzado > 0:
+if np.isfinite(tiempo_objetivo_alcanzado):
     plt.xlim(0, (tiempo_objetivo_alcanzado*1.1)/60)  # Mostrar un poco más allá del objetivo
 else:
     plt.xlim(0, tiempo_total_simulacion/60)
     
 plt.ylim(TEMP_INICIAL - 5, TEMP_OBJETIVO + 10)
-plt.savefig('tp1/calentamiento_sin_perdidas.png')  # Guardar gráfico como imagen
+plt.savefig('calentamiento_sin_perdidas.png')  # Guardar gráfico como imagen
 plt.show()
@@ -20,21 +20,26 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+from pava.modelo import Calentador
+from pava.cruces import tiempos_de_cruce
+
 # %% [markdown]
 # ## Parámetros del Calentador
 
 # %%
-# Parámetros iniciales (mantenemos los del TP1)
+# Parámetros iniciales (mantenemos el calentador sin pérdidas del TP1)
+CALENTADOR = Calentador(voltaje=12, resistencia=0.23, volumen_agua=0.75, conductividad_aislante=0.0)
+
 TEMPERATURA_INICIAL = 20  # Temperatura inicial del agua en °C
 TEMPERATURA_AMBIENTE = 20  # Temperatura ambiente en °C
-VOLTAJE = 12  # Voltaje en V
-RESISTENCIA = 0.23  # Resistencia del calentador en ohmios
-CALOR_ESPECIFICO = 4180  # Capacidad calorífica del agua en J/(kg·°C)
-MASA_AGUA = 0.75  # Masa del agua en kg (750 ml)
+VOLTAJE = CALENTADOR.voltaje  # Voltaje en V
+RESISTENCIA = CALENTADOR.resistencia  # Resistencia del calentador en ohmios
+CALOR_ESPECIFICO = CALENTADOR.calor_especifico  # Capacidad calorífica del agua en J/(kg·°C)
+MASA_AGUA = CALENTADOR.masa_agua  # Masa del agua en kg (750 ml)
 TIEMPO_TOTAL = 360  # Tiempo total en segundos (6 minutos)
 
 # Cálculo de la potencia
-POTENCIA = VOLTAJE**2 / RESISTENCIA  # Potencia en Watts
+POTENCIA = CALENTADOR.potencia  # Potencia en Watts
 
 # %% [markdown]
 # ## Resumen de parámetros
@@ -84,11 +89,11 @@ for i, t in enumerate(tiempo):
 # %%
 # Determinar en qué momento se alcanza la temperatura objetivo (80°C)
 temp_objetivo = 80
-if np.max(temperaturas) >= temp_objetivo:
-    # Encontrar el índice del primer valor que supera la temperatura objetivo
-    idx = np.where(temperaturas >= temp_objetivo)[0][0]
-    tiempo_objetivo = tiempo[idx]
-    print(f"\nTemperatura objetivo de {temp_objetivo}°C alcanzada en {tiempo_objetivo} segundos")
+# Instante exacto del cruce, interpolando entre los puntos de la grilla de 5 segundos
+tiempo_objetivo = tiempos_de_cruce(tiempo, temperaturas, temp_objetivo,
+                                   CALENTADOR.derivada(temperaturas, TEMPERATURA_AMBIENTE))
+if np.isfinite(tiempo_objetivo):
+    print(f"\nTemperatura objetivo de {temp_objetivo}°C alcanzada en {tiempo_objetivo:.1f} segundos")
 else:
     print(f"\nNo se alcanzó la temperatura objetivo de {temp_objetivo}°C en el tiempo simulado")
 
@@ -107,9 +112,9 @@ plt.axhline(y=temp_objetivo, color='r', linestyle='--',
             label=f'Temperatura objetivo ({temp_objetivo}°C)')
 
 # Añadir punto donde se alcanza la temperatura objetivo (si se alcanza)
-if np.max(temperaturas) >= temp_objetivo:
+if np.isfinite(tiempo_objetivo):
     plt.plot(tiempo_objetivo, temp_objetivo, 'ro', markersize=10)
-    plt.annotate(f'{tiempo_objetivo} s', 
+    plt.annotate(f'{tiempo_objetivo:.1f} s', 
                  xy=(tiempo_objetivo, temp_objetivo),
                  xytext=(tiempo_objetivo+10, temp_objetivo-5),
                  arrowprops=dict(facecolor='black', shrink=0.05))
@@ -122,7 +127,7 @@ plt.grid(True)
 plt.legend()
 
 # Guardar el gráfico como imagen
-plt.savefig('tp2/curva_calentamiento_sin_perdidas.png')
+plt.savefig('curva_calentamiento_sin_perdidas.png')
 
 # Mostrar el gráfico
 plt.show()
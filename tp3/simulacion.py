@@ -18,32 +18,39 @@
 # %%
 import numpy as np
 import matplotlib.pyplot as plt
-from math import pi
+
+from pava.modelo import Calentador
+from pava.optimizacion import optimizar_diseno
+from pava.estratificado import simular_estratificado
 
 # %% [markdown]
 # ## Parámetros del Calentador
 
 # %%
+# Diseño del calentador (modelo compartido `pava.modelo`)
+CALENTADOR = Calentador(diametro=8.0, altura=15.0, espesor_aislante=0.25, conductividad_aislante=0.04,
+                        voltaje=12.0, resistencia=0.23)
+
 # Parámetros geométricos
-DIAMETRO = 8.0  # cm
-ALTURA = 15.0   # cm
-RADIO = DIAMETRO / 2  # cm
-VOLUMEN = pi * (RADIO**2) * ALTURA  # cm^3
-CAPACIDAD = VOLUMEN / 1000  # litros
+DIAMETRO = CALENTADOR.diametro  # cm
+ALTURA = CALENTADOR.altura   # cm
+RADIO = CALENTADOR.radio  # cm
+VOLUMEN = CALENTADOR.volumen  # cm^3
+CAPACIDAD = CALENTADOR.capacidad  # litros
 
 # Parámetros del aislante
-ESPESOR_AISLANTE = 0.25  # cm
-COEF_CONDUCTIVIDAD_TERMICA = 0.04  # W/(m·K) - Fibra de vidrio
+ESPESOR_AISLANTE = CALENTADOR.espesor_aislante  # cm
+COEF_CONDUCTIVIDAD_TERMICA = CALENTADOR.conductividad_aislante  # W/(m·K) - Fibra de vidrio
 
 # Parámetros eléctricos (del TP1)
-VOLTAJE = 12.0  # V
-RESISTENCIA = 0.23  # Ohms
-POTENCIA = VOLTAJE**2 / RESISTENCIA  # W
+VOLTAJE = CALENTADOR.voltaje  # V
+RESISTENCIA = CALENTADOR.resistencia  # Ohms
+POTENCIA = CALENTADOR.potencia  # W
 
 # Parámetros del fluido
-DENSIDAD_AGUA = 1.0  # kg/L
-MASA_AGUA = CAPACIDAD * DENSIDAD_AGUA  # kg
-CALOR_ESPECIFICO_AGUA = 4180  # J/(kg·°C)
+DENSIDAD_AGUA = CALENTADOR.densidad_agua  # kg/L
+MASA_AGUA = CALENTADOR.masa_agua  # kg
+CALOR_ESPECIFICO_AGUA = CALENTADOR.calor_especifico  # J/(kg·°C)
 TEMP_INICIAL = 20.0  # °C
 TEMP_AMBIENTE = 20.0  # °C
 TEMP_OBJETIVO = 80.0  # °C
@@ -53,17 +60,17 @@ TEMP_OBJETIVO = 80.0  # °C
 
 # %%
 # Conversión a metros para los cálculos
-RADIO_M = RADIO / 100  # m
-ALTURA_M = ALTURA / 100  # m
-ESPESOR_M = ESPESOR_AISLANTE / 100  # m
+RADIO_M = CALENTADOR.radio_m  # m
+ALTURA_M = CALENTADOR.altura_m  # m
+ESPESOR_M = CALENTADOR.espesor_m  # m
 
 # Cálculo de la superficie
-SUP_LATERAL = 2 * pi * RADIO_M * ALTURA_M  # m^2
-SUP_BASES = 2 * pi * RADIO_M**2  # m^2
-SUP_TOTAL = SUP_LATERAL + SUP_BASES  # m^2
+SUP_LATERAL = CALENTADOR.sup_lateral  # m^2
+SUP_BASES = CALENTADOR.sup_bases  # m^2
+SUP_TOTAL = CALENTADOR.sup_total  # m^2
 
 # Cálculo de la pérdida de calor
-PERDIDA_CALOR = COEF_CONDUCTIVIDAD_TERMICA * SUP_TOTAL / ESPESOR_M  # W/K
+PERDIDA_CALOR = CALENTADOR.perdida_calor  # W/K
 
 # Mostrar resultados
 print(f"--- Dimensiones del Calentador ---")
@@ -116,6 +123,77 @@ plt.title('Pérdida de Calor vs Diferencia de Temperatura')
 plt.legend()
 plt.tight_layout()
 
+# %% [markdown]
+# ## Optimización del Diseño
+#
+# La resistencia, el espesor del aislante y las dimensiones del recipiente fueron elegidos a mano.
+# Buscamos ahora el diseño que llega a la temperatura objetivo en 5 minutos a 12 V con la menor corriente
+# y la menor energía, manteniendo al menos 0.75 L de capacidad. La búsqueda evalúa una grilla gruesa de
+# diseños de una sola vez y luego refina localmente los mejores, sin volver a simular puntos repetidos.
+
+# %%
+TIEMPO_DESEADO = 300  # segundos (5 minutos)
+
+optimo = optimizar_diseno(
+    CALENTADOR, temp_objetivo=TEMP_OBJETIVO, tiempo_deseado=TIEMPO_DESEADO,
+    temp_inicial=TEMP_INICIAL, temp_ambiente=TEMP_AMBIENTE, capacidad_minima=0.75
+)
+diseno = optimo['calentador']
+
+print("--- Diseño Óptimo ---")
+print(f"Resistencia: {diseno.resistencia:.3f} Ω (actual {RESISTENCIA} Ω)")
+print(f"Espesor del aislante: {diseno.espesor_aislante:.2f} cm (actual {ESPESOR_AISLANTE} cm)")
+print(f"Diámetro: {diseno.diametro:.2f} cm, Altura: {diseno.altura:.2f} cm (actual {DIAMETRO} x {ALTURA} cm)")
+print(f"Capacidad: {diseno.capacidad:.3f} litros")
+print(f"Pérdida de calor: {diseno.perdida_calor:.3f} W/K (actual {PERDIDA_CALOR:.3f} W/K)")
+print(f"Tiempo hasta {TEMP_OBJETIVO}°C: {optimo['tiempo']:.1f} s")
+print(f"Corriente: {optimo['corriente']:.2f} A, Energía: {optimo['energia']/1000:.1f} kJ")
+print(f"Diseños evaluados: {optimo['evaluaciones']} (puntos repetidos evitados: {optimo['aciertos_memoria']})")
+for variable, limite in optimo['limites_activos'].items():
+    # El óptimo está sobre el borde del rango de búsqueda: la restricción está activa
+    print(f"Restricción activa: {variable} quedó en el límite de su rango de búsqueda ({limite:g})")
+
+# %% [markdown]
+# ## Estratificación del Agua
+#
+# Hasta acá el agua tiene una única temperatura. Dividimos ahora la columna de 15 cm en capas horizontales:
+# la resistencia entrega su potencia sólo en una franja de alturas, el calor pasa entre capas por conducción
+# y cada capa pierde calor por su parte de la pared (y las capas extremas por las bases). Las capas invertidas
+# (agua caliente debajo de agua fría) se mezclan, como lo haría la convección. Usamos Crank-Nicolson con la
+# matriz del sistema factorizada una sola vez, así que una malla fina se simula en una fracción de segundo.
+#
+# El modelo no incluye el cambio de fase: una capa que pasa los 100°C seguiría calentándose como agua líquida.
+# Simulamos 10 minutos para ver cuándo alguna capa llega a la ebullición, pero comparamos los perfiles sólo
+# hasta los 3 minutos, cuando toda la columna sigue por debajo de 100°C en las dos ubicaciones.
+
+# %%
+N_CAPAS = 1000
+tiempo_perfil = np.arange(0, 601, 1.0)  # 10 minutos, paso de 1 s
+instantes = [30, 60, 120, 180]  # Antes de que alguna capa llegue a 100°C
+
+# Resistencia en el fondo vs. resistencia a media altura
+ZONAS = {'Resistencia en el fondo (0-2 cm)': (0.0, 0.02), 'Resistencia a media altura (7-9 cm)': (0.07, 0.09)}
+perfiles = {nombre: simular_estratificado(CALENTADOR, tiempo_perfil, TEMP_INICIAL, TEMP_AMBIENTE,
+                                          n_celdas=N_CAPAS, zona_resistencia=zona)
+            for nombre, zona in ZONAS.items()}
+
+fig, ejes = plt.subplots(1, len(ZONAS), figsize=(12, 6), sharey=True)
+for ax, (nombre, perfil) in zip(ejes, perfiles.items()):
+    for t in instantes:
+        ax.plot(perfil['temperaturas'][:, t], perfil['z'] * 100, label=f't = {t} s')
+    ax.set_title(nombre)
+    ax.set_xlabel('Temperatura (°C)')
+    ax.grid(True)
+    ax.legend()
+ejes[0].set_ylabel('Altura (cm)')
+plt.tight_layout()
+
+for nombre, perfil in perfiles.items():
+    final = perfil['temperaturas'][:, instantes[-1]]
+    print(f"{nombre} a los {instantes[-1]} s: media {perfil['media'][instantes[-1]]:.1f}°C, "
+          f"fondo {final[0]:.1f}°C, superficie {final[-1]:.1f}°C; "
+          f"primera capa a 100°C a los {perfil['ebullicion']:.0f} s")
+
 # %% [markdown]
 # ## Conclusiones
 # 
@@ -124,5 +202,10 @@ plt.tight_layout()
 # 1. A mayor diferencia entre la temperatura del agua y la temperatura ambiente, mayor será la pérdida de calor.
 # 2. En el peor caso (diferencia de 60°C), la pérdida representa aproximadamente el 7.4% de la potencia disponible.
 # 3. Estas pérdidas afectarán el tiempo total necesario para calentar el agua hasta la temperatura objetivo.
+# 4. La ubicación de la resistencia importa: en el fondo la convección mezcla toda la columna y el modelo de una sola
+#    temperatura es adecuado; a media altura el agua de abajo queda fría y la de arriba se calienta mucho más rápido,
+#    así que la superficie llega a 100°C en menos de 4 minutos, casi en la mitad del tiempo que con la resistencia en
+#    el fondo. Como el modelo estratificado no tiene cambio de fase, a partir de ese instante sus perfiles dejan de
+#    ser válidos; las comparaciones de arriba se hacen antes.
 # 
 # En el TP4, incorporaremos estas pérdidas de calor en nuestra simulación para obtener un modelo más realista del comportamiento del calentador.
@@ -16,42 +16,52 @@
 # En este notebook, graficaremos la temperatura del fluido dentro del calentador sin pérdidas y con pérdidas para cada tick de tiempo, hasta llegar a la temperatura objetivo.
 #
 # Además, añadiremos un tercer escenario donde a los 50 segundos se agregan 4 cubitos de hielo de 10 gramos cada uno.
+#
+# Por último, comparamos ese escenario con un modelo físico de fusión, donde el hielo se derrite de a poco
+# según el calor que recibe del agua, integrado con paso adaptativo.
 
 # %%
 import numpy as np
 import matplotlib.pyplot as plt
-from math import pi
+
+from pava.modelo import Calentador
+from pava.hielo import simular_con_hielo, COEF_CONVECCION_HIELO
 
 # %% [markdown]
 # ## Parámetros del Calentador
 
 # %%
+# Calentador diseñado en el TP3 (modelo compartido `pava.modelo`)
+CALENTADOR = Calentador(diametro=8.0, altura=15.0, espesor_aislante=0.25, conductividad_aislante=0.04,
+                        voltaje=12.0, resistencia=0.23)
+
 # Parámetros geométricos (del TP3)
-DIAMETRO = 8.0  # cm
-ALTURA = 15.0   # cm
-RADIO = DIAMETRO / 2  # cm
-VOLUMEN = pi * (RADIO**2) * ALTURA  # cm^3
-CAPACIDAD = VOLUMEN / 1000  # litros
+DIAMETRO = CALENTADOR.diametro  # cm
+ALTURA = CALENTADOR.altura   # cm
+RADIO = CALENTADOR.radio  # cm
+VOLUMEN = CALENTADOR.volumen  # cm^3
+CAPACIDAD = CALENTADOR.capacidad  # litros
 
 # Parámetros del aislante (del TP3)
-ESPESOR_AISLANTE = 0.25  # cm
-COEF_CONDUCTIVIDAD_TERMICA = 0.04  # W/(m·K) - Fibra de vidrio
+ESPESOR_AISLANTE = CALENTADOR.espesor_aislante  # cm
+COEF_CONDUCTIVIDAD_TERMICA = CALENTADOR.conductividad_aislante  # W/(m·K) - Fibra de vidrio
 
 # Parámetros eléctricos (del TP1 y TP2)
-VOLTAJE = 12.0  # V
-RESISTENCIA = 0.23  # Ohms
-POTENCIA = VOLTAJE**2 / RESISTENCIA  # W
+VOLTAJE = CALENTADOR.voltaje  # V
+RESISTENCIA = CALENTADOR.resistencia  # Ohms
+POTENCIA = CALENTADOR.potencia  # W
 
 # Parámetros del fluido (del TP2)
-DENSIDAD_AGUA = 1.0  # kg/L
-MASA_AGUA = CAPACIDAD * DENSIDAD_AGUA  # kg
-CALOR_ESPECIFICO_AGUA = 4180  # J/(kg·°C)
+DENSIDAD_AGUA = CALENTADOR.densidad_agua  # kg/L
+MASA_AGUA = CALENTADOR.masa_agua  # kg
+CALOR_ESPECIFICO_AGUA = CALENTADOR.calor_especifico  # J/(kg·°C)
 TEMP_INICIAL = 20.0  # °C
 TEMP_AMBIENTE = 20.0  # °C
 TEMP_OBJETIVO = 80.0  # °C
 
 # Parámetros del hielo
 MASA_HIELO = 0.04  # kg (4 cubitos de 10g cada uno)
+CANTIDAD_CUBOS = 4
 TEMP_HIELO = 0.0  # °C
 CALOR_LATENTE_FUSION = 334000  # J/kg
 TIEMPO_ADICION_HIELO = 50  # segundos
@@ -65,17 +75,17 @@ INTERVALO = 5  # segundos
 
 # %%
 # Conversión a metros para los cálculos
-RADIO_M = RADIO / 100  # m
-ALTURA_M = ALTURA / 100  # m
-ESPESOR_M = ESPESOR_AISLANTE / 100  # m
+RADIO_M = CALENTADOR.radio_m  # m
+ALTURA_M = CALENTADOR.altura_m  # m
+ESPESOR_M = CALENTADOR.espesor_m  # m
 
 # Cálculo de la superficie
-SUP_LATERAL = 2 * pi * RADIO_M * ALTURA_M  # m^2
-SUP_BASES = 2 * pi * RADIO_M**2  # m^2
-SUP_TOTAL = SUP_LATERAL + SUP_BASES  # m^2
+SUP_LATERAL = CALENTADOR.sup_lateral  # m^2
+SUP_BASES = CALENTADOR.sup_bases  # m^2
+SUP_TOTAL = CALENTADOR.sup_total  # m^2
 
 # Cálculo del coeficiente de pérdida de calor
-PERDIDA_CALOR = COEF_CONDUCTIVIDAD_TERMICA * SUP_TOTAL / ESPESOR_M  # W/K
+PERDIDA_CALOR = CALENTADOR.perdida_calor  # W/K
 
 # Mostrar resultados y parámetros
 print("--- Parámetros del Calentador ---")
@@ -125,14 +135,8 @@ for t in np.arange(0, TIEMPO_TOTAL + 1, INTERVALO):
     temperaturas_con_perdidas.append(temperatura_actual)
     
     # Calculamos para el siguiente intervalo
-    # Pérdida de calor proporcional a la diferencia de temperatura
-    perdida_w = PERDIDA_CALOR * (temperatura_actual - TEMP_AMBIENTE)
-    
-    # Potencia efectiva = Potencia total - Pérdidas
-    potencia_efectiva = POTENCIA - perdida_w
-    
-    # Incremento de temperatura en este intervalo
-    delta_t = (potencia_efectiva * INTERVALO) / (MASA_AGUA * CALOR_ESPECIFICO_AGUA)
+    # dT/dt = (Potencia total - Pérdidas) / (m·c), con pérdidas proporcionales a la diferencia de temperatura
+    delta_t = CALENTADOR.derivada(temperatura_actual, TEMP_AMBIENTE) * INTERVALO
     
     # Nueva temperatura
     temperatura_actual = temperatura_actual + delta_t
@@ -144,8 +148,8 @@ for i, t in enumerate(np.arange(0, TIEMPO_TOTAL + 1, INTERVALO)):
     # Guardamos temperatura actual
     temperaturas_con_hielo.append(temperatura_actual)
     
-    # Verificamos si es el momento de agregar el hielo
-    if t == TIEMPO_ADICION_HIELO:
+    # Verificamos si el hielo se agrega durante este intervalo (el instante no tiene que caer en la grilla)
+    if t <= TIEMPO_ADICION_HIELO < t + INTERVALO:
         # Paso 1: Energía para derretir el hielo
         energia_fusion = MASA_HIELO * CALOR_LATENTE_FUSION
         
@@ -186,17 +190,44 @@ temperaturas_sin_perdidas = np.array(temperaturas_sin_perdidas)
 temperaturas_con_perdidas = np.array(temperaturas_con_perdidas)
 temperaturas_con_hielo = np.array(temperaturas_con_hielo)
 
+# %% [markdown]
+# ## Modelo de Fusión con Paso Adaptativo
+#
+# En el escenario anterior el hielo produce una caída instantánea de temperatura en un tick de la grilla.
+# Ahora el hielo es una fase aparte que se derrite a la velocidad que fija el intercambio de calor
+# $Q = h \cdot A \cdot (T - T_{hielo})$ con el agua. El integrador adaptativo achica el paso durante
+# la fusión y lo agranda en el resto, y el instante de adición puede ser cualquier valor real.
+
+# %%
+fusion = simular_con_hielo(
+    CALENTADOR, TEMP_INICIAL, TEMP_AMBIENTE, TIEMPO_TOTAL,
+    [{'tiempo': TIEMPO_ADICION_HIELO, 'masa': MASA_HIELO, 'cubos': CANTIDAD_CUBOS}]
+)
+
+# Evaluamos la solución continua en la grilla de la tabla y en una grilla fina para graficar
+temperaturas_fusion = fusion['evaluar'](tiempo)[0]
+tiempo_fino = np.linspace(0, TIEMPO_TOTAL, 1001)
+temperaturas_fusion_fino, _, masa_hielo_fino = fusion['evaluar'](tiempo_fino)
+
+print("--- Modelo de Fusión ---")
+print(f"Coeficiente de intercambio agua-hielo: {COEF_CONVECCION_HIELO} W/(m²·K)")
+print(f"Pasos del integrador: {len(fusion['pasos'])} (mínimo {fusion['pasos'].min():.3f} s, máximo {fusion['pasos'].max():.1f} s)")
+if fusion['fin_fusion']:
+    print(f"El hielo termina de derretirse en t={fusion['fin_fusion'][0]:.1f}s")
+else:
+    print(f"Hielo sin derretir al final: {fusion['masa_hielo'][-1]*1000:.1f} g")
+
 # %% [markdown]
 # ## Tabla de resultados cada 10 segundos
 
 # %%
 # Imprimir las temperaturas cada 10 segundos
 print("\n--- Resultados de la Simulación ---")
-print("Tiempo (s) | Sin Pérdidas (°C) | Con Pérdidas (°C) | Con Hielo (°C)")
-print("----------|-------------------|-------------------|-------------")
+print("Tiempo (s) | Sin Pérdidas (°C) | Con Pérdidas (°C) | Con Hielo (°C) | Fusión (°C)")
+print("----------|-------------------|-------------------|---------------|------------")
 for i, t in enumerate(tiempo):
     if i % 2 == 0:  # Cada 10 segundos
-        print(f"{t:9d} | {temperaturas_sin_perdidas[i]:17.2f} | {temperaturas_con_perdidas[i]:17.2f} | {temperaturas_con_hielo[i]:13.2f}")
+        print(f"{t:9d} | {temperaturas_sin_perdidas[i]:17.2f} | {temperaturas_con_perdidas[i]:17.2f} | {temperaturas_con_hielo[i]:13.2f} | {temperaturas_fusion[i]:11.2f}")
 
 # %% [markdown]
 # ## Gráfico de la Curva de Calentamiento
@@ -208,18 +239,20 @@ plt.figure(figsize=(12, 8))
 # Gráficos de línea
 plt.plot(tiempo, temperaturas_sin_perdidas, 'b-', marker='o', markersize=4, label='Sin pérdidas')
 plt.plot(tiempo, temperaturas_con_perdidas, 'r--', marker='*', markersize=4, label='Con pérdidas')
-plt.plot(tiempo, temperaturas_con_hielo, 'g-.', marker='s', markersize=4, label='Con hielo a t=50s')
+plt.plot(tiempo, temperaturas_con_hielo, 'g-.', marker='s', markersize=4, label=f'Con hielo a t={TIEMPO_ADICION_HIELO}s')
+plt.plot(tiempo_fino, temperaturas_fusion_fino, 'm-', linewidth=1.5, label='Con hielo (modelo de fusión)')
+plt.plot(fusion['tiempo'], fusion['temperatura'], 'm|', markersize=10, label='Pasos del integrador adaptativo')
 
 # Marcar el punto donde se añade el hielo
-idx_hielo = np.where(tiempo == TIEMPO_ADICION_HIELO)[0][0]
+temp_adicion_hielo = np.interp(TIEMPO_ADICION_HIELO, tiempo, temperaturas_con_hielo)
 plt.axvline(x=TIEMPO_ADICION_HIELO, color='darkgreen', linestyle=':', alpha=0.7)
-plt.scatter([TIEMPO_ADICION_HIELO], [temperaturas_con_hielo[idx_hielo]], color='darkgreen', s=100, 
+plt.scatter([TIEMPO_ADICION_HIELO], [temp_adicion_hielo], color='darkgreen', s=100, 
             zorder=5, label='Adición de hielo')
 
 # Añadir anotación para el hielo
 plt.annotate('4 cubitos de hielo\n(40g total)', 
-             xy=(TIEMPO_ADICION_HIELO, temperaturas_con_hielo[idx_hielo]),
-             xytext=(TIEMPO_ADICION_HIELO+5, temperaturas_con_hielo[idx_hielo]-5),
+             xy=(TIEMPO_ADICION_HIELO, temp_adicion_hielo),
+             xytext=(TIEMPO_ADICION_HIELO+5, temp_adicion_hielo-5),
              arrowprops=dict(facecolor='darkgreen', shrink=0.05, width=1.5),
              bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="darkgreen", alpha=0.8))
 
@@ -250,4 +283,6 @@ plt.show()
 # 
 # 4. Después de la adición del hielo, la tasa de calentamiento es menor debido a la mayor masa de agua.
 # 
-# 5. Esta simulación permite analizar el comportamiento térmico del sistema frente a perturbaciones, como la adición de elementos fríos durante el proceso de calentamiento.
+# 5. Con el modelo de fusión no hay caída: la temperatura del agua sigue subiendo después de agregar el hielo, pero más despacio (en la tabla, de ~2°C cada 10 s a ~1,2-1,3°C cada 10 s), porque parte de la potencia se va en derretir el hielo, que al final de la simulación todavía no se terminó de derretir. El integrador adaptativo concentra los pasos en el cambio de pendiente al agregar el hielo.
+# 
+# 6. Esta simulación permite analizar el comportamiento térmico del sistema frente a perturbaciones, como la adición de elementos fríos durante el proceso de calentamiento.
@@ -25,57 +25,76 @@
 # 5. Simulación que combine todas las familias de curvas anteriores
 
 # %%
+import os
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.ticker import MaxNLocator
-from scipy.integrate import odeint
-from math import pi
 import random
 import matplotlib
+from scipy import stats
+
+from pava.modelo import Calentador
+from pava.ensamble import simular_ensamble
+from pava.analitico import tiempo_hasta_objetivo, comparar_con_euler
+from pava.graficos import dibujar_familia, dibujar_bandas, dibujar_densidad
+from pava.almacen import guardar_ensamble
+from pava.cache import memoizar
+from pava.sensibilidad import indices_sobol
+from pava.no_lineal import simular_no_lineal
+from pava.muestreo import muestrear, uniforme, normal_truncada, convergencia, estimar_hasta_precision
+
+# Los barridos se memoizan en disco: re-ejecutar el notebook sin cambios no vuelve a simular
+simular_ensamble = memoizar(simular_ensamble)
+
 # Configuración para gráficos más estéticos
 matplotlib.style.use('ggplot')
 
-# Configuración para reproducibilidad
-np.random.seed(42)
-random.seed(42)
+# Configuración para reproducibilidad (el ejecutor por lotes puede cambiar la semilla)
+SEMILLA = int(os.environ.get('PAVA_SEMILLA', 42))
+np.random.seed(SEMILLA)
+random.seed(SEMILLA)
 
 # %% [markdown]
 # ## Parámetros Base del Sistema
 
 # %%
+# Calentador diseñado en el TP3 (modelo compartido `pava.modelo`)
+CALENTADOR = Calentador(diametro=8.0, altura=15.0, espesor_aislante=0.25, conductividad_aislante=0.04,
+                        voltaje=12.0, resistencia=0.23)
+
 # Parámetros geométricos (del TP3)
-DIAMETRO = 8.0  # cm
-ALTURA = 15.0   # cm
-RADIO = DIAMETRO / 2  # cm
-VOLUMEN = pi * (RADIO**2) * ALTURA  # cm^3
-CAPACIDAD = VOLUMEN / 1000  # litros
+DIAMETRO = CALENTADOR.diametro  # cm
+ALTURA = CALENTADOR.altura   # cm
+RADIO = CALENTADOR.radio  # cm
+VOLUMEN = CALENTADOR.volumen  # cm^3
+CAPACIDAD = CALENTADOR.capacidad  # litros
 
 # Parámetros del aislante (del TP3)
-ESPESOR_AISLANTE = 0.25  # cm
-COEF_CONDUCTIVIDAD_TERMICA = 0.04  # W/(m·K) - Fibra de vidrio
+ESPESOR_AISLANTE = CALENTADOR.espesor_aislante  # cm
+COEF_CONDUCTIVIDAD_TERMICA = CALENTADOR.conductividad_aislante  # W/(m·K) - Fibra de vidrio
 
 # Conversión a metros para los cálculos
-RADIO_M = RADIO / 100  # m
-ALTURA_M = ALTURA / 100  # m
-ESPESOR_M = ESPESOR_AISLANTE / 100  # m
+RADIO_M = CALENTADOR.radio_m  # m
+ALTURA_M = CALENTADOR.altura_m  # m
+ESPESOR_M = CALENTADOR.espesor_m  # m
 
 # Cálculo de la superficie
-SUP_LATERAL = 2 * pi * RADIO_M * ALTURA_M  # m^2
-SUP_BASES = 2 * pi * RADIO_M**2  # m^2
-SUP_TOTAL = SUP_LATERAL + SUP_BASES  # m^2
+SUP_LATERAL = CALENTADOR.sup_lateral  # m^2
+SUP_BASES = CALENTADOR.sup_bases  # m^2
+SUP_TOTAL = CALENTADOR.sup_total  # m^2
 
 # Cálculo del coeficiente de pérdida de calor
-PERDIDA_CALOR = COEF_CONDUCTIVIDAD_TERMICA * SUP_TOTAL / ESPESOR_M  # W/K
+PERDIDA_CALOR = CALENTADOR.perdida_calor  # W/K
 
 # Parámetros eléctricos (valores base)
-VOLTAJE_BASE = 12.0  # V
-RESISTENCIA_BASE = 0.23  # Ohms
-POTENCIA_BASE = VOLTAJE_BASE**2 / RESISTENCIA_BASE  # W
+VOLTAJE_BASE = CALENTADOR.voltaje  # V
+RESISTENCIA_BASE = CALENTADOR.resistencia  # Ohms
+POTENCIA_BASE = CALENTADOR.potencia  # W
 
 # Parámetros del fluido
-DENSIDAD_AGUA = 1.0  # kg/L
-MASA_AGUA = CAPACIDAD * DENSIDAD_AGUA  # kg
-CALOR_ESPECIFICO_AGUA = 4180  # J/(kg·°C)
+DENSIDAD_AGUA = CALENTADOR.densidad_agua  # kg/L
+MASA_AGUA = CALENTADOR.masa_agua  # kg
+CALOR_ESPECIFICO_AGUA = CALENTADOR.calor_especifico  # J/(kg·°C)
 TEMP_INICIAL_BASE = 20.0  # °C
 TEMP_AMBIENTE_BASE = 20.0  # °C
 TEMP_OBJETIVO = 80.0  # °C
@@ -94,36 +113,17 @@ tiempo = np.arange(0, TIEMPO_TOTAL + 1, INTERVALO)
 # Definimos 5 valores próximos de resistencia (distribución uniforme)
 valores_resistencia = np.linspace(RESISTENCIA_BASE - 0.05, RESISTENCIA_BASE + 0.05, 5)
 
+# Simulamos todas las resistencias juntas con el integrador por lotes
+curvas_resistencia = simular_ensamble(
+    tiempo, valores_resistencia, VOLTAJE_BASE, TEMP_INICIAL_BASE, TEMP_AMBIENTE_BASE,
+    MASA_AGUA, PERDIDA_CALOR, CALOR_ESPECIFICO_AGUA
+)
+
 # Creamos la figura para la familia de curvas
 plt.figure(figsize=(12, 8))
 
-# Simulamos para cada valor de resistencia
-for resistencia in valores_resistencia:
-    # Calculamos la potencia para esta resistencia
-    potencia = VOLTAJE_BASE**2 / resistencia  
-    
-    # Listas para almacenar las temperaturas con pérdidas
-    temperaturas = []
-    
-    # Simulación iterativa con pérdidas
-    temperatura_actual = TEMP_INICIAL_BASE
-    for t in tiempo:
-        # Guardamos temperatura actual
-        temperaturas.append(temperatura_actual)
-        
-        # Calculamos pérdida de calor
-        perdida_w = PERDIDA_CALOR * (temperatura_actual - TEMP_AMBIENTE_BASE)
-        
-        # Potencia efectiva = Potencia total - Pérdidas
-        potencia_efectiva = potencia - perdida_w
-        
-        # Incremento de temperatura en este intervalo
-        delta_t = (potencia_efectiva * INTERVALO) / (MASA_AGUA * CALOR_ESPECIFICO_AGUA)
-        
-        # Nueva temperatura
-        temperatura_actual = temperatura_actual + delta_t
-    
-    # Graficamos
+# Graficamos cada curva de la familia
+for resistencia, temperaturas in zip(valores_resistencia, curvas_resistencia):
     plt.plot(tiempo, temperaturas, label=f"R = {resistencia:.3f} Ω")
 
 # Configuración del gráfico
@@ -139,38 +139,24 @@ plt.show()
 # ## B. Distribución Normal de 5 Temperaturas Iniciales del Agua
 
 # %%
-# Generamos 5 temperaturas iniciales con distribución normal (media 10, desviación estándar 5)
+# Generamos 5 temperaturas iniciales con distribución normal (media 10, desviación estándar 5),
+# con un hipercubo latino para que las 5 muestras cubran la distribución en forma pareja
 MEDIA_TEMP_INICIAL = 10
 SD_TEMP_INICIAL = 5
-temperaturas_iniciales = np.random.normal(MEDIA_TEMP_INICIAL, SD_TEMP_INICIAL, 5)
+DIST_TEMP_INICIAL = stats.norm(MEDIA_TEMP_INICIAL, SD_TEMP_INICIAL)
+temperaturas_iniciales = muestrear({'temp_inicial': DIST_TEMP_INICIAL}, 5, metodo='lhs', semilla=SEMILLA)['temp_inicial']
+
+# Simulamos todas las temperaturas iniciales juntas
+curvas_temp_inicial = simular_ensamble(
+    tiempo, RESISTENCIA_BASE, VOLTAJE_BASE, temperaturas_iniciales, TEMP_AMBIENTE_BASE,
+    MASA_AGUA, PERDIDA_CALOR, CALOR_ESPECIFICO_AGUA
+)
 
 # Creamos la figura para la familia de curvas
 plt.figure(figsize=(12, 8))
 
-# Simulamos para cada temperatura inicial
-for temp_inicial in temperaturas_iniciales:
-    # Listas para almacenar las temperaturas con pérdidas
-    temperaturas = []
-    
-    # Simulación iterativa con pérdidas
-    temperatura_actual = temp_inicial
-    for t in tiempo:
-        # Guardamos temperatura actual
-        temperaturas.append(temperatura_actual)
-        
-        # Calculamos pérdida de calor
-        perdida_w = PERDIDA_CALOR * (temperatura_actual - TEMP_AMBIENTE_BASE)
-        
-        # Potencia efectiva = Potencia total - Pérdidas
-        potencia_efectiva = POTENCIA_BASE - perdida_w
-        
-        # Incremento de temperatura en este intervalo
-        delta_t = (potencia_efectiva * INTERVALO) / (MASA_AGUA * CALOR_ESPECIFICO_AGUA)
-        
-        # Nueva temperatura
-        temperatura_actual = temperatura_actual + delta_t
-    
-    # Graficamos
+# Graficamos cada curva de la familia
+for temp_inicial, temperaturas in zip(temperaturas_iniciales, curvas_temp_inicial):
     plt.plot(tiempo, temperaturas, label=f"T0 = {temp_inicial:.2f}°C")
 
 # Configuración del gráfico
@@ -189,33 +175,17 @@ plt.show()
 # Generamos 8 temperaturas ambiente uniformes entre -20 y 50 grados
 temperaturas_ambiente = np.linspace(-20, 50, 8)
 
+# Simulamos todas las temperaturas ambiente juntas
+curvas_temp_ambiente = simular_ensamble(
+    tiempo, RESISTENCIA_BASE, VOLTAJE_BASE, TEMP_INICIAL_BASE, temperaturas_ambiente,
+    MASA_AGUA, PERDIDA_CALOR, CALOR_ESPECIFICO_AGUA
+)
+
 # Creamos la figura para la familia de curvas
 plt.figure(figsize=(12, 8))
 
-# Simulamos para cada temperatura ambiente
-for temp_ambiente in temperaturas_ambiente:
-    # Listas para almacenar las temperaturas con pérdidas
-    temperaturas = []
-    
-    # Simulación iterativa con pérdidas
-    temperatura_actual = TEMP_INICIAL_BASE
-    for t in tiempo:
-        # Guardamos temperatura actual
-        temperaturas.append(temperatura_actual)
-        
-        # Calculamos pérdida de calor respecto a la temperatura ambiente
-        perdida_w = PERDIDA_CALOR * (temperatura_actual - temp_ambiente)
-        
-        # Potencia efectiva = Potencia total - Pérdidas
-        potencia_efectiva = POTENCIA_BASE - perdida_w
-        
-        # Incremento de temperatura en este intervalo
-        delta_t = (potencia_efectiva * INTERVALO) / (MASA_AGUA * CALOR_ESPECIFICO_AGUA)
-        
-        # Nueva temperatura
-        temperatura_actual = temperatura_actual + delta_t
-    
-    # Graficamos
+# Graficamos cada curva de la familia
+for temp_ambiente, temperaturas in zip(temperaturas_ambiente, curvas_temp_ambiente):
     plt.plot(tiempo, temperaturas, label=f"Tamb = {temp_ambiente:.1f}°C")
 
 # Configuración del gráfico
@@ -231,43 +201,26 @@ plt.show()
 # ## D. Distribución Normal de 5 Valores de Tensión de Alimentación
 
 # %%
-# Generamos 5 tensiones de alimentación con distribución normal (media 12, desviación estándar 4)
+# Generamos 5 tensiones de alimentación con distribución normal (media 12, desviación estándar 4).
+# La tensión no puede ser negativa: usamos la normal truncada en V > 0 en lugar de descartar
+# muestras, que sesgaría la muestra y dejaría menos de 5 curvas
 MEDIA_TENSION = 12
 SD_TENSION = 4
-tensiones = np.random.normal(MEDIA_TENSION, SD_TENSION, 5)
-
-# Función para resolver la ecuación diferencial del calentamiento
-def modelo_calentamiento(T, t, V, R, masa, c_esp, k_perdida, T_amb):
-    # Cálculo de la potencia
-    potencia = V**2 / R
-    
-    # Pérdida de calor
-    perdida = k_perdida * (T - T_amb)
-    
-    # Tasa de cambio de temperatura
-    dTdt = (potencia - perdida) / (masa * c_esp)
-    
-    return dTdt
+DIST_TENSION = normal_truncada(MEDIA_TENSION, SD_TENSION, minimo=0)
+tensiones = muestrear({'voltaje': DIST_TENSION}, 5, metodo='lhs', semilla=SEMILLA)['voltaje']
+
+# Simulamos todas las tensiones juntas
+curvas_tension = simular_ensamble(
+    tiempo, RESISTENCIA_BASE, tensiones, TEMP_INICIAL_BASE, TEMP_AMBIENTE_BASE,
+    MASA_AGUA, PERDIDA_CALOR, CALOR_ESPECIFICO_AGUA
+)
 
 # Creamos la figura para la familia de curvas
 plt.figure(figsize=(12, 8))
 
-# Simulamos para cada tensión de alimentación
-for tension in tensiones:
-    # Aseguramos que la tensión sea positiva (evitamos valores negativos por la distribución normal)
-    if tension <= 0:
-        continue
-        
-    # Resolvemos el modelo con la tensión específica
-    resultado = odeint(
-        modelo_calentamiento, 
-        TEMP_INICIAL_BASE, 
-        tiempo, 
-        args=(tension, RESISTENCIA_BASE, MASA_AGUA, CALOR_ESPECIFICO_AGUA, PERDIDA_CALOR, TEMP_AMBIENTE_BASE)
-    )
-    
-    # Graficamos
-    plt.plot(tiempo, resultado[:, 0], label=f"V = {tension:.2f}V")
+# Graficamos cada curva de la familia
+for tension, temperaturas in zip(tensiones, curvas_tension):
+    plt.plot(tiempo, temperaturas, label=f"V = {tension:.2f}V")
 
 # Configuración del gráfico
 plt.title("D. Calentamiento con Distribución Normal de Tensiones de Alimentación\n(Media 12V, SD 4V)", fontsize=14)
@@ -282,110 +235,43 @@ plt.show()
 # ## E. Simulación con Todas las Familias de Curvas
 
 # %%
+# Armamos un único lote con los parámetros de las cuatro familias
+# (de las temperaturas ambiente mostramos solo una de cada dos para no saturar el gráfico)
+temperaturas_ambiente_e = temperaturas_ambiente[::2]
+n_r, n_t0 = len(valores_resistencia), len(temperaturas_iniciales)
+n_amb, n_v = len(temperaturas_ambiente_e), len(tensiones)
+
+resistencias_e = np.concatenate([valores_resistencia, np.full(n_t0 + n_amb + n_v, RESISTENCIA_BASE)])
+tensiones_e = np.concatenate([np.full(n_r + n_t0 + n_amb, VOLTAJE_BASE), tensiones])
+temp_iniciales_e = np.concatenate([np.full(n_r, TEMP_INICIAL_BASE), temperaturas_iniciales,
+                                   np.full(n_amb + n_v, TEMP_INICIAL_BASE)])
+temp_ambiente_e = np.concatenate([np.full(n_r + n_t0, TEMP_AMBIENTE_BASE), temperaturas_ambiente_e,
+                                  np.full(n_v, TEMP_AMBIENTE_BASE)])
+
+# Una sola llamada al integrador simula todos los escenarios de la figura
+curvas_todas = simular_ensamble(
+    tiempo, resistencias_e, tensiones_e, temp_iniciales_e, temp_ambiente_e,
+    MASA_AGUA, PERDIDA_CALOR, CALOR_ESPECIFICO_AGUA
+)
+
+# Color, tipo de línea y etiquetas de cada familia, en el mismo orden que el lote
+familias = [
+    ('b', '-', [f"R = {r:.3f} Ω" for r in valores_resistencia]),
+    ('r', '--', [f"T0 = {t:.2f}°C" for t in temperaturas_iniciales]),
+    ('g', '-.', [f"Tamb = {t:.1f}°C" for t in temperaturas_ambiente_e]),
+    ('m', ':', [f"V = {v:.2f}V" for v in tensiones]),
+]
+
 # Creamos la figura para todas las curvas
 plt.figure(figsize=(16, 10))
 
-# 1. Valores de resistencia
-for i, resistencia in enumerate(valores_resistencia):
-    # Calculamos la potencia para esta resistencia
-    potencia = VOLTAJE_BASE**2 / resistencia  
-    
-    # Listas para almacenar las temperaturas con pérdidas
-    temperaturas = []
-    
-    # Simulación iterativa con pérdidas
-    temperatura_actual = TEMP_INICIAL_BASE
-    for t in tiempo:
-        # Guardamos temperatura actual
-        temperaturas.append(temperatura_actual)
-        
-        # Calculamos pérdida de calor
-        perdida_w = PERDIDA_CALOR * (temperatura_actual - TEMP_AMBIENTE_BASE)
-        
-        # Potencia efectiva = Potencia total - Pérdidas
-        potencia_efectiva = potencia - perdida_w
-        
-        # Incremento de temperatura en este intervalo
-        delta_t = (potencia_efectiva * INTERVALO) / (MASA_AGUA * CALOR_ESPECIFICO_AGUA)
-        
-        # Nueva temperatura
-        temperatura_actual = temperatura_actual + delta_t
-    
-    # Graficamos con línea continua azul
-    plt.plot(tiempo, temperaturas, 'b-', linewidth=1.5 if i == 0 else 0.8, 
-             label=f"R = {resistencia:.3f} Ω" if i == 0 else None)
-
-# 2. Temperaturas iniciales
-for i, temp_inicial in enumerate(temperaturas_iniciales):
-    # Listas para almacenar las temperaturas con pérdidas
-    temperaturas = []
-    
-    # Simulación iterativa con pérdidas
-    temperatura_actual = temp_inicial
-    for t in tiempo:
-        # Guardamos temperatura actual
-        temperaturas.append(temperatura_actual)
-        
-        # Calculamos pérdida de calor
-        perdida_w = PERDIDA_CALOR * (temperatura_actual - TEMP_AMBIENTE_BASE)
-        
-        # Potencia efectiva = Potencia total - Pérdidas
-        potencia_efectiva = POTENCIA_BASE - perdida_w
-        
-        # Incremento de temperatura en este intervalo
-        delta_t = (potencia_efectiva * INTERVALO) / (MASA_AGUA * CALOR_ESPECIFICO_AGUA)
-        
-        # Nueva temperatura
-        temperatura_actual = temperatura_actual + delta_t
-    
-    # Graficamos con línea punteada roja
-    plt.plot(tiempo, temperaturas, 'r--', linewidth=1.5 if i == 0 else 0.8,
-             label=f"T0 = {temp_inicial:.2f}°C" if i == 0 else None)
-
-# 3. Temperaturas ambiente - mostramos solo algunas para no saturar el gráfico
-for i, temp_ambiente in enumerate(temperaturas_ambiente[::2]):  # Tomamos una de cada dos
-    # Listas para almacenar las temperaturas con pérdidas
-    temperaturas = []
-    
-    # Simulación iterativa con pérdidas
-    temperatura_actual = TEMP_INICIAL_BASE
-    for t in tiempo:
-        # Guardamos temperatura actual
-        temperaturas.append(temperatura_actual)
-        
-        # Calculamos pérdida de calor respecto a la temperatura ambiente
-        perdida_w = PERDIDA_CALOR * (temperatura_actual - temp_ambiente)
-        
-        # Potencia efectiva = Potencia total - Pérdidas
-        potencia_efectiva = POTENCIA_BASE - perdida_w
-        
-        # Incremento de temperatura en este intervalo
-        delta_t = (potencia_efectiva * INTERVALO) / (MASA_AGUA * CALOR_ESPECIFICO_AGUA)
-        
-        # Nueva temperatura
-        temperatura_actual = temperatura_actual + delta_t
-    
-    # Graficamos con línea a trazos verdes
-    plt.plot(tiempo, temperaturas, 'g-.', linewidth=1.5 if i == 0 else 0.8,
-             label=f"Tamb = {temp_ambiente:.1f}°C" if i == 0 else None)
-
-# 4. Tensiones
-for i, tension in enumerate(tensiones):
-    # Aseguramos que la tensión sea positiva
-    if tension <= 0:
-        continue
-        
-    # Resolvemos el modelo con la tensión específica
-    resultado = odeint(
-        modelo_calentamiento, 
-        TEMP_INICIAL_BASE, 
-        tiempo, 
-        args=(tension, RESISTENCIA_BASE, MASA_AGUA, CALOR_ESPECIFICO_AGUA, PERDIDA_CALOR, TEMP_AMBIENTE_BASE)
-    )
-    
-    # Graficamos con línea magenta
-    plt.plot(tiempo, resultado[:, 0], 'm:', linewidth=1.5 if i == 0 else 0.8,
-             label=f"V = {tension:.2f}V" if i == 0 else None)
+# Cada familia es una sola colección de líneas, destacando la primera curva de cada una
+inicio = 0
+for color, linea, etiquetas in familias:
+    cantidad = len(etiquetas)
+    dibujar_familia(plt.gca(), tiempo, curvas_todas[inicio:inicio + cantidad], colores=color, linestyles=linea,
+                    linewidths=[1.5] + [0.8] * (cantidad - 1))
+    inicio += cantidad
 
 # Configuración del gráfico
 plt.title("E. Simulación con Todas las Familias de Curvas", fontsize=16)
@@ -407,6 +293,203 @@ plt.tight_layout()
 plt.savefig('tp5_e_todas_las_curvas.png')
 plt.show()
 
+# %% [markdown]
+# ## F. Tiempo Exacto hasta la Temperatura Objetivo
+#
+# El modelo con pérdidas es lineal, así que tiene solución exacta
+# $T(t) = T_\infty + (T_0 - T_\infty) e^{-t/\tau}$, con $T_\infty = T_{amb} + P/k$ y $\tau = m c / k$.
+# Despejando el logaritmo obtenemos el tiempo para llegar a 80°C en cada escenario sin integrar paso a paso.
+
+# %%
+# Tiempo hasta la temperatura objetivo para cada escenario de la figura E
+tiempos_objetivo = tiempo_hasta_objetivo(
+    TEMP_OBJETIVO, resistencias_e, tensiones_e, temp_iniciales_e, temp_ambiente_e,
+    MASA_AGUA, PERDIDA_CALOR, CALOR_ESPECIFICO_AGUA
+)
+
+print(f"--- Tiempo hasta {TEMP_OBJETIVO}°C (solución exacta) ---")
+inicio = 0
+for _, _, etiquetas in familias:
+    for i, etiqueta in enumerate(etiquetas):
+        t_obj = tiempos_objetivo[inicio + i]
+        if np.isfinite(t_obj):
+            print(f"{etiqueta:>18}: {t_obj:7.1f} s ({t_obj/60:.1f} min)")
+        else:
+            print(f"{etiqueta:>18}: inalcanzable (T∞ < {TEMP_OBJETIVO}°C)")
+    inicio += len(etiquetas)
+
+# Comparación con el paso de Euler de 5 segundos usado en las secciones A-E
+comparacion = comparar_con_euler(
+    resistencias_e, tensiones_e, temp_iniciales_e, temp_ambiente_e,
+    MASA_AGUA, PERDIDA_CALOR, CALOR_ESPECIFICO_AGUA, TIEMPO_TOTAL, INTERVALO
+)
+print(f"\nError máximo de Euler (dt = {INTERVALO} s) frente a la solución exacta: "
+      f"{np.max(comparacion['error_maximo']):.4f}°C")
+
+# %% [markdown]
+# ## G. Familias Masivas de Curvas
+#
+# Combinamos las cuatro distribuciones anteriores en 100.000 escenarios aleatorios,
+# guardados en disco por columnas (`pava.almacen`) para no tenerlos enteros en memoria.
+# Con un `plt.plot` por curva este gráfico tardaría minutos; en cambio cada curva se
+# reduce a 30 puntos con LTTB y toda la familia se dibuja como una sola colección.
+# A la derecha se ve la densidad de curvas con las bandas de percentiles.
+
+# %%
+N_ESCENARIOS_G = 100_000
+
+# Las mismas distribuciones de las secciones A-D, muestreadas juntas con una secuencia de Sobol
+distribuciones = {
+    'resistencia': uniforme(RESISTENCIA_BASE - 0.05, RESISTENCIA_BASE + 0.05),
+    'voltaje': DIST_TENSION,
+    'temp_inicial': DIST_TEMP_INICIAL,
+    'temp_ambiente': uniforme(-20, 50),
+}
+muestras_g = muestrear(distribuciones, N_ESCENARIOS_G, metodo='sobol', semilla=SEMILLA)
+resistencias_g, tensiones_g = muestras_g['resistencia'], muestras_g['voltaje']
+temp_iniciales_g, temp_ambiente_g = muestras_g['temp_inicial'], muestras_g['temp_ambiente']
+
+# El barrido se simula por bloques y se guarda en disco; lo leemos de vuelta con memory maps
+ensamble_g = guardar_ensamble(
+    'tp5_g_ensamble', tiempo, resistencias_g, tensiones_g, temp_iniciales_g, temp_ambiente_g,
+    MASA_AGUA, PERDIDA_CALOR, CALOR_ESPECIFICO_AGUA
+)
+curvas_g = ensamble_g.trayectorias
+
+# Consultas sobre un subconjunto sin cargar el ensamble entero: tensiones altas en el primer minuto
+altas = ensamble_g.filtrar(voltaje=(15, None))
+tiempo_minuto, curvas_minuto = ensamble_g.seleccionar(altas, hasta=60)
+print(f"Escenarios con V >= 15V: {len(altas)} de {len(ensamble_g)}; "
+      f"temperatura media a los {tiempo_minuto[-1]:.0f} s: {curvas_minuto[:, -1].mean():.1f}°C")
+
+fig, (ax_lineas, ax_densidad) = plt.subplots(1, 2, figsize=(18, 8), sharey=True)
+
+dibujar_familia(ax_lineas, tiempo, curvas_g, n_puntos=30, colores='C1', linewidths=0.3, alpha=0.02)
+ax_lineas.set_title(f"{N_ESCENARIOS_G:_} curvas".replace('_', '.') + " (30 puntos por curva, LTTB)", fontsize=14)
+ax_lineas.set_xlabel("Tiempo (segundos)", fontsize=12)
+ax_lineas.set_ylabel("Temperatura (°C)", fontsize=12)
+
+imagen = dibujar_densidad(ax_densidad, tiempo, curvas_g)
+dibujar_bandas(ax_densidad, tiempo, curvas_g, color='white', alpha=0.15)
+fig.colorbar(imagen, ax=ax_densidad, label="Curvas por celda")
+ax_densidad.set_title("Densidad de curvas y percentiles 5-25-75-95", fontsize=14)
+ax_densidad.set_xlabel("Tiempo (segundos)", fontsize=12)
+ax_densidad.legend(loc='upper left')
+
+plt.suptitle("G. Familias Masivas de Curvas", fontsize=16)
+plt.tight_layout()
+plt.savefig('tp5_g_familias_masivas.png')
+plt.show()
+
+# %% [markdown]
+# ## H. Sensibilidad Global: ¿Qué Fuente de Incertidumbre Domina?
+#
+# Las secciones A-D varían una entrada por vez, así que no dicen cuál domina la dispersión
+# del tiempo hasta 80°C cuando todas varían juntas. Los índices de Sobol reparten la varianza
+# de la salida: el de primer orden mide el efecto de cada entrada sola y el total incluye sus
+# interacciones con las demás. Usamos muestreo de Saltelli, N·(d+2) evaluaciones de la solución exacta.
+# Los escenarios que nunca llegan a 80°C se cuentan con el horizonte de una hora.
+
+# %%
+HORIZONTE_H = 3600  # segundos
+N_SALTELLI = 2**17
+
+def tiempo_hasta_80(resistencia, voltaje, temp_inicial, temp_ambiente):
+    tiempos = tiempo_hasta_objetivo(TEMP_OBJETIVO, resistencia, voltaje, temp_inicial, temp_ambiente,
+                                    MASA_AGUA, PERDIDA_CALOR, CALOR_ESPECIFICO_AGUA)
+    return np.minimum(tiempos, HORIZONTE_H)
+
+# Mismas distribuciones que en la sección G
+sobol = indices_sobol(tiempo_hasta_80, distribuciones, n=N_SALTELLI, semilla=SEMILLA)
+
+print(f"--- Índices de Sobol del tiempo hasta {TEMP_OBJETIVO}°C ({sobol['evaluaciones']} evaluaciones) ---")
+print(f"Media: {sobol['media']:.1f} s, desvío: {np.sqrt(sobol['varianza']):.1f} s")
+for j, entrada in enumerate(sobol['entradas']):
+    print(f"{entrada:>14}: S1 = {sobol['primer_orden'][j]:6.3f} {np.round(sobol['ic_primer_orden'][j], 3)}, "
+          f"ST = {sobol['total'][j]:6.3f} {np.round(sobol['ic_total'][j], 3)}")
+
+plt.figure(figsize=(10, 6))
+posiciones = np.arange(len(sobol['entradas']))
+for desplazamiento, clave, etiqueta in [(-0.2, 'primer_orden', 'Primer orden (S1)'), (0.2, 'total', 'Total (ST)')]:
+    valores, ic = sobol[clave], sobol['ic_' + clave]
+    plt.bar(posiciones + desplazamiento, valores, width=0.4, label=etiqueta,
+            yerr=[valores - ic[:, 0], ic[:, 1] - valores], capsize=4)
+plt.xticks(posiciones, ['Resistencia', 'Tensión', 'Temp. inicial', 'Temp. ambiente'])
+plt.ylabel("Fracción de la varianza", fontsize=12)
+plt.title(f"H. Índices de Sobol del Tiempo hasta {TEMP_OBJETIVO}°C", fontsize=14)
+plt.legend(loc='best')
+plt.savefig('tp5_h_sobol.png')
+plt.show()
+
+# %% [markdown]
+# ## I. Convergencia del Muestreo: Pseudoaleatorio, Hipercubo Latino y Cuasi-Monte Carlo
+#
+# ¿Cuántas corridas del modelo hacen falta para conocer el tiempo medio hasta 80°C con una precisión dada?
+# Repetimos cada diseño de muestreo con 16 semillas distintas y medimos el semiancho del intervalo de
+# confianza del 95% en función de n. Con muestras pseudoaleatorias baja como 1/√n; con hipercubo latino
+# y con secuencias de Sobol o Halton baja más rápido, así que la misma precisión sale con muchas menos corridas.
+
+# %%
+TOLERANCIA_I = 1.0  # segundos
+tamanos_i = 2**np.arange(6, 15)
+
+estudio = convergencia(tiempo_hasta_80, distribuciones, tamanos_i, semilla=SEMILLA)
+
+print(f"--- Corridas para estimar el tiempo medio hasta {TEMP_OBJETIVO}°C con ±{TOLERANCIA_I} s (95%) ---")
+for metodo in estudio:
+    precision = estimar_hasta_precision(tiempo_hasta_80, distribuciones, TOLERANCIA_I, metodo=metodo,
+                                        n_maximo=2**22, semilla=SEMILLA)
+    print(f"{metodo:>10}: {precision['estimacion']:7.2f} ± {precision['semiancho']:.2f} s con "
+          f"{precision['evaluaciones']:>8} corridas" + ("" if precision['alcanzada'] else " (sin alcanzar la precisión)"))
+
+plt.figure(figsize=(10, 6))
+for metodo, resultado in estudio.items():
+    plt.loglog(resultado['tamanos'], resultado['semiancho'], 'o-', label=metodo)
+plt.loglog(tamanos_i, estudio['aleatorio']['semiancho'][0] * np.sqrt(tamanos_i[0] / tamanos_i), 'k:',
+           label='Referencia 1/√n')
+plt.xlabel("Tamaño de muestra n", fontsize=12)
+plt.ylabel("Semiancho del IC 95% (s)", fontsize=12)
+plt.title(f"I. Convergencia del Tiempo Medio hasta {TEMP_OBJETIVO}°C", fontsize=14)
+plt.legend(loc='best')
+plt.savefig('tp5_i_convergencia.png')
+plt.show()
+
+# %% [markdown]
+# ## J. Modelo No Lineal: Propiedades que Dependen de la Temperatura
+#
+# Repetimos la familia de temperaturas ambiente de la sección C con el modelo no lineal de
+# `pava.no_lineal`: la resistencia de NICROM aumenta con la temperatura, el calor específico y la
+# densidad del agua salen de tablas, y la pérdida de calor combina la conducción por el aislante con
+# convección natural y radiación desde su cara exterior. Las propiedades se tabulan una sola vez y el
+# ensamble se integra con Runge-Kutta 4 por lotes.
+
+# %%
+curvas_lineal_j = simular_ensamble(
+    tiempo, RESISTENCIA_BASE, VOLTAJE_BASE, TEMP_INICIAL_BASE, temperaturas_ambiente,
+    MASA_AGUA, PERDIDA_CALOR, CALOR_ESPECIFICO_AGUA
+)
+curvas_no_lineal_j = simular_no_lineal(tiempo, CALENTADOR, TEMP_INICIAL_BASE, temperaturas_ambiente)
+
+print(f"--- Temperatura a los {TIEMPO_TOTAL} s: modelo lineal vs. no lineal ---")
+for temp_ambiente, lineal, no_lineal in zip(temperaturas_ambiente, curvas_lineal_j, curvas_no_lineal_j):
+    print(f"Tamb = {temp_ambiente:5.1f}°C: {lineal[-1]:6.1f}°C vs. {no_lineal[-1]:6.1f}°C")
+
+plt.figure(figsize=(12, 8))
+colores_j = plt.cm.coolwarm(np.linspace(0, 1, len(temperaturas_ambiente)))
+for color, temp_ambiente, lineal, no_lineal in zip(colores_j, temperaturas_ambiente,
+                                                    curvas_lineal_j, curvas_no_lineal_j):
+    plt.plot(tiempo, lineal, '--', color=color, linewidth=1)
+    plt.plot(tiempo, no_lineal, '-', color=color, linewidth=1.5, label=f"Tamb = {temp_ambiente:.1f}°C")
+plt.plot([], [], 'k--', label='Modelo lineal')
+plt.plot([], [], 'k-', label='Modelo no lineal')
+
+plt.title("J. Modelo Lineal vs. No Lineal para Distintas Temperaturas Ambiente", fontsize=14)
+plt.xlabel("Tiempo (segundos)", fontsize=12)
+plt.ylabel("Temperatura (°C)", fontsize=12)
+plt.legend(loc='upper left', fontsize=9)
+plt.savefig('tp5_j_no_lineal.png')
+plt.show()
+
 # %% [markdown]
 # ## Conclusiones
 # 
@@ -424,4 +507,10 @@ plt.show()
 #    - La tensión y la resistencia (parámetros eléctricos) determinan la potencia y tienen un impacto directo en la velocidad de calentamiento
 #    - Las condiciones térmicas iniciales (temperatura del agua y ambiente) influyen en la forma de la curva y en la eficiencia del proceso
 # 
+# 6. **Sensibilidad global**: Con las cuatro fuentes variando a la vez, la tensión explica casi toda la varianza del tiempo hasta 80°C (índices de Sobol cercanos a 1); la resistencia y la temperatura ambiente aportan poco y la temperatura inicial es despreciable.
+# 
+# 7. **Diseño del muestreo**: Para estimar el tiempo medio hasta 80°C con ±1 s, el muestreo pseudoaleatorio necesita millones de corridas; con hipercubo latino alcanzan decenas de miles y con secuencias de Sobol o Halton unas pocas miles.
+# 
+# 8. **Modelo no lineal**: Con la convección y la radiación en serie con el aislante, las pérdidas reales son menores que las del modelo lineal y el agua se calienta algo más; la temperatura ambiente influye menos, mientras que el aumento de la resistencia con la temperatura reduce levemente la potencia.
+# 
 # Estas simulaciones permiten comprender mejor el comportamiento del sistema bajo diferentes condiciones y prever su desempeño en diversos escenarios de operación.
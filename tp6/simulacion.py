@@ -22,53 +22,70 @@
 # Este modelo extiende el trabajo del TP4 para incluir perturbaciones aleatorias.
 
 # %%
+import itertools
+import os
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.integrate import odeint
-from math import pi
 import random
 
-# Configuración para reproducibilidad
-np.random.seed(42)
-random.seed(42)
+from pava.modelo import Calentador
+from pava.estocastico import simular_con_eventos
+from pava.montecarlo import simular_replicas
+from pava.control import PID, Termostato, barrer_ganancias, metricas_respuesta, simular_lazo_cerrado
+from pava.largo_plazo import ANIO, DIA, HORA, simular_largo_plazo
+from pava.flujo import VistaEnVivo, flujo_estocastico
+from pava.cache import memoizar
+
+# Las simulaciones se memoizan en disco: re-ejecutar el notebook sin cambios no vuelve a simular
+simular_con_eventos = memoizar(simular_con_eventos)
+simular_replicas = memoizar(simular_replicas)
+
+# Configuración para reproducibilidad (el ejecutor por lotes puede cambiar la semilla)
+SEMILLA = int(os.environ.get('PAVA_SEMILLA', 42))
+np.random.seed(SEMILLA)
+random.seed(SEMILLA)
 
 # %% [markdown]
 # ## Parámetros Base del Sistema
 
 # %%
+# Calentador diseñado en el TP3 (modelo compartido `pava.modelo`)
+CALENTADOR = Calentador(diametro=8.0, altura=15.0, espesor_aislante=0.25, conductividad_aislante=0.04,
+                        voltaje=12.0, resistencia=0.23)
+
 # Parámetros geométricos (del TP3)
-DIAMETRO = 8.0  # cm
-ALTURA = 15.0   # cm
-RADIO = DIAMETRO / 2  # cm
-VOLUMEN = pi * (RADIO**2) * ALTURA  # cm^3
-CAPACIDAD = VOLUMEN / 1000  # litros
+DIAMETRO = CALENTADOR.diametro  # cm
+ALTURA = CALENTADOR.altura   # cm
+RADIO = CALENTADOR.radio  # cm
+VOLUMEN = CALENTADOR.volumen  # cm^3
+CAPACIDAD = CALENTADOR.capacidad  # litros
 
 # Parámetros del aislante (del TP3)
-ESPESOR_AISLANTE = 0.25  # cm
-COEF_CONDUCTIVIDAD_TERMICA = 0.04  # W/(m·K) - Fibra de vidrio
+ESPESOR_AISLANTE = CALENTADOR.espesor_aislante  # cm
+COEF_CONDUCTIVIDAD_TERMICA = CALENTADOR.conductividad_aislante  # W/(m·K) - Fibra de vidrio
 
 # Conversión a metros para los cálculos
-RADIO_M = RADIO / 100  # m
-ALTURA_M = ALTURA / 100  # m
-ESPESOR_M = ESPESOR_AISLANTE / 100  # m
+RADIO_M = CALENTADOR.radio_m  # m
+ALTURA_M = CALENTADOR.altura_m  # m
+ESPESOR_M = CALENTADOR.espesor_m  # m
 
 # Cálculo de la superficie
-SUP_LATERAL = 2 * pi * RADIO_M * ALTURA_M  # m^2
-SUP_BASES = 2 * pi * RADIO_M**2  # m^2
-SUP_TOTAL = SUP_LATERAL + SUP_BASES  # m^2
+SUP_LATERAL = CALENTADOR.sup_lateral  # m^2
+SUP_BASES = CALENTADOR.sup_bases  # m^2
+SUP_TOTAL = CALENTADOR.sup_total  # m^2
 
 # Cálculo del coeficiente de pérdida de calor
-PERDIDA_CALOR = COEF_CONDUCTIVIDAD_TERMICA * SUP_TOTAL / ESPESOR_M  # W/K
+PERDIDA_CALOR = CALENTADOR.perdida_calor  # W/K
 
 # Parámetros eléctricos (valores base)
-VOLTAJE_BASE = 12.0  # V
-RESISTENCIA_BASE = 0.23  # Ohms
-POTENCIA_BASE = VOLTAJE_BASE**2 / RESISTENCIA_BASE  # W
+VOLTAJE_BASE = CALENTADOR.voltaje  # V
+RESISTENCIA_BASE = CALENTADOR.resistencia  # Ohms
+POTENCIA_BASE = CALENTADOR.potencia  # W
 
 # Parámetros del fluido
-DENSIDAD_AGUA = 1.0  # kg/L
-MASA_AGUA = CAPACIDAD * DENSIDAD_AGUA  # kg
-CALOR_ESPECIFICO_AGUA = 4180  # J/(kg·°C)
+DENSIDAD_AGUA = CALENTADOR.densidad_agua  # kg/L
+MASA_AGUA = CALENTADOR.masa_agua  # kg
+CALOR_ESPECIFICO_AGUA = CALENTADOR.calor_especifico  # J/(kg·°C)
 TEMP_INICIAL = 20.0  # °C
 TEMP_AMBIENTE_BASE = 20.0  # °C
 
@@ -88,54 +105,41 @@ tiempo = np.arange(0, TIEMPO_TOTAL + 1, TICK)
 
 # %% [markdown]
 # ## Definición del Modelo de Temperatura
-
-# %%
-# Función para la ecuación diferencial que describe el cambio de temperatura
-def modelo_temperatura(T, t, T_ambiente, masa, c_esp, potencia, k_perdida):
-    """
-    Ecuación diferencial para el cambio de temperatura del fluido
-    
-    T: Temperatura actual del fluido
-    t: Tiempo
-    T_ambiente: Temperatura ambiente actual (puede variar con eventos estocásticos)
-    masa: Masa del fluido
-    c_esp: Calor específico del fluido
-    potencia: Potencia térmica aplicada
-    k_perdida: Coeficiente de pérdida de calor
-    """
-    # Pérdida de calor
-    perdida = k_perdida * (T - T_ambiente)
-    
-    # Tasa de cambio de temperatura
-    dTdt = (potencia - perdida) / (masa * c_esp)
-    
-    return dTdt
+#
+# La temperatura del fluido sigue la ecuación
+#
+# $$\frac{dT}{dt} = \frac{P - k\,(T - T_{amb}(t))}{m\,c}$$
+#
+# donde $T_{amb}(t)$ es constante por tramos: vale la temperatura base salvo durante un evento estocástico.
+# Dentro de cada tramo la ecuación tiene solución exacta, así que en lugar de llamar a un integrador
+# numérico en cada tick saltamos analíticamente de un límite de tramo al siguiente
+# (`pava.estocastico.simular_con_eventos`) y sólo evaluamos la temperatura en los instantes que graficamos.
+#
+# Un evento que empieza en `tiempo_inicio` con duración `duracion` baja el ambiente durante
+# $[t_{inicio}, t_{inicio} + duracion)$, es decir, exactamente `duracion` ticks. La versión anterior de este
+# notebook, que integraba tick a tick con `odeint`, lo aplicaba un tick antes y durante `duracion - 1` ticks,
+# $[t_{inicio} - 1, t_{inicio} + duracion - 2)$; por eso las curvas se corren un tick respecto de esa versión.
+# El intervalo nuevo es el mismo que usan las réplicas de Monte Carlo y las simulaciones en streaming y de largo plazo.
 
 # %% [markdown]
 # ## Simulación del Fenómeno Estocástico
 
 # %%
-# Inicializamos arrays para guardar resultados
-temperaturas_fluido = [TEMP_INICIAL]  # Temperatura del fluido en cada paso de tiempo
-temperaturas_ambiente = [TEMP_AMBIENTE_BASE]  # Temperatura ambiente en cada paso de tiempo
-eventos_estocásticos = []  # Para registrar los eventos estocásticos
+# Lista para registrar los eventos estocásticos
+eventos_estocásticos = []
 
 # Estado inicial
-temp_ambiente_actual = TEMP_AMBIENTE_BASE
 tiempo_restante_evento = 0
-descenso_actual = 0
 
-# Simulación paso a paso
+# Sorteamos los eventos tick a tick
 for i in range(1, len(tiempo)):
     t_actual = tiempo[i]
-    t_anterior = tiempo[i-1]
     
     # Verificar si ocurre un nuevo evento estocástico
     if tiempo_restante_evento <= 0 and random.random() < PROBABILIDAD_EVENTO:
         # Generar un nuevo evento estocástico
         descenso_actual = random.uniform(MIN_DESCENSO_TEMP, MAX_DESCENSO_TEMP)
         tiempo_restante_evento = random.randint(MIN_DURACION, MAX_DURACION)
-        temp_ambiente_actual = TEMP_AMBIENTE_BASE - descenso_actual
         
         # Registrar el evento
         eventos_estocásticos.append({
@@ -146,25 +150,15 @@ for i in range(1, len(tiempo)):
         
         print(f"Evento estocástico en t={t_actual}s: Descenso de {descenso_actual:.2f}°C durante {tiempo_restante_evento}s")
     
-    # Actualizar temperatura ambiente si hay un evento activo
+    # Descontar un tick del evento activo
     if tiempo_restante_evento > 0:
         tiempo_restante_evento -= 1
-        
-        # Si el evento termina, restaurar temperatura ambiente
-        if tiempo_restante_evento == 0:
-            temp_ambiente_actual = TEMP_AMBIENTE_BASE
-    
-    # Resolver ecuación diferencial para el siguiente paso
-    temp_siguiente = odeint(
-        modelo_temperatura, 
-        temperaturas_fluido[-1], 
-        [t_anterior, t_actual], 
-        args=(temp_ambiente_actual, MASA_AGUA, CALOR_ESPECIFICO_AGUA, POTENCIA_BASE, PERDIDA_CALOR)
-    )[-1, 0]
-    
-    # Guardar resultados
-    temperaturas_fluido.append(temp_siguiente)
-    temperaturas_ambiente.append(temp_ambiente_actual)
+
+# Integramos exactamente tramo a tramo y muestreamos en cada tick
+temperaturas_fluido, temperaturas_ambiente = simular_con_eventos(
+    tiempo, eventos_estocásticos, TEMP_INICIAL, TEMP_AMBIENTE_BASE,
+    POTENCIA_BASE, PERDIDA_CALOR, MASA_AGUA, CALOR_ESPECIFICO_AGUA
+)
 
 # %% [markdown]
 # ## Visualización de Resultados
@@ -214,23 +208,11 @@ plt.show()
 # ## Simulación de Referencia Sin Eventos Estocásticos
 
 # %%
-# Para comparación, simulamos el mismo sistema sin eventos estocásticos
-temperaturas_fluido_ref = [TEMP_INICIAL]
-
-for i in range(1, len(tiempo)):
-    t_actual = tiempo[i]
-    t_anterior = tiempo[i-1]
-    
-    # Resolver ecuación diferencial para el siguiente paso
-    temp_siguiente = odeint(
-        modelo_temperatura, 
-        temperaturas_fluido_ref[-1], 
-        [t_anterior, t_actual], 
-        args=(TEMP_AMBIENTE_BASE, MASA_AGUA, CALOR_ESPECIFICO_AGUA, POTENCIA_BASE, PERDIDA_CALOR)
-    )[-1, 0]
-    
-    # Guardar resultados
-    temperaturas_fluido_ref.append(temp_siguiente)
+# Para comparación, simulamos el mismo sistema sin eventos estocásticos (un único tramo)
+temperaturas_fluido_ref, _ = simular_con_eventos(
+    tiempo, [], TEMP_INICIAL, TEMP_AMBIENTE_BASE,
+    POTENCIA_BASE, PERDIDA_CALOR, MASA_AGUA, CALOR_ESPECIFICO_AGUA
+)
 
 # %% [markdown]
 # ## Comparación Con y Sin Eventos Estocásticos
@@ -313,6 +295,187 @@ if eventos_estocásticos:
 else:
     print("\nNo se registraron eventos estocásticos durante la simulación.")
 
+# %% [markdown]
+# ## Réplicas Monte Carlo
+#
+# La simulación anterior es una única realización del proceso estocástico. Para que las conclusiones
+# no dependan de una sola trayectoria, corremos muchas réplicas independientes a la vez
+# (`pava.montecarlo.simular_replicas`): los inicios de eventos se sortean con tiempos entre llegadas
+# geométricos y la media, la varianza y las bandas de cuantiles por tick se acumulan en streaming.
+
+# %%
+N_REPLICAS = 100_000
+
+resumen = simular_replicas(
+    N_REPLICAS, TIEMPO_TOTAL, TEMP_INICIAL, TEMP_AMBIENTE_BASE, POTENCIA_BASE, PERDIDA_CALOR,
+    MASA_AGUA, CALOR_ESPECIFICO_AGUA, probabilidad=PROBABILIDAD_EVENTO,
+    descenso=(MIN_DESCENSO_TEMP, MAX_DESCENSO_TEMP), duracion=(MIN_DURACION, MAX_DURACION),
+    cuantiles=(0.05, 0.5, 0.95), semilla=SEMILLA
+)
+q05, q50, q95 = resumen['cuantiles']
+
+print(f"--- Resumen de {N_REPLICAS} réplicas ---")
+print(f"Eventos promedio por réplica: {resumen['eventos_por_replica']:.2f}")
+print(f"Temperatura final media: {resumen['media'][-1]:.2f}°C (SD {resumen['desvio'][-1]:.3f}°C)")
+print(f"Banda 5%-95% al final: [{q05[-1]:.2f}, {q95[-1]:.2f}]°C")
+print(f"Diferencia media con la referencia sin eventos: {temperaturas_fluido_ref[-1] - resumen['media'][-1]:.3f}°C")
+
+# Gráfico de la banda de cuantiles
+plt.figure(figsize=(12, 8))
+plt.fill_between(resumen['tiempo'], q05, q95, color='lightblue', alpha=0.6, label='Banda 5%-95%')
+plt.plot(resumen['tiempo'], resumen['media'], 'b-', linewidth=2, label='Media de las réplicas')
+plt.plot(resumen['tiempo'], q50, 'k:', linewidth=1, label='Mediana')
+plt.plot(tiempo, temperaturas_fluido_ref, 'r--', linewidth=1.5, label='Sin eventos estocásticos')
+
+plt.title(f"Calentamiento con Eventos Estocásticos: {N_REPLICAS} Réplicas", fontsize=14)
+plt.xlabel("Tiempo (segundos)", fontsize=12)
+plt.ylabel("Temperatura (°C)", fontsize=12)
+plt.grid(True, alpha=0.3)
+plt.legend(loc='best')
+
+plt.savefig('tp6_montecarlo.png')
+plt.show()
+
+# %% [markdown]
+# ## Control en Lazo Cerrado
+#
+# Hasta acá la resistencia está siempre a plena potencia y el agua sigue calentándose sin límite. Agregamos un
+# controlador (`pava.control`) que mide la temperatura cada segundo y maneja un PWM sobre la fuente de 12 V
+# para mantener el agua en la temperatura objetivo, con el ambiente de la realización estocástica de arriba:
+#
+# - Termostato encendido/apagado con histéresis.
+# - PID con anti-windup, cuyas ganancias se eligen barriendo miles de combinaciones en lotes vectorizados y
+#   ordenándolas por sobrepico, tiempo de establecimiento (banda de ±1°C) y energía consumida.
+
+# %%
+TEMP_CONSIGNA = 80.0  # °C
+
+barrido = barrer_ganancias(
+    CALENTADOR, TEMP_CONSIGNA, kp=np.geomspace(0.01, 5, 40), ki=np.r_[0, np.geomspace(1e-4, 0.1, 24)],
+    kd=np.r_[0, np.geomspace(0.1, 30, 9)], tiempo_total=TIEMPO_TOTAL, temp_inicial=TEMP_INICIAL,
+    temp_ambiente=temperaturas_ambiente, tick=TICK
+)
+
+print(f"--- Mejores ganancias de {len(barrido['kp'])} combinaciones ---")
+print(f"{'kp':>8} {'ki':>8} {'kd':>8} {'sobrepico (°C)':>15} {'establec. (s)':>14} {'energía (kJ)':>13}")
+for i in barrido['orden'][:5]:
+    print(f"{barrido['kp'][i]:8.3f} {barrido['ki'][i]:8.4f} {barrido['kd'][i]:8.2f} {barrido['sobrepico'][i]:15.2f} "
+          f"{barrido['establecimiento'][i]:14.0f} {barrido['energia'][i]/1000:13.1f}")
+
+mejor = barrido['orden'][0]
+controladores = {
+    'Termostato (histéresis 2°C)': Termostato(TEMP_CONSIGNA, histeresis=2.0),
+    'PI sin derivativa': PID(TEMP_CONSIGNA, kp=0.1, ki=0.002),
+    'PID del barrido': PID(TEMP_CONSIGNA, barrido['kp'][mejor], barrido['ki'][mejor], barrido['kd'][mejor]),
+}
+respuestas = {nombre: simular_lazo_cerrado(controlador, CALENTADOR, TIEMPO_TOTAL, TEMP_INICIAL,
+                                           temperaturas_ambiente, TICK)
+              for nombre, controlador in controladores.items()}
+
+fig, (ax_temp, ax_ciclo) = plt.subplots(2, 1, figsize=(12, 9), sharex=True, height_ratios=[2, 1])
+ax_temp.plot(tiempo, temperaturas_fluido, 'k:', linewidth=1, label='Sin control (plena potencia)')
+for nombre, respuesta in respuestas.items():
+    metricas = metricas_respuesta(respuesta['tiempo'], respuesta['temperatura'], TEMP_CONSIGNA)
+    print(f"{nombre}: sobrepico {metricas['sobrepico']:.2f}°C, establecimiento {metricas['establecimiento']:.0f} s, "
+          f"energía {respuesta['energia']/1000:.1f} kJ")
+    ax_temp.plot(respuesta['tiempo'], respuesta['temperatura'], linewidth=1.5, label=nombre)
+    ax_ciclo.step(respuesta['tiempo'][:-1], respuesta['ciclo_trabajo'], where='post', linewidth=1, label=nombre)
+for evento in eventos_estocásticos:
+    for ax in (ax_temp, ax_ciclo):
+        ax.axvspan(evento['tiempo_inicio'], evento['tiempo_inicio'] + evento['duracion'], color='lightgray', alpha=0.3)
+
+ax_temp.axhline(TEMP_CONSIGNA, color='r', linestyle='--', linewidth=1, label='Consigna')
+ax_temp.set_ylim(TEMP_INICIAL - 5, TEMP_CONSIGNA + 20)
+ax_temp.set_ylabel("Temperatura (°C)", fontsize=12)
+ax_temp.set_title("Control de Temperatura con Eventos Estocásticos", fontsize=14)
+ax_temp.grid(True, alpha=0.3)
+ax_temp.legend(loc='lower right')
+ax_ciclo.set_xlabel("Tiempo (segundos)", fontsize=12)
+ax_ciclo.set_ylabel("Ciclo de trabajo PWM", fontsize=12)
+ax_ciclo.grid(True, alpha=0.3)
+
+plt.savefig('tp6_control.png')
+plt.show()
+
+# %% [markdown]
+# ## Simulación en Streaming
+#
+# Las secciones anteriores guardan las trayectorias completas y grafican al final. `pava.flujo` ofrece la
+# misma simulación como un generador que entrega un tick por vez (tiempo, temperatura del fluido, temperatura
+# ambiente y evento, si empieza uno) sin guardar nada, así que una corrida puede mirarse mientras avanza o
+# volcarse a un archivo aunque no tenga fin (`python -m pava.flujo | ...`). La vista en vivo sólo redibuja
+# las curvas sobre un fondo guardado (blitting) y conserva únicamente la ventana de tiempo visible.
+#
+# Una hora a plena potencia llevaría el agua a cientos de grados, así que el flujo usa el termostato de la
+# sección de control: la ventana visible muestra el final de la hora, con el agua oscilando en la banda de
+# ±1°C alrededor de la consigna y el ambiente cayendo en cada evento.
+
+# %%
+TIEMPO_STREAMING = 3600  # segundos (1 hora)
+
+flujo = flujo_estocastico(CALENTADOR, TEMP_INICIAL, TEMP_AMBIENTE_BASE, tick=TICK,
+                          probabilidad=PROBABILIDAD_EVENTO, descenso=(MIN_DESCENSO_TEMP, MAX_DESCENSO_TEMP),
+                          duracion=(MIN_DURACION, MAX_DURACION), semilla=SEMILLA,
+                          termostato=Termostato(TEMP_CONSIGNA, histeresis=2.0))
+vista = VistaEnVivo(ventana=TIEMPO_TOTAL, cada=10, titulo='Termostato con Eventos Estocásticos (en vivo)')
+ultimo = vista.consumir(itertools.islice(flujo, TIEMPO_STREAMING + 1))
+
+print(f"Ticks consumidos: {vista.ticks}, eventos: {vista.eventos}, puntos en memoria: {len(vista.datos)}")
+print(f"Temperatura a los {ultimo.tiempo:.0f} s: {ultimo.temp_fluido:.2f}°C")
+print(f"Redibujos completos de los ejes: {vista.redibujados} (el resto de las actualizaciones usa blitting)")
+
+vista.figura.savefig('tp6_streaming.png')
+plt.show()
+
+# %% [markdown]
+# ## Operación Continua Durante un Año
+#
+# Diez minutos alcanzan para ver el calentamiento, pero no el comportamiento en operación continua. Simulamos
+# un año de ticks de 1 segundo (unos 31,5 millones) con el mismo proceso de eventos. A plena potencia todo el
+# año el modelo llevaría el agua hacia Tamb + P/k, cientos de grados por encima de la ebullición, así que la
+# resistencia la maneja el termostato de la sección anterior (consigna de 80°C, histéresis de 2°C).
+# `pava.largo_plazo` avanza el horizonte en bloques de un día y resume cada bloque apenas lo simula (mínimo,
+# media y máximo por hora, eventos y energía), así que nunca guarda la trayectoria completa.
+
+# %%
+anual = simular_largo_plazo(
+    ANIO, TEMP_INICIAL, TEMP_AMBIENTE_BASE, POTENCIA_BASE, PERDIDA_CALOR, MASA_AGUA, CALOR_ESPECIFICO_AGUA,
+    intervalo=HORA, probabilidad=PROBABILIDAD_EVENTO, descenso=(MIN_DESCENSO_TEMP, MAX_DESCENSO_TEMP),
+    duracion=(MIN_DURACION, MAX_DURACION), semilla=SEMILLA, termostato=Termostato(TEMP_CONSIGNA, histeresis=2.0)
+)
+
+print(f"--- Un año de operación continua con termostato ({ANIO} ticks, {len(anual['media'])} horas) ---")
+print(f"Eventos: {anual['eventos_totales']} ({anual['eventos_totales'] / (ANIO / DIA):.1f} por día)")
+print(f"Temperatura final: {anual['temp_final']:.2f}°C, rango: [{anual['minimo_global']:.2f}, {anual['maximo_global']:.2f}]°C")
+print(f"Resistencia encendida el {anual['energia_total'] / (POTENCIA_BASE * ANIO):.1%} del tiempo")
+print(f"Energía entregada: {anual['energia_total'] / 3.6e6:.1f} kWh, perdida por el aislante: "
+      f"{anual['perdidas_totales'] / 3.6e6:.1f} kWh")
+
+# Agregamos las horas en días para graficar
+por_dia = 24
+dias = anual['inicio'][::por_dia] / DIA
+minimo_diario = np.minimum.reduceat(anual['minimo'], np.arange(0, len(anual['minimo']), por_dia))
+maximo_diario = np.maximum.reduceat(anual['maximo'], np.arange(0, len(anual['maximo']), por_dia))
+eventos_diarios = np.add.reduceat(anual['eventos'], np.arange(0, len(anual['eventos']), por_dia))
+
+fig, (ax_temp, ax_eventos) = plt.subplots(2, 1, figsize=(12, 9), sharex=True)
+ax_temp.fill_between(dias, minimo_diario, maximo_diario, color='lightblue', label='Mínimo-máximo diario')
+ax_temp.plot(anual['inicio'] / DIA, anual['media'], 'b-', linewidth=0.5, label='Media horaria')
+# El primer día incluye el calentamiento desde 20°C; después el termostato mantiene el agua cerca de la consigna
+ax_temp.set_ylim(minimo_diario[1:].min() - 1, maximo_diario.max() + 1)
+ax_temp.set_ylabel("Temperatura (°C)", fontsize=12)
+ax_temp.axhline(TEMP_CONSIGNA, color='r', linestyle='--', linewidth=1, label='Consigna')
+ax_temp.set_title("Un Año con Termostato y Eventos Estocásticos (desde el día 1)", fontsize=14)
+ax_temp.grid(True, alpha=0.3)
+ax_temp.legend(loc='lower right')
+ax_eventos.bar(dias, eventos_diarios, width=1.0, color='gray')
+ax_eventos.set_xlabel("Tiempo (días)", fontsize=12)
+ax_eventos.set_ylabel("Eventos por día", fontsize=12)
+ax_eventos.grid(True, alpha=0.3)
+
+plt.savefig('tp6_largo_plazo.png')
+plt.show()
+
 # %% [markdown]
 # ## Conclusiones
 # 
@@ -325,3 +488,5 @@ else:
 # 4. **Implicaciones para el diseño**: Un sistema robusto debería ser capaz de manejar estas perturbaciones estocásticas, posiblemente mediante sistemas de control que ajusten la potencia en respuesta a las variaciones de temperatura.
 # 
 # 5. **Simulación de escenarios reales**: Este modelo permite simular situaciones más realistas donde factores externos impredecibles pueden afectar el rendimiento del sistema de calentamiento.
+# 
+# 6. **Control en lazo cerrado**: Con un PWM sobre la fuente, el agua se mantiene en la consigna en lugar de seguir calentándose. Como la potencia de la resistencia es mucho mayor que las pérdidas aun con el ambiente 50°C más frío, un control proporcional ya compensa los eventos con un error de décimas de grado; el barrido de ganancias muestra que la acción integral agrega sobrepico sin mejorar el establecimiento, y el termostato oscila alrededor de la consigna con un sobrepico de algo más de 1°C.